@@ -0,0 +1,11 @@
+"""Puts the agents on sys.path the way their servers do.
+
+trip_planner is imported from this folder and the host agent as the top-level
+agent_host package, e.g. python -m pytest trip_planner from here.
+"""
+
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "trip_planner/agents/sub_agents")))
@@ -0,0 +1,445 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""AgentExecutor running an ADK agent behind an A2A server, shared by all sub-agents.
+
+Each agent subclasses ADKAgentExecutor with its user id and may override the
+hooks below to filter events, change how updates are published or record
+metrics; everything else (session sync, update coalescing, part conversion)
+lives here once.
+
+Intermediate updates are published according to A2A_UPDATE_MODE:
+  - "coalesce" (default): text is buffered and sent as one status update once
+    A2A_UPDATE_FLUSH_INTERVAL seconds passed or A2A_UPDATE_MAX_CHARS are buffered.
+  - "all": every event is sent as its own status update.
+  - "final_only": only the final artifact is sent.
+A caller can pick the mode of a single request with the "update_mode" metadata key.
+"""
+
+import asyncio
+import logging
+import os
+import time
+import weakref
+from collections.abc import AsyncGenerator
+
+from a2a.server.agent_execution import AgentExecutor
+from a2a.server.agent_execution.context import RequestContext
+from a2a.server.events.event_queue import EventQueue
+from a2a.server.tasks import TaskUpdater
+from a2a.types import (
+    FilePart,
+    FileWithBytes,
+    FileWithUri,
+    InvalidParamsError,
+    Part,
+    TaskState,
+    TextPart,
+    UnsupportedOperationError,
+)
+from a2a.utils.errors import ServerError
+from google.adk.runners import Runner
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from trip_planner.agents.shared_libraries import (
+    metrics,
+    session_service,
+    state_sync,
+    tracing,
+    usage,
+)
+from trip_planner.agents.shared_libraries.structured_logging import log_payload
+
+logger = logging.getLogger(__name__)
+
+UPDATE_MODE_ALL = "all"
+UPDATE_MODE_COALESCE = "coalesce"
+UPDATE_MODE_FINAL_ONLY = "final_only"
+UPDATE_MODE_KEY = "update_mode"
+
+UPDATE_MODE = os.getenv("A2A_UPDATE_MODE", UPDATE_MODE_COALESCE)
+UPDATE_FLUSH_INTERVAL = float(os.getenv("A2A_UPDATE_FLUSH_INTERVAL", 0.25))
+UPDATE_MAX_CHARS = int(os.getenv("A2A_UPDATE_MAX_CHARS", 2048))
+
+
+class UpdateCoalescer:
+    """Buffers intermediate parts and publishes them as fewer, larger updates.
+
+    Text chunks of a partial (streamed) event continue the text buffered before
+    them; the text of separate events is kept on separate lines. A publish that
+    fails in the background is raised by the next add() or flush().
+    """
+
+    def __init__(
+        self,
+        publish,
+        mode: str = UPDATE_MODE,
+        flush_interval: float = UPDATE_FLUSH_INTERVAL,
+        max_chars: int = UPDATE_MAX_CHARS,
+    ):
+        self._publish = publish
+        self._mode = mode
+        self._flush_interval = flush_interval
+        self._max_chars = max_chars
+        self._parts: list[Part] = []
+        self._chars = 0
+        self._lock = asyncio.Lock()
+        self._timer: asyncio.Task | None = None
+        self._partial = False
+        self._error: Exception | None = None
+        self.received = 0
+        self.published = 0
+
+    async def add(self, parts: list[Part], partial: bool = False) -> None:
+        self._raise_error()
+        self.received += 1
+        if self._mode == UPDATE_MODE_ALL:
+            await self._send(parts)
+            return
+        if self._mode == UPDATE_MODE_FINAL_ONLY or not parts:
+            return
+
+        async with self._lock:
+            # The first part of a new event starts a new line of text.
+            separator = "" if partial and self._partial else "\n"
+            for part in parts:
+                # Adjacent text parts with the same metadata are merged into one.
+                previous = self._parts[-1].root if self._parts else None
+                if (
+                    isinstance(part.root, TextPart)
+                    and isinstance(previous, TextPart)
+                    and previous.metadata == part.root.metadata
+                ):
+                    self._parts[-1] = Part(
+                        root=TextPart(
+                            text=previous.text + separator + part.root.text,
+                            metadata=previous.metadata,
+                        )
+                    )
+                else:
+                    self._parts.append(part)
+                separator = ""
+                if isinstance(part.root, TextPart):
+                    self._chars += len(part.root.text)
+            self._partial = partial
+            if self._chars >= self._max_chars:
+                await self._flush_locked()
+            elif self._timer is None:
+                self._timer = asyncio.create_task(self._flush_later())
+
+    async def flush(self) -> None:
+        """Publishes whatever is buffered; called before the final response."""
+        self._raise_error()
+        async with self._lock:
+            await self._flush_locked()
+
+    async def close(self) -> None:
+        """Drops the buffer without publishing it."""
+        async with self._lock:
+            self._cancel_timer()
+            self._parts, self._chars = [], 0
+        if self._error is not None:
+            logger.warning("Failed to publish a status update: %r", self._error)
+            self._error = None
+
+    async def _flush_later(self):
+        await asyncio.sleep(self._flush_interval)
+        async with self._lock:
+            self._timer = None
+            try:
+                await self._flush_locked()
+            except Exception as e:
+                # Nobody awaits this task; the caller gets the error on its next call.
+                self._error = e
+
+    def _raise_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+    async def _flush_locked(self):
+        self._cancel_timer()
+        if not self._parts:
+            return
+        parts, self._parts, self._chars = self._parts, [], 0
+        self._partial = False
+        await self._send(parts)
+
+    async def _send(self, parts: list[Part]):
+        self.published += 1
+        await self._publish(parts)
+
+    def _cancel_timer(self):
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+        self._timer = None
+
+
+class ADKAgentExecutor(AgentExecutor):
+    """An AgentExecutor that runs an ADK agent through its Runner."""
+
+    def __init__(self, runner: Runner, user_id: str):
+        self.runner = runner
+        self.user_id = user_id
+        self._running_sessions = {}
+        # Event queues of the requests being executed, for the queue depth metric.
+        self._event_queues = weakref.WeakSet()
+        metrics.register_executor(self)
+
+    @property
+    def agent_name(self) -> str:
+        return self.runner.agent.name
+
+    # Hooks for the agents.
+
+    def should_publish(self, event: Event) -> bool:
+        """Whether an intermediate event is published as a status update."""
+        return not event.get_function_calls()
+
+    async def publish_update(self, task_updater: TaskUpdater, parts: list[Part]) -> None:
+        """Publishes the parts of an intermediate event."""
+        log_payload(logger, "Sending status update", parts, task_id=task_updater.task_id)
+        await task_updater.update_status(
+            TaskState.working,
+            message=task_updater.new_agent_message(parts),
+        )
+
+    async def publish_final(self, task_updater: TaskUpdater, parts: list[Part]) -> None:
+        """Publishes the parts of the final response."""
+        log_payload(logger, "Adding final artifact", parts, task_id=task_updater.task_id)
+        await task_updater.add_artifact(parts)
+        # await task_updater.complete()
+
+    def on_request_finished(
+        self, context: RequestContext, elapsed: float, error: BaseException | None
+    ) -> None:
+        """Called once per request with its duration in seconds."""
+        logger.debug(
+            "Request for task %s finished in %.3fs%s",
+            context.task_id,
+            elapsed,
+            f" with {type(error).__name__}" if error else "",
+        )
+
+    # Metrics sampled on /metrics scrapes.
+
+    def event_queue_depth(self) -> int:
+        """Returns the number of events waiting in the queues of the running requests."""
+        return sum(queue.queue.qsize() for queue in list(self._event_queues))
+
+    async def session_count(self) -> int | None:
+        """Returns the number of sessions of this agent in the session service, if known."""
+        return await session_service.session_count(
+            self.runner.session_service, self.runner.app_name, self.user_id
+        )
+
+    # Request processing.
+
+    def _run_agent(
+        self, session_id, new_message: types.Content,
+    ) -> AsyncGenerator[Event, None]:
+        return self.runner.run_async(
+            session_id=session_id, user_id=self.user_id, new_message=new_message
+        )
+
+    def _update_mode(self, context: RequestContext) -> str:
+        mode = (context.metadata or {}).get(UPDATE_MODE_KEY, UPDATE_MODE)
+        if mode not in (UPDATE_MODE_ALL, UPDATE_MODE_COALESCE, UPDATE_MODE_FINAL_ONLY):
+            return UPDATE_MODE
+        return mode
+
+    async def _process_request(
+        self,
+        new_message: types.Content,
+        session_id: str,
+        task_updater: TaskUpdater,
+        context: RequestContext,
+    ) -> None:
+        async def _publish(parts: list[Part]):
+            await self.publish_update(task_updater, parts)
+
+        updates = UpdateCoalescer(_publish, mode=self._update_mode(context))
+        try:
+            with (
+                usage.session_scope(session_id),
+                tracing.span(
+                    "adk.runner.run_async", session_id=session_id, agent=self.runner.agent.name
+                ),
+            ):
+                async for event in self._run_agent(session_id, new_message):
+                    if event.is_final_response():
+                        parts = convert_genai_parts_to_a2a(
+                            event.content.parts if event.content and event.content.parts else []
+                        )
+                        await updates.flush()
+                        await self.publish_final(task_updater, parts)
+                        break
+                    if self.should_publish(event):
+                        update_parts = convert_genai_parts_to_a2a(
+                            event.content.parts
+                            if event.content and event.content.parts
+                            else []
+                        )
+                        await updates.add(update_parts, partial=bool(event.partial))
+                    else:
+                        logger.debug("Skipping event")
+        finally:
+            await updates.close()
+            logger.debug(
+                "Published %d status updates for %d events", updates.published, updates.received
+            )
+
+    async def execute(
+        self,
+        context: RequestContext,
+        event_queue: EventQueue,
+    ):
+        if not context.task_id or not context.context_id:
+            raise ValueError("RequestContext must have task_id and context_id")
+        if not context.message:
+            raise ValueError("RequestContext must have a message")
+
+        started = time.perf_counter()
+        error = None
+        self._event_queues.add(event_queue)
+        metrics.request_started(self.agent_name)
+        try:
+            with tracing.span(
+                "a2a.executor.execute",
+                context.metadata,
+                executor=type(self).__name__,
+                task_id=context.task_id,
+                context_id=context.context_id,
+            ):
+                # Sync the session state before creating the task, so that a state
+                # version mismatch is reported to the host as an error it can retry.
+                try:
+                    session_obj = await self._upsert_session(context.context_id, context.metadata)
+                except state_sync.StateResyncRequired:
+                    raise ServerError(
+                        error=InvalidParamsError(message=state_sync.STATE_RESYNC_REQUIRED)
+                    )
+
+                updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+                if not context.current_task:
+                    await updater.submit()
+                await updater.start_work()
+                await self._process_request(
+                    types.UserContent(
+                        parts=convert_a2a_parts_to_genai(context.message.parts),
+                    ),
+                    session_obj.id,
+                    updater,
+                    context
+                )
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            self._event_queues.discard(event_queue)
+            metrics.request_finished(self.agent_name, elapsed, error)
+            self.on_request_finished(context, elapsed, error)
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue):
+        raise ServerError(error=UnsupportedOperationError())
+
+    async def _upsert_session(self, session_id: str, metadata: dict | None = None):
+        session = await self.runner.session_service.get_session(
+            app_name=self.runner.app_name, user_id=self.user_id, session_id=session_id
+        )
+        if session is None:
+            session = await self.runner.session_service.create_session(
+                app_name=self.runner.app_name,
+                user_id=self.user_id,
+                session_id=session_id,
+                state=state_sync.initial_state(metadata)
+            )
+        else:
+            state_delta = state_sync.state_delta(session.state, metadata)
+            if state_delta:
+                await self.runner.session_service.append_event(
+                    session,
+                    Event(author="user", actions=EventActions(state_delta=state_delta)),
+                )
+        if session is None:
+            raise RuntimeError(f"Failed to get or create session: {session_id}")
+        return session
+
+
+def convert_a2a_parts_to_genai(parts: list[Part]) -> list[types.Part]:
+    """Convert a list of A2A Part types into a list of Google Gen AI Part types."""
+    return [convert_a2a_part_to_genai(part) for part in parts]
+
+
+def convert_a2a_part_to_genai(part: Part) -> types.Part:
+    """Convert a single A2A Part type into a Google Gen AI Part type."""
+    root = part.root
+    if isinstance(root, TextPart):
+        return types.Part(text=root.text)
+    if isinstance(root, FilePart):
+        if isinstance(root.file, FileWithUri):
+            return types.Part(
+                file_data=types.FileData(
+                    file_uri=root.file.uri, mime_type=root.file.mimeType
+                )
+            )
+        if isinstance(root.file, FileWithBytes):
+            return types.Part(
+                inline_data=types.Blob(
+                    data=root.file.bytes.encode("utf-8"),
+                    mime_type=root.file.mimeType or "application/octet-stream",
+                )
+            )
+        raise ValueError(f"Unsupported file type: {type(root.file)}")
+    raise ValueError(f"Unsupported part type: {type(part)}")
+
+
+def convert_genai_parts_to_a2a(parts: list[types.Part]) -> list[Part]:
+    """Convert a list of Google Gen AI Part types into a list of A2A Part types."""
+    return [
+        convert_genai_part_to_a2a(part)
+        for part in parts
+        if (part.text or part.file_data or part.inline_data)
+    ]
+
+
+def convert_genai_part_to_a2a(part: types.Part) -> Part:
+    """Convert a single Google Gen AI Part type into an A2A Part type."""
+    if part.text:
+        return Part(root=TextPart(text=part.text))
+    if part.file_data:
+        if not part.file_data.file_uri:
+            raise ValueError("File URI is missing")
+        return Part(
+            root=FilePart(
+                file=FileWithUri(
+                    uri=part.file_data.file_uri,
+                    mimeType=part.file_data.mime_type,
+                )
+            )
+        )
+    if part.inline_data:
+        if not part.inline_data.data:
+            raise ValueError("Inline data is missing")
+        return Part(
+            root=FilePart(
+                file=FileWithBytes(
+                    bytes=part.inline_data.data.decode("utf-8"),
+                    mimeType=part.inline_data.mime_type,
+                )
+            )
+        )
+    raise ValueError(f"Unsupported part type: {part}")
\ No newline at end of file
@@ -0,0 +1,33 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""The metrics() report shared by the in-process caches.
+
+Caches registered with metrics.register_cache() are exported on /metrics from
+the "entries", "hits" and "misses" of this report.
+"""
+
+from typing import Any
+
+
+def cache_metrics(entries: int, hits: int, misses: int, **counters: Any) -> dict[str, Any]:
+    """Returns the size, hit/miss counters and hit ratio of a cache, plus its own counters."""
+    lookups = hits + misses
+    return {
+        "entries": entries,
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / lookups, 3) if lookups else 0.0,
+        **counters,
+    }
@@ -0,0 +1,173 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Runtime representation of the itinerary kept in session state.
+
+Session state holds the itinerary as the nested dicts of types.Itinerary, with
+dates and times as strings. load_itinerary() is the single place converting it
+into frozen, slotted dataclasses with parsed dates and times; conversions are
+cached per itinerary version (a hash of the canonical JSON encoding, which is
+kept as the cached serialization).
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import date, time
+from typing import Any, Optional
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the json module gives the same encoding.
+    orjson = None
+
+
+def _canonical_json(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, option=orjson.OPT_SORT_KEYS, default=str)
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_time(value: Any) -> Optional[time]:
+    try:
+        return time.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Fields holding the time an event starts (the traveller has to be there) and
+# ends, per event type.
+_EVENT_TIMES = {
+    "flight": ("boarding_time", "arrival_time"),
+    "hotel": ("check_in_time", "check_out_time"),
+    "visit": ("start_time", "end_time"),
+}
+
+
+@dataclass(slots=True, frozen=True)
+class TripEvent:
+    """An itinerary event; raw is the event as stored in session state."""
+    event_type: str
+    starts_at: Optional[time]
+    ends_at: Optional[time]
+    raw: dict[str, Any] = field(repr=False, compare=False)
+
+    @classmethod
+    def from_dict(cls, event: dict[str, Any]) -> "TripEvent":
+        event_type = event.get("event_type", "")
+        start_key, end_key = _EVENT_TIMES.get(event_type, (None, None))
+        return cls(
+            event_type=event_type,
+            starts_at=_parse_time(event.get(start_key)) if start_key else None,
+            ends_at=_parse_time(event.get(end_key)) if end_key else None,
+            raw=event,
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class TripDay:
+    """A day of the itinerary; date is None if it could not be parsed."""
+    day_number: int
+    date: Optional[date]
+    events: tuple[TripEvent, ...]
+
+
+@dataclass(slots=True, frozen=True)
+class TripItinerary:
+    """A parsed itinerary, identified by the hash of its canonical JSON encoding."""
+    version: str
+    trip_name: str
+    start_date: Optional[date]
+    end_date: Optional[date]
+    origin: str
+    destination: str
+    days: tuple[TripDay, ...]
+    _json: bytes = field(repr=False, compare=False)
+
+    def to_json(self) -> bytes:
+        """Returns the canonical JSON encoding of the itinerary (computed once)."""
+        return self._json
+
+    def to_dict(self) -> dict[str, Any]:
+        """Returns a fresh copy of the itinerary in its session state form."""
+        return json.loads(self._json)
+
+    def events(self) -> list[tuple[Optional[date], TripEvent]]:
+        """Returns (day date, event) for every event, in itinerary order."""
+        return [(day.date, event) for day in self.days for event in day.events]
+
+
+def _convert(encoded: bytes, version: str) -> TripItinerary:
+    # Decoded from the encoding so that the raw events are not shared with a
+    # session state that may be modified in place afterwards.
+    itinerary = orjson.loads(encoded) if orjson is not None else json.loads(encoded)
+    return TripItinerary(
+        version=version,
+        trip_name=itinerary.get("trip_name", ""),
+        start_date=_parse_date(itinerary.get("start_date")),
+        end_date=_parse_date(itinerary.get("end_date")),
+        origin=itinerary.get("origin", ""),
+        destination=itinerary.get("destination", ""),
+        days=tuple(
+            TripDay(
+                day_number=day.get("day_number", index + 1),
+                date=_parse_date(day.get("date")),
+                events=tuple(TripEvent.from_dict(event) for event in day.get("events", [])),
+            )
+            for index, day in enumerate(itinerary.get("days", []))
+        ),
+        _json=encoded,
+    )
+
+
+class _ItineraryCache:
+    def __init__(self, max_entries: int = 256):
+        self._max_entries = max_entries
+        self._itineraries: OrderedDict[str, TripItinerary] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def load(self, itinerary: dict[str, Any]) -> TripItinerary:
+        encoded = _canonical_json(itinerary)
+        version = hashlib.blake2b(encoded, digest_size=8).hexdigest()
+        with self._lock:
+            trip = self._itineraries.get(version)
+            if trip is not None:
+                self._itineraries.move_to_end(version)
+                return trip
+
+        trip = _convert(encoded, version)
+        with self._lock:
+            self._itineraries[version] = trip
+            while len(self._itineraries) > self._max_entries:
+                self._itineraries.popitem(last=False)
+        return trip
+
+
+_itineraries = _ItineraryCache()
+
+
+def load_itinerary(itinerary: dict[str, Any] | TripItinerary) -> TripItinerary:
+    """Converts an itinerary from session state, reusing the conversion of an identical one."""
+    if isinstance(itinerary, TripItinerary):
+        return itinerary
+    return _itineraries.load(itinerary)
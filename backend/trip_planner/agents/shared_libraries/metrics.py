@@ -0,0 +1,172 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Prometheus metrics of the A2A agent servers, served at /metrics.
+
+Every series is labelled with the ADK agent name, so the agents served by one
+process (see single_process.py) can still be told apart:
+  - a2a_requests_total{agent, state}: requests by final TaskState.
+  - a2a_tasks_in_flight{agent}: requests being executed.
+  - a2a_task_duration_seconds{agent, state}: request duration by final TaskState.
+  - a2a_event_queue_depth{agent}: events waiting in the request event queues.
+  - adk_sessions{agent}: sessions held by the agent's session service.
+  - adk_model_call_seconds{agent}: model call latency, per (sub-)agent.
+The queue depth and session count are sampled when /metrics is scraped, as are
+the counters of the caches registered with register_cache():
+  - cache_hits_total{cache}, cache_misses_total{cache}, cache_entries{cache}.
+
+Without prometheus_client the recording helpers do nothing and /metrics
+answers 503.
+"""
+
+import asyncio
+import logging
+import weakref
+from typing import Any, Optional
+
+from a2a.types import InvalidParamsError, TaskState
+from a2a.utils.errors import ServerError
+from starlette.requests import Request
+from starlette.responses import PlainTextResponse, Response
+from starlette.routing import Route
+
+try:
+    import prometheus_client
+    from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+except ImportError:  # prometheus_client is optional; metrics are then not recorded.
+    prometheus_client = None
+
+logger = logging.getLogger(__name__)
+
+# Agent turns range from a cached answer to several chained model calls.
+TASK_DURATION_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 300)
+MODEL_CALL_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+
+if prometheus_client is not None:
+    REQUESTS = prometheus_client.Counter(
+        "a2a_requests_total", "A2A requests by final task state.", ["agent", "state"]
+    )
+    TASKS_IN_FLIGHT = prometheus_client.Gauge(
+        "a2a_tasks_in_flight", "A2A requests being executed.", ["agent"]
+    )
+    TASK_DURATION = prometheus_client.Histogram(
+        "a2a_task_duration_seconds",
+        "A2A request duration by final task state.",
+        ["agent", "state"],
+        buckets=TASK_DURATION_BUCKETS,
+    )
+    EVENT_QUEUE_DEPTH = prometheus_client.Gauge(
+        "a2a_event_queue_depth", "Events waiting in the request event queues.", ["agent"]
+    )
+    SESSIONS = prometheus_client.Gauge(
+        "adk_sessions", "Sessions held by the agent's session service.", ["agent"]
+    )
+    MODEL_CALL_SECONDS = prometheus_client.Histogram(
+        "adk_model_call_seconds", "Model call latency.", ["agent"], buckets=MODEL_CALL_BUCKETS
+    )
+
+# The executors of the process, sampled on every scrape.
+_executors = weakref.WeakSet()
+# Cache name -> cache, read on every scrape.
+_caches: dict[str, Any] = {}
+
+
+def register_executor(executor):
+    """Samples an executor's queues and sessions on every scrape.
+
+    The executor must have an agent_name attribute, an event_queue_depth()
+    method and an async session_count() method returning None when unknown.
+    """
+    _executors.add(executor)
+
+
+def register_cache(name: str, cache):
+    """Exports the counters of a cache on every scrape.
+
+    cache.metrics() must return a dict with "hits", "misses" and "entries".
+    """
+    _caches[name] = cache
+
+
+class _CacheCollector:
+    def collect(self):
+        hits = CounterMetricFamily("cache_hits", "Cache hits.", labels=["cache"])
+        misses = CounterMetricFamily("cache_misses", "Cache misses.", labels=["cache"])
+        entries = GaugeMetricFamily("cache_entries", "Entries held by the cache.", labels=["cache"])
+        for name, cache in list(_caches.items()):
+            stats = cache.metrics()
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            entries.add_metric([name], stats["entries"])
+        yield from (hits, misses, entries)
+
+
+if prometheus_client is not None:
+    prometheus_client.REGISTRY.register(_CacheCollector())
+
+
+def task_state(error: Optional[BaseException]) -> TaskState:
+    """Maps how a request ended to the TaskState it is reported under."""
+    if error is None:
+        return TaskState.completed
+    if isinstance(error, ServerError) and isinstance(error.error, InvalidParamsError):
+        return TaskState.rejected
+    if isinstance(error, asyncio.CancelledError):
+        return TaskState.canceled
+    return TaskState.failed
+
+
+def request_started(agent: str):
+    if prometheus_client is not None:
+        TASKS_IN_FLIGHT.labels(agent).inc()
+
+
+def request_finished(agent: str, seconds: float, error: Optional[BaseException]):
+    if prometheus_client is None:
+        return
+    state = task_state(error).value
+    TASKS_IN_FLIGHT.labels(agent).dec()
+    REQUESTS.labels(agent, state).inc()
+    TASK_DURATION.labels(agent, state).observe(seconds)
+
+
+def observe_model_call(agent: str, seconds: float):
+    if prometheus_client is not None:
+        MODEL_CALL_SECONDS.labels(agent).observe(seconds)
+
+
+async def _sample():
+    for executor in list(_executors):
+        EVENT_QUEUE_DEPTH.labels(executor.agent_name).set(executor.event_queue_depth())
+        try:
+            sessions = await executor.session_count()
+        except Exception as e:
+            logger.warning("Could not count the sessions of %s: %s", executor.agent_name, e)
+            continue
+        if sessions is not None:
+            SESSIONS.labels(executor.agent_name).set(sessions)
+
+
+async def _metrics_endpoint(request: Request) -> Response:
+    if prometheus_client is None:
+        return PlainTextResponse("prometheus_client is not installed\n", status_code=503)
+    await _sample()
+    return Response(
+        prometheus_client.generate_latest(), media_type=prometheus_client.CONTENT_TYPE_LATEST
+    )
+
+
+def metrics_route() -> Route:
+    """Returns the route serving the metrics in the Prometheus text format at /metrics."""
+    return Route("/metrics", _metrics_endpoint, methods=["GET"])
@@ -0,0 +1,434 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Durable ADK session service shared by the A2A agent servers.
+
+Sessions live in a SessionStore (SQLite in WAL mode by default; a networked
+store only has to implement the SessionStore interface) with an LRU cache of hot
+sessions in front of it. Appended events only mark a session dirty; dirty
+sessions are written in batches, at the latest every flush interval, and
+sessions idle for longer than the TTL are evicted from the store. The servers
+close the services on shutdown (see lifespan()), which writes what is left.
+
+Select the backend with the SESSION_BACKEND environment variable ("memory", the
+default, or "sqlite").
+"""
+
+import abc
+import asyncio
+import copy
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import weakref
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Any, Optional
+
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, InMemorySessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+
+SessionKey = tuple[str, str, str]
+
+logger = logging.getLogger(__name__)
+
+# The persistent services of the process, closed by lifespan().
+_services = weakref.WeakSet()
+
+
+class SessionStore(abc.ABC):
+    """Storage backend of PersistentSessionService.
+
+    Sessions are stored as serialized JSON keyed by (app_name, user_id, session_id).
+    Methods are blocking; the service calls them from a worker thread.
+    """
+
+    @abc.abstractmethod
+    def load(self, key: SessionKey) -> Optional[tuple[str, float]]:
+        """Returns the serialized session and its last update time, if stored."""
+
+    @abc.abstractmethod
+    def last_update_time(self, key: SessionKey) -> Optional[float]:
+        """Returns the last update time of a stored session without loading it."""
+
+    @abc.abstractmethod
+    def save_many(self, records: list[tuple[SessionKey, str, float]]) -> None:
+        """Writes (key, serialized session, last update time) records in one batch."""
+
+    @abc.abstractmethod
+    def delete(self, key: SessionKey) -> int:
+        """Deletes a session and returns how many were deleted (0 or 1)."""
+
+    @abc.abstractmethod
+    def list(self, app_name: str, user_id: str) -> list[tuple[str, float]]:
+        """Returns (session_id, last update time) of the sessions of a user."""
+
+    @abc.abstractmethod
+    def evict_older_than(self, cutoff: float) -> int:
+        """Deletes sessions not updated since cutoff and returns how many."""
+
+    @abc.abstractmethod
+    def count(self, app_name: str) -> int:
+        """Returns the number of stored sessions of an app."""
+
+
+class SqliteSessionStore(SessionStore):
+    """A SessionStore backed by a local SQLite database in WAL mode."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS sessions (
+                app_name TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                session_id TEXT NOT NULL,
+                data TEXT NOT NULL,
+                last_update_time REAL NOT NULL,
+                PRIMARY KEY (app_name, user_id, session_id)
+            )"""
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS sessions_last_update ON sessions (last_update_time)"
+        )
+
+    def load(self, key: SessionKey) -> Optional[tuple[str, float]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT data, last_update_time FROM sessions"
+                " WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                key,
+            ).fetchone()
+
+    def last_update_time(self, key: SessionKey) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_update_time FROM sessions"
+                " WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                key,
+            ).fetchone()
+        return row[0] if row else None
+
+    def save_many(self, records: list[tuple[SessionKey, str, float]]) -> None:
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO sessions"
+                    " (app_name, user_id, session_id, data, last_update_time)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    [(*key, data, updated) for key, data, updated in records],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, key: SessionKey) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                key,
+            ).rowcount
+
+    def list(self, app_name: str, user_id: str) -> list[tuple[str, float]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT session_id, last_update_time FROM sessions"
+                " WHERE app_name = ? AND user_id = ?",
+                (app_name, user_id),
+            ).fetchall()
+
+    def evict_older_than(self, cutoff: float) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM sessions WHERE last_update_time < ?", (cutoff,)
+            ).rowcount
+
+    def count(self, app_name: str) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM sessions WHERE app_name = ?", (app_name,)
+            ).fetchone()[0]
+
+
+class PersistentSessionService(BaseSessionService):
+    """An ADK session service writing through an LRU cache to a SessionStore.
+
+    State is kept per session; the "app:" and "user:" state prefixes are not
+    shared across sessions as they are by InMemorySessionService.
+    """
+
+    def __init__(
+        self,
+        store: SessionStore,
+        cache_size: int = 1024,
+        ttl_seconds: float = 24 * 60 * 60,
+        batch_size: int = 16,
+        flush_interval: float = 1.0,
+        validate_cache: bool = True,
+    ):
+        self._store = store
+        self._cache_size = cache_size
+        self._ttl_seconds = ttl_seconds
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        # Reload a cached session when another replica wrote a newer version.
+        self._validate_cache = validate_cache
+
+        self._cache: OrderedDict[SessionKey, Session] = OrderedDict()
+        self._dirty: set[SessionKey] = set()
+        self._last_flush = time.monotonic()
+        self._last_sweep = time.monotonic()
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        # Sessions per app, counted from the store on first use and kept up to
+        # date by this replica; recounted after each eviction sweep.
+        self._counts: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        _services.add(self)
+
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session = Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id.strip() if session_id and session_id.strip() else str(uuid.uuid4()),
+            state=state or {},
+            last_update_time=time.time(),
+        )
+        key = (app_name, user_id, session.id)
+        if app_name in self._counts:
+            self._counts[app_name] += 1
+        self._put_cache(key, session)
+        # New sessions are written right away so that other replicas can see them.
+        await self._write(key)
+        return session
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        key = (app_name, user_id, session_id)
+        session = self._cache.get(key)
+        if session is not None and self._validate_cache and key not in self._dirty:
+            stored_time = await asyncio.to_thread(self._store.last_update_time, key)
+            if stored_time is None or stored_time > session.last_update_time:
+                self._cache.pop(key, None)
+                session = None
+
+        if session is None:
+            self.misses += 1
+            row = await asyncio.to_thread(self._store.load, key)
+            if row is None:
+                return None
+            session = Session.model_validate_json(row[0])
+            self._put_cache(key, session)
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+
+        if time.time() - session.last_update_time > self._ttl_seconds:
+            await self.delete_session(app_name=app_name, user_id=user_id, session_id=session_id)
+            return None
+
+        if config is None:
+            return session
+        copied = copy.deepcopy(session)
+        if config.num_recent_events:
+            copied.events = copied.events[-config.num_recent_events :]
+        if config.after_timestamp:
+            copied.events = [e for e in copied.events if e.timestamp >= config.after_timestamp]
+        return copied
+
+    async def list_sessions(self, *, app_name: str, user_id: str) -> ListSessionsResponse:
+        await self.flush()
+        rows = await asyncio.to_thread(self._store.list, app_name, user_id)
+        return ListSessionsResponse(
+            sessions=[
+                Session(
+                    app_name=app_name,
+                    user_id=user_id,
+                    id=session_id,
+                    state={},
+                    last_update_time=updated,
+                )
+                for session_id, updated in rows
+            ]
+        )
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        self._cache.pop(key, None)
+        self._dirty.discard(key)
+        deleted = await asyncio.to_thread(self._store.delete, key)
+        if app_name in self._counts:
+            self._counts[app_name] -= deleted
+
+    async def session_count(self, app_name: str) -> int:
+        """Returns the number of sessions of an app without listing them."""
+        count = self._counts.get(app_name)
+        if count is None:
+            count = self._counts[app_name] = await asyncio.to_thread(self._store.count, app_name)
+        return count
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        await super().append_event(session=session, event=event)
+        if event.partial:
+            return event
+        session.last_update_time = event.timestamp
+
+        key = (session.app_name, session.user_id, session.id)
+        cached = self._cache.get(key)
+        if cached is not None and cached is not session:
+            # The caller holds a copy (e.g. from a filtered get); keep the cache in step.
+            await super().append_event(session=cached, event=event)
+            cached.last_update_time = event.timestamp
+        elif cached is None:
+            self._put_cache(key, session)
+
+        self._dirty.add(key)
+        self._start_flusher()
+        if (
+            len(self._dirty) >= self._batch_size
+            or time.monotonic() - self._last_flush >= self._flush_interval
+        ):
+            await self.flush()
+        return event
+
+    async def flush(self):
+        """Writes every dirty session to the store and evicts expired sessions."""
+        async with self._flush_lock:
+            keys = list(self._dirty)
+            self._dirty.clear()
+            self._last_flush = time.monotonic()
+            records = [
+                (key, self._cache[key].model_dump_json(), self._cache[key].last_update_time)
+                for key in keys
+                if key in self._cache
+            ]
+            if records:
+                await asyncio.to_thread(self._store.save_many, records)
+
+            if time.monotonic() - self._last_sweep >= min(self._ttl_seconds, 60 * 60):
+                self._last_sweep = time.monotonic()
+                evicted = await asyncio.to_thread(
+                    self._store.evict_older_than, time.time() - self._ttl_seconds
+                )
+                if evicted:
+                    self._counts.clear()
+
+    async def close(self):
+        """Stops the periodic flush and writes the dirty sessions."""
+        flusher, self._flusher = self._flusher, None
+        if flusher is not None and not flusher.done():
+            flusher.cancel()
+            if flusher.get_loop() is asyncio.get_running_loop():
+                try:
+                    await flusher
+                except asyncio.CancelledError:
+                    pass
+        await self.flush()
+
+    def _start_flusher(self):
+        # Writes the sessions of conversations that went quiet, which no later
+        # append_event would flush.
+        loop = asyncio.get_running_loop()
+        if self._flusher is None or self._flusher.done() or self._flusher.get_loop() is not loop:
+            self._flusher = loop.create_task(self._flush_periodically())
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self._flush_interval)
+            if not self._dirty:
+                continue
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Could not flush the dirty sessions")
+
+    async def _write(self, key: SessionKey):
+        session = self._cache[key]
+        await asyncio.to_thread(
+            self._store.save_many,
+            [(key, session.model_dump_json(), session.last_update_time)],
+        )
+
+    def _put_cache(self, key: SessionKey, session: Session):
+        self._cache[key] = session
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._cache_size:
+            # Unflushed sessions stay cached until the next flush writes them.
+            evictable = next((k for k in self._cache if k not in self._dirty), None)
+            if evictable is None:
+                break
+            self._cache.pop(evictable)
+
+
+async def close_session_services():
+    """Writes the pending changes of every persistent session service of the process."""
+    for service in list(_services):
+        try:
+            await service.close()
+        except Exception:
+            logger.exception("Could not close a session service")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """Starlette lifespan closing the session services when the server stops."""
+    yield
+    await close_session_services()
+
+
+async def session_count(service: BaseSessionService, app_name: str, user_id: str) -> Optional[int]:
+    """Returns the number of sessions of a user without listing them, if the service allows it."""
+    if isinstance(service, PersistentSessionService):
+        return await service.session_count(app_name)
+    if isinstance(service, InMemorySessionService):
+        return len(service.sessions.get(app_name, {}).get(user_id, {}))
+    return None
+
+
+def create_session_service() -> BaseSessionService:
+    """Creates the session service selected by the SESSION_* environment variables."""
+    backend = os.getenv("SESSION_BACKEND", "memory").lower()
+    if backend == "memory":
+        return InMemorySessionService()
+    if backend == "sqlite":
+        return PersistentSessionService(
+            SqliteSessionStore(os.getenv("SESSION_DB_PATH", "sessions.db")),
+            cache_size=int(os.getenv("SESSION_CACHE_SIZE", 1024)),
+            ttl_seconds=float(os.getenv("SESSION_TTL_SECONDS", 24 * 60 * 60)),
+            batch_size=int(os.getenv("SESSION_BATCH_SIZE", 16)),
+            flush_interval=float(os.getenv("SESSION_FLUSH_INTERVAL", 1.0)),
+        )
+    raise ValueError(f"Unsupported SESSION_BACKEND: {backend}")
@@ -0,0 +1,113 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Agent side of the session state sync protocol used in A2A message metadata.
+
+See agent_host/state_sync.py for the host side. A message either carries the
+full host state under "state" or the keys changed since the previous message
+under "state_delta"; "state_sync" holds the resulting version and hash, plus the
+version and hash a delta applies to.
+"""
+
+from typing import Any
+
+STATE_KEY = "state"
+STATE_DELTA_KEY = "state_delta"
+STATE_SYNC_KEY = "state_sync"
+STATE_RESYNC_REQUIRED = "state_resync_required"
+
+SYNC_VERSION = "_state_sync_version"
+SYNC_HASH = "_state_sync_hash"
+# The keys the host state had at the last sync, told apart from the keys
+# written by this agent's own tools.
+SYNC_KEYS = "_state_sync_keys"
+
+
+class StateResyncRequired(Exception):
+    """The delta does not apply to the state version held by this agent."""
+
+
+def initial_state(metadata: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Returns the state a new session should be created with.
+
+    Raises:
+        StateResyncRequired: If the message only carries a delta.
+    """
+    metadata = metadata or {}
+    if STATE_KEY not in metadata:
+        # A delta or an unchanged-state marker is useless without a base state.
+        if STATE_DELTA_KEY in metadata or STATE_SYNC_KEY in metadata:
+            raise StateResyncRequired()
+        return None
+    state = dict(metadata[STATE_KEY] or {})
+    state.update(_sync_markers(metadata))
+    state[SYNC_KEYS] = sorted(metadata[STATE_KEY] or {})
+    return state
+
+
+def state_delta(
+    session_state: dict[str, Any], metadata: dict[str, Any] | None
+) -> dict[str, Any]:
+    """Returns the state delta to append to an existing session.
+
+    Keys the host changed since the previous message overwrite the session's
+    values. A full snapshot overwrites every key the host sent and clears the
+    host keys it no longer has; keys only written by this agent's own tools
+    are kept.
+
+    Raises:
+        StateResyncRequired: If the delta was computed against another version.
+    """
+    metadata = metadata or {}
+    sync = metadata.get(STATE_SYNC_KEY) or {}
+
+    if STATE_DELTA_KEY in metadata:
+        if (
+            session_state.get(SYNC_VERSION) != sync.get("base_version")
+            or session_state.get(SYNC_HASH) != sync.get("base_hash")
+        ):
+            raise StateResyncRequired()
+        delta = dict(metadata[STATE_DELTA_KEY].get("changed", {}))
+        removed = metadata[STATE_DELTA_KEY].get("removed", [])
+        # ADK state cannot drop keys, clear them instead.
+        for key in removed:
+            delta[key] = None
+        host_keys = (set(session_state.get(SYNC_KEYS) or ()) | delta.keys()) - set(removed)
+    elif STATE_KEY in metadata:
+        delta = dict(metadata[STATE_KEY] or {})
+        host_keys = set(delta)
+        for key in set(session_state.get(SYNC_KEYS) or ()) - host_keys:
+            delta[key] = None
+    elif sync:
+        # The host state did not change since the previous message.
+        if (
+            session_state.get(SYNC_VERSION) != sync.get("version")
+            or session_state.get(SYNC_HASH) != sync.get("hash")
+        ):
+            raise StateResyncRequired()
+        return {}
+    else:
+        return {}
+
+    delta.update(_sync_markers(metadata))
+    if sorted(host_keys) != session_state.get(SYNC_KEYS):
+        delta[SYNC_KEYS] = sorted(host_keys)
+    return delta
+
+
+def _sync_markers(metadata: dict[str, Any]) -> dict[str, Any]:
+    sync = metadata.get(STATE_SYNC_KEY)
+    if not sync:
+        return {}
+    return {SYNC_VERSION: sync.get("version"), SYNC_HASH: sync.get("hash")}
@@ -0,0 +1,172 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Non-blocking structured logging for the agent servers.
+
+configure_logging() routes every log record through a bounded queue to a
+background thread that formats and writes it, so a slow stderr never blocks the
+event loop; records are dropped (and counted) rather than waited for when the
+queue is full. Keyword arguments passed as `extra` become structured fields.
+
+Request and response payloads are logged with log_payload(): at DEBUG level,
+for a LOG_PAYLOAD_SAMPLE_RATE fraction of the calls, and truncated to
+LOG_PAYLOAD_MAX_CHARS. Nothing is converted to text unless the record is kept.
+
+Settings:
+  - LOG_LEVEL: level of the root logger (default INFO).
+  - LOG_FORMAT: "text" (default) or "json", one object per line.
+  - LOG_QUEUE_SIZE: records waiting to be written before new ones are dropped.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+from typing import Any
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", 10000))
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", 0.1))
+LOG_PAYLOAD_MAX_CHARS = int(os.getenv("LOG_PAYLOAD_MAX_CHARS", 2000))
+
+# Attributes every LogRecord has; anything else was passed as `extra`.
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+    "taskName",
+}
+
+_configure_lock = threading.Lock()
+_listener: logging.handlers.QueueListener | None = None
+
+
+def _fields(record: logging.LogRecord) -> dict[str, Any]:
+    return {key: value for key, value in vars(record).items() if key not in _RECORD_ATTRIBUTES}
+
+
+def _primitive(value: Any) -> Any:
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+class Payload:
+    """Defers converting a payload to (truncated) text until it is written."""
+
+    __slots__ = ("value", "max_chars")
+
+    def __init__(self, value: Any, max_chars: int = LOG_PAYLOAD_MAX_CHARS):
+        self.value = value
+        self.max_chars = max_chars
+
+    def __str__(self) -> str:
+        text = str(self.value)
+        if len(text) > self.max_chars:
+            return f"{text[: self.max_chars]}... ({len(text)} chars)"
+        return text
+
+
+def log_payload(logger: logging.Logger, message: str, payload: Any, **fields):
+    """Logs a sampled, truncated payload at DEBUG level.
+
+    The message is followed by ": <payload>"; fields are logged as structured
+    fields of the record.
+    """
+    if not logger.isEnabledFor(logging.DEBUG) or random.random() >= LOG_PAYLOAD_SAMPLE_RATE:
+        return
+    logger.debug("%s: %s", message, Payload(payload), extra=fields, stacklevel=2)
+
+
+class StructuredFormatter(logging.Formatter):
+    """Formats a record and its structured fields as text or as a JSON object."""
+
+    def __init__(self, json_lines: bool = False):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+        self._json_lines = json_lines
+
+    def format(self, record: logging.LogRecord) -> str:
+        fields = {key: _primitive(value) for key, value in _fields(record).items()}
+        if not self._json_lines:
+            text = super().format(record)
+            if fields:
+                text += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+            return text
+
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            **fields,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """A QueueHandler that never blocks, dropping records when the queue is full."""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only records that passed the level filter get here. The message, the
+        # traceback and the fields are rendered now, since the objects they refer
+        # to may change once the caller moves on; the listener thread does the rest.
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        for key, value in _fields(record).items():
+            setattr(record, key, _primitive(value))
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(level: str = LOG_LEVEL, log_format: str = LOG_FORMAT):
+    """Sends the records of every logger through the background writer, once per process."""
+    global _listener
+    with _configure_lock:
+        root = logging.getLogger()
+        root.setLevel(level)
+        if _listener is not None:
+            return
+
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setFormatter(StructuredFormatter(json_lines=log_format == "json"))
+        log_queue = queue.Queue(LOG_QUEUE_SIZE)
+        _listener = logging.handlers.QueueListener(log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        for existing in root.handlers[:]:
+            root.removeHandler(existing)
+        root.addHandler(DroppingQueueHandler(log_queue))
@@ -0,0 +1,199 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Bounded A2A task store for the agent servers.
+
+Unlike InMemoryTaskStore, tasks are evicted once the store holds too many of
+them or they have not been updated for a while, and their history is compacted:
+finished tasks keep only their last artifact, running ones their most recent
+messages and artifacts (the executors leave tasks running so that the host can
+reuse their ids, and each request adds an artifact).
+
+With TASK_STORE_DB_PATH set, tasks are also written to SQLite so that they
+survive restarts and can still be resubscribed to.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from a2a.server.context import ServerCallContext
+from a2a.server.tasks import TaskStore
+from a2a.types import Task, TaskState
+
+TERMINAL_STATES = {
+    TaskState.completed,
+    TaskState.canceled,
+    TaskState.failed,
+    TaskState.rejected,
+}
+
+
+class _SqliteTasks:
+    """Blocking SQLite persistence of serialized tasks."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS tasks (
+                task_id TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS tasks_updated_at ON tasks (updated_at)")
+
+    def load(self, task_id: str) -> Optional[tuple[str, float]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT data, updated_at FROM tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()
+
+    def save(self, task_id: str, data: str, updated_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tasks (task_id, data, updated_at) VALUES (?, ?, ?)",
+                (task_id, data, updated_at),
+            )
+
+    def delete(self, task_id: str):
+        with self._lock:
+            self._conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+
+    def evict(self, cutoff: float, max_tasks: int) -> int:
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM tasks WHERE updated_at < ?", (cutoff,)
+            ).rowcount
+            deleted += self._conn.execute(
+                "DELETE FROM tasks WHERE task_id NOT IN"
+                " (SELECT task_id FROM tasks ORDER BY updated_at DESC LIMIT ?)",
+                (max_tasks,),
+            ).rowcount
+            return deleted
+
+
+class BoundedTaskStore(TaskStore):
+    """A TaskStore with size/age-based eviction and history compaction."""
+
+    def __init__(
+        self,
+        max_tasks: int = 10_000,
+        max_age_seconds: float = 6 * 60 * 60,
+        max_history: int = 20,
+        max_artifacts: int = 5,
+        db_path: str | None = None,
+        sweep_interval: float = 60.0,
+    ):
+        self._max_tasks = max_tasks
+        self._max_age_seconds = max_age_seconds
+        self._max_history = max_history
+        self._max_artifacts = max_artifacts
+        self._sweep_interval = sweep_interval
+        self._disk = _SqliteTasks(db_path) if db_path else None
+
+        self._tasks: OrderedDict[str, tuple[Task, float]] = OrderedDict()
+        self._lock = asyncio.Lock()
+        self._last_sweep = time.monotonic()
+        self.evicted = 0
+
+    async def save(self, task: Task, context: ServerCallContext | None = None) -> None:
+        task = self._compact(task)
+        now = time.time()
+        async with self._lock:
+            self._tasks[task.id] = (task, now)
+            self._tasks.move_to_end(task.id)
+            self._evict_memory(now)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.save, task.id, task.model_dump_json(), now)
+        await self._maybe_sweep_disk(now)
+
+    async def get(self, task_id: str, context: ServerCallContext | None = None) -> Task | None:
+        async with self._lock:
+            entry = self._tasks.get(task_id)
+            if entry is not None:
+                if time.time() - entry[1] <= self._max_age_seconds:
+                    self._tasks.move_to_end(task_id)
+                    return entry[0]
+                self._tasks.pop(task_id)
+                self.evicted += 1
+
+        if self._disk is None:
+            return None
+        row = await asyncio.to_thread(self._disk.load, task_id)
+        if row is None or time.time() - row[1] > self._max_age_seconds:
+            return None
+        task = Task.model_validate_json(row[0])
+        async with self._lock:
+            self._tasks[task_id] = (task, row[1])
+            self._evict_memory(time.time())
+        return task
+
+    async def delete(self, task_id: str, context: ServerCallContext | None = None) -> None:
+        async with self._lock:
+            self._tasks.pop(task_id, None)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.delete, task_id)
+
+    def _compact(self, task: Task) -> Task:
+        """Drops history a client can no longer need."""
+        if task.status.state in TERMINAL_STATES:
+            if not task.history and (not task.artifacts or len(task.artifacts) <= 1):
+                return task
+            return task.model_copy(
+                update={
+                    "history": [],
+                    "artifacts": task.artifacts[-1:] if task.artifacts else task.artifacts,
+                }
+            )
+        update = {}
+        if task.history and len(task.history) > self._max_history:
+            update["history"] = task.history[-self._max_history :]
+        if task.artifacts and len(task.artifacts) > self._max_artifacts:
+            update["artifacts"] = task.artifacts[-self._max_artifacts :]
+        return task.model_copy(update=update) if update else task
+
+    def _evict_memory(self, now: float):
+        while self._tasks:
+            task_id, (_, updated_at) = next(iter(self._tasks.items()))
+            if len(self._tasks) <= self._max_tasks and now - updated_at <= self._max_age_seconds:
+                break
+            self._tasks.pop(task_id)
+            self.evicted += 1
+
+    async def _maybe_sweep_disk(self, now: float):
+        if self._disk is None or time.monotonic() - self._last_sweep < self._sweep_interval:
+            return
+        self._last_sweep = time.monotonic()
+        self.evicted += await asyncio.to_thread(
+            self._disk.evict, now - self._max_age_seconds, self._max_tasks
+        )
+
+
+def create_task_store() -> BoundedTaskStore:
+    """Creates the task store configured by the TASK_STORE_* environment variables."""
+    return BoundedTaskStore(
+        max_tasks=int(os.getenv("TASK_STORE_MAX_TASKS", 10_000)),
+        max_age_seconds=float(os.getenv("TASK_STORE_MAX_AGE_SECONDS", 6 * 60 * 60)),
+        max_history=int(os.getenv("TASK_STORE_MAX_HISTORY", 20)),
+        max_artifacts=int(os.getenv("TASK_STORE_MAX_ARTIFACTS", 5)),
+        db_path=os.getenv("TASK_STORE_DB_PATH") or None,
+    )
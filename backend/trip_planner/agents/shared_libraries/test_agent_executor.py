@@ -0,0 +1,101 @@
+"""Tests of the update coalescing of the shared agent executor."""
+
+import asyncio
+
+import pytest
+from a2a.types import Part, TextPart
+
+from trip_planner.agents.shared_libraries.agent_executor import (
+    UPDATE_MODE_COALESCE,
+    UpdateCoalescer,
+)
+
+
+def _text(text: str, metadata: dict | None = None) -> Part:
+    return Part(root=TextPart(text=text, metadata=metadata))
+
+
+def _coalescer(published: list, **kwargs) -> UpdateCoalescer:
+    async def publish(parts):
+        published.append(parts)
+
+    return UpdateCoalescer(publish, mode=UPDATE_MODE_COALESCE, flush_interval=60, **kwargs)
+
+
+def test_separate_events_are_kept_on_separate_lines():
+    published = []
+
+    async def scenario():
+        updates = _coalescer(published)
+        await updates.add([_text("I'll search.")])
+        await updates.add([_text("Here are the flights.")])
+        await updates.flush()
+
+    asyncio.run(scenario())
+
+    assert [[part.root.text for part in parts] for parts in published] == [
+        ["I'll search.\nHere are the flights."]
+    ]
+
+
+def test_partial_chunks_continue_the_text():
+    published = []
+
+    async def scenario():
+        updates = _coalescer(published)
+        await updates.add([_text("Here are")], partial=True)
+        await updates.add([_text(" the flights.")], partial=True)
+        await updates.add([_text("Done.")])
+        await updates.flush()
+
+    asyncio.run(scenario())
+
+    assert published[0][0].root.text == "Here are the flights.\nDone."
+
+
+def test_metadata_is_kept_and_not_mixed():
+    published = []
+
+    async def scenario():
+        updates = _coalescer(published)
+        await updates.add([_text("a", {"source": "x"})])
+        await updates.add([_text("b", {"source": "x"})])
+        await updates.add([_text("c", {"source": "y"})])
+        await updates.flush()
+
+    asyncio.run(scenario())
+
+    assert [(part.root.text, part.root.metadata) for part in published[0]] == [
+        ("a\nb", {"source": "x"}),
+        ("c", {"source": "y"}),
+    ]
+
+
+def test_flushes_once_max_chars_are_buffered():
+    published = []
+
+    async def scenario():
+        updates = _coalescer(published, max_chars=10)
+        await updates.add([_text("0123456789")])
+        await updates.add([_text("a")])
+        await updates.close()
+
+    asyncio.run(scenario())
+
+    assert len(published) == 1
+
+
+def test_background_publish_failure_is_raised_by_the_next_call():
+    async def publish(parts):
+        raise ConnectionError("queue closed")
+
+    async def scenario():
+        updates = UpdateCoalescer(publish, mode=UPDATE_MODE_COALESCE, flush_interval=0)
+        await updates.add([_text("a")])
+        await asyncio.sleep(0.01)
+        with pytest.raises(ConnectionError):
+            await updates.add([_text("b")])
+        # Raised once only.
+        await updates.close()
+
+    asyncio.run(scenario())
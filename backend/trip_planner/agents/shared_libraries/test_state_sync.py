@@ -0,0 +1,110 @@
+"""Tests of the session state sync between the host and an agent."""
+
+import pytest
+
+from agent_host.state_sync import StateSyncTracker
+from trip_planner.agents.shared_libraries import state_sync
+
+
+class _Agent:
+    """An agent's session state, updated from message metadata like the executor does."""
+
+    def __init__(self):
+        self.state: dict | None = None
+
+    def receive(self, metadata: dict):
+        if self.state is None:
+            self.state = state_sync.initial_state(metadata) or {}
+        else:
+            self.state.update(state_sync.state_delta(self.state, metadata))
+
+    def host_view(self) -> dict:
+        # ADK state cannot drop keys, so removed ones are left as None.
+        return {
+            key: value
+            for key, value in self.state.items()
+            if not key.startswith("_state_sync") and value is not None
+        }
+
+
+def test_first_message_carries_the_full_state():
+    tracker = StateSyncTracker()
+
+    metadata = tracker.encode("planning", "ctx", {"origin": "Paris"})
+
+    assert metadata[state_sync.STATE_KEY] == {"origin": "Paris"}
+    assert metadata[state_sync.STATE_SYNC_KEY]["version"] == 1
+
+
+def test_delta_only_carries_changed_and_removed_keys():
+    tracker = StateSyncTracker()
+    tracker.encode("planning", "ctx", {"origin": "Paris", "destination": "Rome", "budget": 900})
+
+    metadata = tracker.encode("planning", "ctx", {"origin": "Paris", "destination": "London"})
+
+    assert state_sync.STATE_KEY not in metadata
+    assert metadata[state_sync.STATE_DELTA_KEY] == {
+        "changed": {"destination": "London"},
+        "removed": ["budget"],
+    }
+    assert metadata[state_sync.STATE_SYNC_KEY]["base_version"] == 1
+
+
+def test_unchanged_state_only_carries_the_version():
+    tracker = StateSyncTracker()
+    tracker.encode("planning", "ctx", {"origin": "Paris"})
+
+    metadata = tracker.encode("planning", "ctx", {"origin": "Paris"})
+
+    assert list(metadata) == [state_sync.STATE_SYNC_KEY]
+
+
+def test_agent_state_follows_the_host_state():
+    tracker = StateSyncTracker()
+    agent = _Agent()
+    states = [
+        {"origin": "Paris", "destination": "Rome", "budget": 900},
+        {"origin": "Paris", "destination": "London"},
+        {"origin": "Paris", "destination": "London"},
+        {"origin": "Lyon", "destination": "London", "budget": 500},
+    ]
+
+    for state in states:
+        agent.receive(tracker.encode("planning", "ctx", state))
+        assert agent.host_view() == state
+
+
+def test_delta_against_another_version_requires_a_resync():
+    tracker = StateSyncTracker()
+    agent = _Agent()
+    agent.receive(tracker.encode("planning", "ctx", {"origin": "Paris"}))
+    tracker.encode("planning", "ctx", {"origin": "Lyon"})  # Never delivered.
+
+    with pytest.raises(state_sync.StateResyncRequired):
+        agent.receive(tracker.encode("planning", "ctx", {"origin": "Rome"}))
+
+    tracker.reset("planning", "ctx")
+    agent.receive(tracker.encode("planning", "ctx", {"origin": "Rome"}))
+    assert agent.host_view() == {"origin": "Rome"}
+
+
+def test_new_session_without_the_full_state_requires_a_resync():
+    tracker = StateSyncTracker()
+    tracker.encode("planning", "ctx", {"origin": "Paris"})
+
+    with pytest.raises(state_sync.StateResyncRequired):
+        state_sync.initial_state(tracker.encode("planning", "ctx", {"origin": "Rome"}))
+    with pytest.raises(state_sync.StateResyncRequired):
+        state_sync.initial_state(tracker.encode("planning", "ctx", {"origin": "Rome"}))
+
+
+def test_full_snapshot_keeps_the_agents_own_keys():
+    agent = _Agent()
+    agent.receive({state_sync.STATE_KEY: {"origin": "Paris", "budget": 900}})
+    agent.state["itinerary"] = {"days": []}  # Written by the agent's tools.
+
+    agent.receive({state_sync.STATE_KEY: {"origin": "Rome"}})
+
+    assert agent.state["origin"] == "Rome"
+    assert agent.state["budget"] is None
+    assert agent.state["itinerary"] == {"days": []}
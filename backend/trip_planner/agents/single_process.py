@@ -0,0 +1,92 @@
+"""Serves all six A2A sub-agents from a single process.
+
+Each agent is mounted under its own path of one ASGI server, e.g. the booking
+agent at http://localhost:8000/booking, which saves running six uvicorn
+processes on a single box; the usage of all of them is served at /usage. The
+host agent can also load the same agents in-process and call them without HTTP
+(see HOST_AGENT_MODE in agent_host).
+
+Run from the backend folder: python -m trip_planner.agents.single_process
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import asyncio
+import importlib
+import logging
+
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.types import AgentCard
+from starlette.applications import Starlette
+from starlette.routing import Mount
+from uvicorn.config import Config
+from uvicorn.server import Server
+
+from trip_planner.agents.shared_libraries.metrics import metrics_route
+from trip_planner.agents.shared_libraries.session_service import lifespan
+from trip_planner.agents.shared_libraries.structured_logging import configure_logging
+from trip_planner.agents.shared_libraries.tracing import configure_tracing
+from trip_planner.agents.shared_libraries.usage import usage_route
+
+configure_logging()
+logger = logging.getLogger(__name__)
+
+# Mount path -> module defining build_agent_card() and build_request_handler().
+AGENT_SERVERS = {
+    "inspiration": "trip_planner.agents.sub_agents.inspiration.__main__",
+    "planning": "trip_planner.agents.sub_agents.planning.__main__",
+    "booking": "trip_planner.agents.sub_agents.booking.__main__",
+    "pre_trip": "trip_planner.agents.sub_agents.pre_trip.__main__",
+    "in_trip": "trip_planner.agents.sub_agents.in_trip.__main__",
+    "post_trip": "trip_planner.agents.sub_agents.post_trip.__main__",
+}
+
+
+def build_agents(base_url: str) -> dict[str, tuple[AgentCard, DefaultRequestHandler]]:
+    """Builds the card and request handler of every agent, keyed by mount path."""
+    agents = {}
+    for path, module_name in AGENT_SERVERS.items():
+        module = importlib.import_module(module_name)
+        agent_card = module.build_agent_card(f"{base_url.rstrip('/')}/{path}/")
+        agents[path] = (agent_card, module.build_request_handler(agent_card))
+    return agents
+
+
+def build_app(base_url: str) -> Starlette:
+    """Builds one ASGI app routing /<agent>/... to each agent's A2A app."""
+    routes = [
+        Mount(
+            f"/{path}",
+            app=A2AStarletteApplication(agent_card=agent_card, http_handler=request_handler).build(),
+        )
+        for path, (agent_card, request_handler) in build_agents(base_url).items()
+    ]
+    # The agents share the process, hence one usage tracker and one metrics
+    # registry for all of them; the series are labelled by agent.
+    # Lifespans of mounted apps do not run, so the sessions are closed from here.
+    return Starlette(routes=[usage_route(), metrics_route(), *routes], lifespan=lifespan)
+
+
+def main():
+    asyncio.run(async_main())
+
+
+async def async_main():
+    """Starts the server hosting every agent."""
+    host = os.getenv("SINGLE_PROCESS_HOST", "localhost")
+    port = int(os.getenv("SINGLE_PROCESS_PORT", 8000))
+
+    configure_tracing("trip_planner_agents")
+    app = build_app(f"http://{host}:{port}")
+    logger.info("Serving %s on http://%s:%s", ", ".join(AGENT_SERVERS), host, port)
+
+    config = Config(app, host=host, port=port)
+    server = Server(config)
+    await server.serve()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,10 @@
 """The Host agent package."""
 
-from agent_host.agent import root_agent
\ No newline at end of file
+
+def __getattr__(name: str):
+    # Built on first access, see agent_host.agent.
+    if name == "root_agent":
+        from agent_host.agent import root_agent
+
+        return root_agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
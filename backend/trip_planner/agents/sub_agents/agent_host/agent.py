@@ -1,15 +1,19 @@
 import asyncio
 import json
+import logging
+import os
+import time
 import uuid
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Any, AsyncIterable, List
 import requests
 
 import httpx
 import nest_asyncio
-from a2a.client import A2ACardResolver
 from a2a.types import (
     AgentCard,
+    JSONRPCErrorResponse,
     # GetTaskParams,
     # GetTaskRequest,
     # GetTaskResponse,
@@ -17,7 +21,11 @@ from a2a.types import (
     SendMessageRequest,
     SendMessageResponse,
     SendMessageSuccessResponse,
+    SendStreamingMessageRequest,
     Task,
+    TaskArtifactUpdateEvent,
+    TaskStatusUpdateEvent,
+    TextPart,
 )
 from dotenv import load_dotenv
 from google.adk.agents.readonly_context import ReadonlyContext
@@ -31,13 +39,38 @@ from google.genai import types
 from google.adk import Agent
 from google.adk.tools import FunctionTool
 
-from agent_host.remote_agent_connection import RemoteAgentConnections
-from agent_host import prompt
+from agent_host.card_cache import AgentCardCache, fetch_agent_card
+from agent_host.http_pool import shared_pool
+from agent_host.remote_agent_connection import (
+    LocalAgentConnection,
+    RemoteAgentConnections,
+    TaskCallbackArg,
+)
+from agent_host import prompt, state_sync, tracing
+from agent_host.structured_logging import configure_logging, log_payload
 from agent_host.tools import _load_precreated_itinerary
+from agent_host.usage import instrument, usage
 
 load_dotenv("../../.env")
 nest_asyncio.apply()
 
+logger = logging.getLogger(__name__)
+
+# How long host startup waits for a single agent card before moving on without it.
+CARD_RESOLVE_DEADLINE = float(os.getenv("A2A_CARD_RESOLVE_DEADLINE", 5))
+# Deadline for the background refresh, which does not block anybody.
+CARD_REFRESH_DEADLINE = float(os.getenv("A2A_CARD_REFRESH_DEADLINE", 30))
+# Minimum delay between two attempts to reach agents that are still missing.
+CARD_RETRY_INTERVAL = float(os.getenv("A2A_CARD_RETRY_INTERVAL", 30))
+
+# "remote" (default) reaches every agent over HTTP; "in_process" runs all six
+# agents inside the host process and calls their request handlers directly.
+HOST_AGENT_MODE = os.getenv("HOST_AGENT_MODE", "remote")
+
+# Set by HostAgent.stream() so that remote agent updates received while a tool
+# runs can be forwarded to the caller of stream().
+_stream_updates: ContextVar[asyncio.Queue | None] = ContextVar("_stream_updates", default=None)
+
 class HostAgent:
     """The Host agent."""
 
@@ -46,7 +79,13 @@ class HostAgent:
         self.cards: dict[str, AgentCard] = {}
         self.agents: str = ""
         self._user_id = "host_agent"
-
+        self._remote_agent_addresses: list[str] = []
+        self._card_names: dict[str, str] = {}
+        self._card_cache = AgentCardCache()
+        self._card_refresh_task: asyncio.Task | None = None
+        self._cards_refreshed_at = 0.0
+        self._card_refresh_attempted_at = 0.0
+        self._state_sync = state_sync.StateSyncTracker()
 
         self._agent = self.create_agent()
         self._runner = Runner(
@@ -58,30 +97,93 @@ class HostAgent:
         )
 
     async def _async_init_components(self, remote_agent_addresses: List[str]):
-        async with httpx.AsyncClient(timeout=30) as client:
-            for address in remote_agent_addresses:
-                card_resolver = A2ACardResolver(client, address)
-                try:
-                    card = await card_resolver.get_agent_card()
-                    remote_connection = RemoteAgentConnections(
-                        agent_card=card, agent_url=address
-                    )
-                    self.remote_agent_connections[card.name] = remote_connection
-                    self.cards[card.name] = card
-                    print(f"\n=== Agent Card for {card.name} ===")
-                    print(json.dumps(card.model_dump(), indent=2))
-                except httpx.ConnectError as e:
-                    print(f"ERROR: Failed to get agent card from {address}: {e}")
-                except Exception as e:
-                    print(f"ERROR: Failed to initialize connection for {address}: {e}")
+        self._remote_agent_addresses = list(remote_agent_addresses)
+
+        # Cards still within their TTL come straight from the on-disk cache; the
+        # others are fetched concurrently, each bounded by CARD_RESOLVE_DEADLINE.
+        to_resolve = []
+        for address in self._remote_agent_addresses:
+            card = self._card_cache.get(address)
+            if card is not None and self._card_cache.is_fresh(address):
+                self._register_card(address, card)
+            else:
+                to_resolve.append(address)
+
+        cards = await asyncio.gather(
+            *(self._resolve_card(address, CARD_RESOLVE_DEADLINE) for address in to_resolve)
+        )
+        for address, card in zip(to_resolve, cards):
+            # Fall back to an expired cached card rather than dropping the agent.
+            card = card or self._card_cache.get(address)
+            if card is not None:
+                self._register_card(address, card)
+        self._card_cache.save()
+        self._cards_refreshed_at = self._card_refresh_attempted_at = time.monotonic()
+        logger.debug("Agent info: %s", self.agents)
+
+    async def _resolve_card(self, address: str, deadline: float) -> AgentCard | None:
+        """Fetches (or revalidates) the card of one agent, giving up after deadline seconds."""
+        try:
+            async with shared_pool.slot(address):
+                return await asyncio.wait_for(
+                    fetch_agent_card(shared_pool.client, address, self._card_cache),
+                    deadline,
+                )
+        except asyncio.TimeoutError:
+            logger.error("Timed out after %ss getting agent card from %s", deadline, address)
+        except httpx.ConnectError as e:
+            logger.error("Failed to get agent card from %s: %s", address, e)
+        except Exception as e:
+            logger.error("Failed to initialize connection for %s: %s", address, e)
+        return None
+
+    def _register_card(self, address: str, card: AgentCard):
+        previous_name = self._card_names.get(address)
+        if previous_name is not None and previous_name != card.name:
+            self.remote_agent_connections.pop(previous_name, None)
+            self.cards.pop(previous_name, None)
+        if previous_name != card.name or self.cards.get(card.name) != card:
+            self.remote_agent_connections[card.name] = RemoteAgentConnections(
+                agent_card=card, agent_url=address
+            )
+            logger.info("Registered agent card for %s at %s", card.name, address)
+        self.cards[card.name] = card
+        self._card_names[address] = card.name
+        self._update_agent_info()
 
+    def _update_agent_info(self):
         agent_info = [
             json.dumps({"name": card.name, "description": card.description})
             for card in self.cards.values()
         ]
-        print("agent_info:", agent_info)
         self.agents = "\n".join(agent_info) if agent_info else "No relevant tools found"
 
+    def _schedule_card_refresh(self):
+        """Refreshes agent cards in the background once they expire or if some are missing."""
+        if self._card_refresh_task is not None and not self._card_refresh_task.done():
+            return
+        now = time.monotonic()
+        missing = len(self._card_names) < len(self._remote_agent_addresses)
+        if now - self._cards_refreshed_at < self._card_cache.ttl and not (
+            missing and now - self._card_refresh_attempted_at >= CARD_RETRY_INTERVAL
+        ):
+            return
+        self._card_refresh_attempted_at = now
+        self._card_refresh_task = asyncio.create_task(self._refresh_cards())
+
+    async def _refresh_cards(self):
+        cards = await asyncio.gather(
+            *(
+                self._resolve_card(address, CARD_REFRESH_DEADLINE)
+                for address in self._remote_agent_addresses
+            )
+        )
+        for address, card in zip(self._remote_agent_addresses, cards):
+            if card is not None:
+                self._register_card(address, card)
+        self._card_cache.save()
+        self._cards_refreshed_at = time.monotonic()
+
     @classmethod
     async def create(
         cls,
@@ -92,19 +194,45 @@ class HostAgent:
         return instance
     
 
+    @classmethod
+    def create_in_process(cls):
+        """Creates a HostAgent whose agents run in this process instead of over HTTP."""
+        import sys
+        sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../..")))
+        from trip_planner.agents.single_process import build_agents
+
+        instance = cls()
+        for agent_card, request_handler in build_agents("http://in-process").values():
+            instance.remote_agent_connections[agent_card.name] = LocalAgentConnection(
+                agent_card, request_handler
+            )
+            instance.cards[agent_card.name] = agent_card
+        instance._update_agent_info()
+        logger.debug("Agent info: %s", instance.agents)
+        return instance
+
     def create_agent(self) -> Agent:
 
-        return Agent(
+        return instrument(Agent(
             model="gemini-2.5-flash",
             name="Host_Agent",
             instruction=self.root_instruction,
             description="You are a travel AI agent, that helps the user plan their trip by coordinating with other specialized agents. You have access to tools that allow you to communicate with other agents, such as the Inspiration agent, Planning agent, Booking agent, Pre-Trip agent, In-Trip agent and Post-Trip agent. Your goal is to understand the user's travel needs and delegate tasks to the appropriate agents to provide a comprehensive travel planning experience.",
             tools=[
                 self.send_message,
+                self.send_messages,
             ],
             before_agent_callback=_load_precreated_itinerary,
-        )
+        ))
+
 
+    def pool_metrics(self) -> dict[str, Any]:
+        """Returns the utilisation of the connection pool shared by all remote agents."""
+        return shared_pool.metrics()
+
+    def usage_metrics(self, session_id: str | None = None) -> dict[str, Any]:
+        """Returns the token, cost and latency aggregates of the host agent."""
+        return usage.snapshot(session_id=session_id)
 
     def root_instruction(self, context: ReadonlyContext) -> str:
         return prompt.ROOT_AGENT_INSTR
@@ -159,32 +287,81 @@ class HostAgent:
                     },
                 session_id=session_id,
             )
-        async for event in self._runner.run_async(
-            user_id=self._user_id, session_id=session.id, new_message=content
-        ):
-            if event.is_final_response():
-                response = ""
-                if (
-                    event.content
-                    and event.content.parts
-                    and event.content.parts[0].text
+        # The runner is drained by a separate task so that updates forwarded by
+        # send_message can be yielded while the tool call is still running.
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def _run():
+            try:
+                async for event in self._runner.run_async(
+                    user_id=self._user_id, session_id=session.id, new_message=content
                 ):
-                    response = "\n".join(
-                        [p.text for p in event.content.parts if p.text]
-                    )
-                yield {
-                    "is_task_complete": True,
-                    "content": response,
-                }
-            else:
-                yield {
-                    "is_task_complete": False,
-                    "updates": "The host agent is thinking...",
-                }
-
-    async def send_message(self, agent_name: str, task: str, tool_context: ToolContext):
-        """Sends a task to a remote agent: Inspiration agent, Planning agent, booking agent, Pre-Trip agent, In-Trip agent or Post-Trip agent."""
-        print("Available agents:---------------------", self.remote_agent_connections.keys())
+                    await queue.put(("event", event))
+            except Exception as e:
+                await queue.put(("error", e))
+            finally:
+                await queue.put(("done", None))
+
+        # The span covers the whole turn; the runner task inherits it as parent.
+        stream_span = tracing.start_span("host.stream", session_id=session.id)
+        token = _stream_updates.set(queue)
+        with tracing.use_span(stream_span):
+            runner_task = asyncio.create_task(_run())
+        _stream_updates.reset(token)
+
+        started = time.perf_counter()
+        time_to_first_token_ms = None
+        error = None
+        try:
+            while True:
+                kind, item = await queue.get()
+                if kind == "done":
+                    break
+                if kind == "error":
+                    error = item
+                    raise item
+
+                if kind == "remote":
+                    result = {
+                        "is_task_complete": False,
+                        "updates": item["text"],
+                        "agent": item["agent"],
+                    }
+                elif item.is_final_response():
+                    event = item
+                    response = ""
+                    if (
+                        event.content
+                        and event.content.parts
+                        and event.content.parts[0].text
+                    ):
+                        response = "\n".join(
+                            [p.text for p in event.content.parts if p.text]
+                        )
+                    result = {
+                        "is_task_complete": True,
+                        "content": response,
+                    }
+                else:
+                    result = {
+                        "is_task_complete": False,
+                        "updates": "The host agent is thinking...",
+                    }
+                    yield result
+                    continue
+
+                if time_to_first_token_ms is None:
+                    time_to_first_token_ms = round((time.perf_counter() - started) * 1000, 1)
+                    logger.debug("Time to first token: %.1f ms", time_to_first_token_ms)
+                result["time_to_first_token_ms"] = time_to_first_token_ms
+                yield result
+        finally:
+            if not runner_task.done():
+                runner_task.cancel()
+            tracing.end_span(stream_span, error)
+
+    def _format_agent_name(self, agent_name: str) -> str:
+        """Maps the agent name used by the LLM to the name on the agent card."""
         cleaned_name = agent_name
         if cleaned_name.lower().startswith("agent "):
             cleaned_name = cleaned_name[6:]  # remove first 6 chars: "Agent "
@@ -194,19 +371,57 @@ class HostAgent:
         # Ensure "Agent" is before (A2A)
         if not formatted.lower().endswith("agent"):
             formatted = f"{formatted} Agent"
-        formatted_agent_name = f"{formatted} (A2A)"
-        print("send_message called with agent_name:---------------------", formatted_agent_name)
+        return f"{formatted} (A2A)"
+
+    def _get_connection(self, formatted_agent_name: str) -> RemoteAgentConnections:
         if formatted_agent_name not in self.remote_agent_connections:
             raise ValueError(f"{formatted_agent_name} not found")
         client = self.remote_agent_connections[formatted_agent_name]
 
         if not client:
             raise ValueError(f"Client not available for {formatted_agent_name}")
-
-        # Simplified task and context ID management
-        state = tool_context.state
-        existing_task_id = state.get("task_id")
-        context_id = state.get("context_id", str(uuid.uuid4()))
+        return client
+
+    async def _send_task(
+        self,
+        client: RemoteAgentConnections,
+        task: str,
+        state_dict: dict[str, Any],
+        context_id: str,
+        task_id: str | None = None,
+    ) -> Task | None:
+        """Sends a single task to a remote agent and returns the resulting Task.
+
+        The session state is shipped as a delta against what the agent received
+        last for this context; a full copy is sent again if the agent asks for it.
+        """
+        agent_name = client.card.name
+        metadata = self._state_sync.encode(agent_name, context_id, state_dict)
+        result = await self._send_once(client, task, metadata, context_id, task_id)
+        if (
+            isinstance(result, JSONRPCErrorResponse)
+            and result.error.message == state_sync.STATE_RESYNC_REQUIRED
+        ):
+            logger.info("%s requested a full state resync for context %s", agent_name, context_id)
+            self._state_sync.reset(agent_name, context_id)
+            metadata = self._state_sync.encode(agent_name, context_id, state_dict)
+            result = await self._send_once(client, task, metadata, context_id, task_id)
+
+        if not isinstance(result, Task):
+            # Let the next message carry the full state again.
+            self._state_sync.reset(agent_name, context_id)
+            logger.warning("Received a non-success or non-task response from %s", agent_name)
+            return None
+        return result
+
+    async def _send_once(
+        self,
+        client: RemoteAgentConnections,
+        task: str,
+        metadata: dict[str, Any],
+        context_id: str,
+        task_id: str | None,
+    ) -> Task | JSONRPCErrorResponse | None:
         message_id = str(uuid.uuid4())
 
         message = {
@@ -217,46 +432,152 @@ class HostAgent:
         }
 
         # Only include task_id if we already have a valid one from a prior response
-        if existing_task_id:
-            message["task_id"] = existing_task_id
+        if task_id:
+            message["task_id"] = task_id
+
+        streaming = client.card.capabilities.streaming
+        if not streaming:
+            # Intermediate updates are never seen by a blocking caller.
+            metadata = {**metadata, "update_mode": "final_only"}
+
+        # The agent continues the trace from the context carried in the metadata.
+        with tracing.span("a2a.client.send_message", agent=client.card.name, streaming=streaming):
+            payload = {
+                "message": message,
+                "metadata": tracing.inject(metadata),
+            }
+            log_payload(logger, "Sending payload", payload, agent=client.card.name)
+
+            params = MessageSendParams.model_validate(payload)
+            if streaming:
+                result = await client.send_message_streaming(
+                    SendStreamingMessageRequest(id=message_id, params=params),
+                    task_callback=self._forward_update,
+                )
+                return result if isinstance(result, (Task, JSONRPCErrorResponse)) else None
+
+            message_request = SendMessageRequest(id=message_id, params=params)
+            send_response: SendMessageResponse = await client.send_message(message_request)
+            log_payload(logger, "Send response", send_response, agent=client.card.name)
+
+            if isinstance(send_response.root, JSONRPCErrorResponse):
+                return send_response.root
+            if not isinstance(
+                send_response.root, SendMessageSuccessResponse
+            ) or not isinstance(send_response.root.result, Task):
+                return None
+            return send_response.root.result
+
+    @staticmethod
+    def _forward_update(event: TaskCallbackArg, card: AgentCard) -> None:
+        """Hands the text of a remote agent update to the running stream(), if any."""
+        queue = _stream_updates.get()
+        if queue is None:
+            return
+        if isinstance(event, TaskStatusUpdateEvent):
+            parts = event.status.message.parts if event.status.message else []
+        elif isinstance(event, TaskArtifactUpdateEvent):
+            parts = event.artifact.parts
+        else:
+            return
+        text = "".join(part.root.text for part in parts if isinstance(part.root, TextPart))
+        if text:
+            queue.put_nowait(("remote", {"agent": card.name, "text": text}))
 
-        payload = {
-            "message": message,
-            "metadata": {"state": state.to_dict()},
-        }
+    @staticmethod
+    def _artifact_parts(task: Task) -> list[dict[str, Any]]:
+        """Flattens the parts of every artifact of a Task into plain dicts."""
+        json_content = json.loads(task.model_dump_json(exclude_none=True))
+        log_payload(logger, "Response received", json_content, task_id=task.id)
 
-        print("payload sending:-----------------", payload)
+        resp = []
+        if json_content.get("artifacts"):
+            for artifact in json_content["artifacts"]:
+                if artifact.get("parts"):
+                    resp.extend(artifact["parts"])
+        return resp
 
-        message_request = SendMessageRequest(
-            id=message_id, params=MessageSendParams.model_validate(payload)
+    async def send_message(self, agent_name: str, task: str, tool_context: ToolContext):
+        """Sends a task to a remote agent: Inspiration agent, Planning agent, booking agent, Pre-Trip agent, In-Trip agent or Post-Trip agent."""
+        self._schedule_card_refresh()
+        formatted_agent_name = self._format_agent_name(agent_name)
+        logger.debug(
+            "send_message to %s (available: %s)",
+            formatted_agent_name,
+            ", ".join(self.remote_agent_connections),
         )
+        client = self._get_connection(formatted_agent_name)
 
-        print("Message request ------------------", message_request)
-
-        send_response: SendMessageResponse = await client.send_message(message_request)
-        print("send_response", send_response)
+        # Simplified task and context ID management; task ids are only known to
+        # the agent that created them, so one is kept per agent.
+        state = tool_context.state
+        task_ids = state.get("task_ids") or {}
+        with tracing.span("host.send_message", agent=formatted_agent_name):
+            result = await self._send_task(
+                client,
+                task,
+                state.to_dict(),
+                context_id=state.get("context_id", str(uuid.uuid4())),
+                task_id=task_ids.get(formatted_agent_name),
+            )
+        if result is None:
+            return
 
         # On first call, server returns a Task; capture and persist its id
-        if isinstance(send_response.root, SendMessageSuccessResponse) and isinstance(send_response.root.result, Task):
-            state["task_id"] = send_response.root.result.id
-            state["context_id"] = send_response.root.result.context_id  # prefer server’s context if provided
-
-        if not isinstance(
-            send_response.root, SendMessageSuccessResponse
-        ) or not isinstance(send_response.root.result, Task):
-            print("Received a non-success or non-task response. Cannot proceed.")
-            return
+        state["task_ids"] = {**task_ids, formatted_agent_name: result.id}
+        state["context_id"] = result.context_id  # prefer server’s context if provided
 
-        response_content = send_response.root.model_dump_json(exclude_none=True)
-        json_content = json.loads(response_content)
-        print("response received: ", json_content)
+        return self._artifact_parts(result)
 
-        resp = []
-        if json_content.get("result", {}).get("artifacts"):
-            for artifact in json_content["result"]["artifacts"]:
-                if artifact.get("parts"):
-                    resp.extend(artifact["parts"])
-        return resp
+    async def send_messages(self, messages: list[dict[str, str]], tool_context: ToolContext):
+        """Sends several independent tasks to remote agents at the same time.
+
+        Use this instead of repeated send_message calls when the tasks do not depend
+        on each other, e.g. planning a trip and checking its pre-trip requirements.
+
+        Args:
+            messages: A list of {"agent_name": ..., "task": ...} objects, one per remote agent.
+            tool_context: The ADK tool context.
+
+        Returns:
+            A list with one entry per message holding the agent name, the artifact
+            parts (or an error message) and the round trip latency in milliseconds.
+        """
+        self._schedule_card_refresh()
+        state = tool_context.state
+        # Every message sees the same snapshot of the session state; each one starts
+        # its own task on the remote side since task ids are not shared across agents.
+        state_dict = state.to_dict()
+        context_id = state.get("context_id", str(uuid.uuid4()))
+
+        async def _dispatch(message: dict[str, str]) -> dict[str, Any]:
+            formatted_agent_name = self._format_agent_name(message.get("agent_name", ""))
+            started = time.perf_counter()
+            try:
+                client = self._get_connection(formatted_agent_name)
+                with tracing.span("host.send_message", agent=formatted_agent_name):
+                    result = await self._send_task(
+                        client, message.get("task", ""), state_dict, context_id=context_id
+                    )
+                if result is None:
+                    response = {"error": "Received a non-success or non-task response."}
+                else:
+                    response = {"parts": self._artifact_parts(result)}
+            except Exception as e:
+                response = {"error": f"{type(e).__name__}: {e}"}
+            response["agent_name"] = formatted_agent_name
+            response["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+            return response
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(_dispatch(message) for message in messages))
+        logger.debug(
+            "send_messages latency: %s, total %.1f ms",
+            {r["agent_name"]: r["latency_ms"] for r in results},
+            (time.perf_counter() - started) * 1000,
+        )
+        state["context_id"] = context_id
+        return list(results)
 
     # async def send_message(self, agent_name: str, task: str, tool_context: ToolContext):
     #     """Sends a task to a remote agent and waits for the final response."""
@@ -313,6 +634,8 @@ def _get_initialized_host_agent_sync():
     """Synchronously creates and initializes the HostAgent."""
 
     async def _async_main():
+        configure_logging()
+        tracing.configure_tracing("host_agent")
         # Hardcoded URLs for the friend agents
         agent_urls = [
             "https://inspiraiton-agent-683449264474.europe-west1.run.app", # Inspiration Agent
@@ -325,21 +648,28 @@ def _get_initialized_host_agent_sync():
             "http://localhost:8006",  # Post-Trip Agent
         ]
 
-        print("initializing host agent")
-        hosting_agent_instance = await HostAgent.create(
-            remote_agent_addresses=agent_urls
-        )
-        print("HostAgent initialized")
+        logger.info("Initializing host agent")
+        if HOST_AGENT_MODE == "in_process":
+            hosting_agent_instance = HostAgent.create_in_process()
+        else:
+            hosting_agent_instance = await HostAgent.create(
+                remote_agent_addresses=agent_urls
+            )
+        logger.info("HostAgent initialized")
+        # The connections opened here belong to this short-lived loop; the ADK web
+        # server's loop gets its own client from the shared pool on first use.
+        await shared_pool.aclose()
         return hosting_agent_instance.create_agent()
     
     try:
         return asyncio.run(_async_main())
     except RuntimeError as e:
         if "asyncio.run() cannot be called from a running event loop" in str(e):
-            print(
-                f"Warning: Could not initialize HostAgent with asyncio.run(): {e}. "
+            logger.warning(
+                "Could not initialize HostAgent with asyncio.run(): %s. "
                 "This can happen if an event loop is already running (e.g., in Jupyter). "
-                "Consider initializing HostAgent within an async function in your application."
+                "Consider initializing HostAgent within an async function in your application.",
+                e,
             )
             # nest_asyncio.apply()
             # return asyncio.get_event_loop().run_until_complete(_async_main())
@@ -347,5 +677,11 @@ def _get_initialized_host_agent_sync():
             raise
 
 
-print("Initializing Host Agent...")
-root_agent = _get_initialized_host_agent_sync()
+def __getattr__(name: str) -> Any:
+    # adk web reads root_agent; it is built on first access, so that importing
+    # this module (e.g. for HostAgent) does not connect to any agent.
+    if name == "root_agent":
+        agent = _get_initialized_host_agent_sync()
+        globals()["root_agent"] = agent
+        return agent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
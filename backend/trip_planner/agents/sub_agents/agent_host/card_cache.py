@@ -0,0 +1,100 @@
+"""On-disk cache of remote agent cards with ETag/TTL revalidation."""
+
+import json
+import logging
+import os
+import time
+from typing import Any
+
+import httpx
+from a2a.types import AgentCard
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+
+CARD_CACHE_PATH = os.getenv(
+    "A2A_CARD_CACHE_PATH", os.path.join("agent_host", ".agent_card_cache.json")
+)
+CARD_CACHE_TTL = float(os.getenv("A2A_CARD_CACHE_TTL", 15 * 60))
+
+logger = logging.getLogger(__name__)
+
+
+class AgentCardCache:
+    """Agent cards keyed by agent address, persisted as a single JSON file."""
+
+    def __init__(self, path: str = CARD_CACHE_PATH, ttl: float = CARD_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._entries: dict[str, dict[str, Any]] = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as file:
+                self._entries = json.load(file)
+        except (OSError, ValueError):
+            self._entries = {}
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as file:
+                json.dump(self._entries, file)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning("Could not write agent card cache %s: %s", self.path, e)
+
+    def get(self, address: str) -> AgentCard | None:
+        entry = self._entries.get(address)
+        if entry is None:
+            return None
+        try:
+            return AgentCard.model_validate(entry["card"])
+        except Exception:
+            self._entries.pop(address, None)
+            return None
+
+    def etag(self, address: str) -> str | None:
+        return self._entries.get(address, {}).get("etag")
+
+    def is_fresh(self, address: str) -> bool:
+        entry = self._entries.get(address)
+        return entry is not None and time.time() - entry["fetched_at"] < self.ttl
+
+    def put(self, address: str, card: AgentCard, etag: str | None):
+        self._entries[address] = {
+            "card": card.model_dump(mode="json", exclude_none=True),
+            "etag": etag,
+            "fetched_at": time.time(),
+        }
+
+    def touch(self, address: str):
+        """Marks a cached card as revalidated (HTTP 304)."""
+        if address in self._entries:
+            self._entries[address]["fetched_at"] = time.time()
+
+
+async def fetch_agent_card(
+    client: httpx.AsyncClient, address: str, cache: AgentCardCache
+) -> AgentCard:
+    """Fetches the card of the agent at address, revalidating the cached copy if any.
+
+    Raises:
+        httpx.HTTPError: If the agent could not be reached or returned an error.
+    """
+    headers = {}
+    cached = cache.get(address)
+    etag = cache.etag(address)
+    if cached is not None and etag:
+        headers["If-None-Match"] = etag
+
+    response = await client.get(
+        address.rstrip("/") + AGENT_CARD_WELL_KNOWN_PATH, headers=headers
+    )
+    if response.status_code == 304 and cached is not None:
+        cache.touch(address)
+        return cached
+    response.raise_for_status()
+
+    card = AgentCard.model_validate(response.json())
+    cache.put(address, card, response.headers.get("ETag"))
+    return card
@@ -0,0 +1,164 @@
+"""Host-wide HTTP connection pool shared by agent card resolution and all A2A clients."""
+
+import asyncio
+import os
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+import httpx
+
+try:
+    import h2  # noqa: F401  # httpx needs the h2 package for HTTP/2 support.
+
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, default))
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, default))
+
+
+class _LoopPool:
+    """The httpx client and per-agent limiters bound to a single event loop."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.limiters: dict[str, asyncio.Semaphore] = {}
+
+
+class AgentHttpPool:
+    """A single pool of keep-alive (HTTP/2 when available) connections to the remote agents.
+
+    httpx connections and asyncio primitives cannot be shared across event loops, and
+    the host resolves agent cards inside asyncio.run() before the ADK web server starts
+    its own loop, so one client is kept per running loop.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_agent: int | None = None,
+        max_agents: int | None = None,
+        keepalive_expiry: float | None = None,
+        connect_timeout: float | None = None,
+        read_timeout: float | None = None,
+        write_timeout: float | None = None,
+        pool_timeout: float | None = None,
+        http2: bool | None = None,
+    ):
+        self.max_connections_per_agent = max_connections_per_agent or _env_int(
+            "A2A_HTTP_MAX_CONNECTIONS_PER_AGENT", 10
+        )
+        self.max_agents = max_agents or _env_int("A2A_HTTP_MAX_AGENTS", 8)
+        self.keepalive_expiry = keepalive_expiry or _env_float("A2A_HTTP_KEEPALIVE_EXPIRY", 60)
+        self.timeout = httpx.Timeout(
+            connect=connect_timeout or _env_float("A2A_HTTP_CONNECT_TIMEOUT", 10),
+            read=read_timeout or _env_float("A2A_HTTP_READ_TIMEOUT", 90),
+            write=write_timeout or _env_float("A2A_HTTP_WRITE_TIMEOUT", 30),
+            pool=pool_timeout or _env_float("A2A_HTTP_POOL_TIMEOUT", 30),
+        )
+        if http2 is None:
+            http2 = os.getenv("A2A_HTTP2", "true").lower() == "true"
+        self.http2 = http2 and _HTTP2_AVAILABLE
+
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopPool]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._in_flight: dict[str, int] = {}
+        self._peak_in_flight: dict[str, int] = {}
+        self._requests: dict[str, int] = {}
+        self._errors: dict[str, int] = {}
+        self._total_latency: dict[str, float] = {}
+
+    def _loop_pool(self) -> _LoopPool:
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None or pool.client.is_closed:
+            limits = httpx.Limits(
+                max_connections=self.max_connections_per_agent * self.max_agents,
+                max_keepalive_connections=self.max_connections_per_agent * self.max_agents,
+                keepalive_expiry=self.keepalive_expiry,
+            )
+            pool = _LoopPool(
+                httpx.AsyncClient(timeout=self.timeout, limits=limits, http2=self.http2)
+            )
+            self._pools[loop] = pool
+        return pool
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The pooled client for the running event loop."""
+        return self._loop_pool().client
+
+    @asynccontextmanager
+    async def slot(self, agent_url: str) -> AsyncIterator[None]:
+        """Holds one of the max_connections_per_agent request slots for agent_url."""
+        pool = self._loop_pool()
+        limiter = pool.limiters.setdefault(
+            agent_url, asyncio.Semaphore(self.max_connections_per_agent)
+        )
+        async with limiter:
+            in_flight = self._in_flight.get(agent_url, 0) + 1
+            self._in_flight[agent_url] = in_flight
+            self._peak_in_flight[agent_url] = max(
+                in_flight, self._peak_in_flight.get(agent_url, 0)
+            )
+            started = time.perf_counter()
+            try:
+                yield
+            except Exception:
+                self._errors[agent_url] = self._errors.get(agent_url, 0) + 1
+                raise
+            finally:
+                self._in_flight[agent_url] -= 1
+                self._requests[agent_url] = self._requests.get(agent_url, 0) + 1
+                self._total_latency[agent_url] = self._total_latency.get(
+                    agent_url, 0.0
+                ) + (time.perf_counter() - started)
+
+    def metrics(self) -> dict[str, Any]:
+        """Returns a snapshot of the pool utilisation, overall and per agent."""
+        open_connections = 0
+        for pool in list(self._pools.values()):
+            # httpx does not expose its connection pool publicly; best effort only.
+            transport_pool = getattr(getattr(pool.client, "_transport", None), "_pool", None)
+            open_connections += len(getattr(transport_pool, "connections", []))
+
+        agents = {}
+        for agent_url, requests in self._requests.items():
+            agents[agent_url] = {
+                "in_flight": self._in_flight.get(agent_url, 0),
+                "peak_in_flight": self._peak_in_flight.get(agent_url, 0),
+                "requests": requests,
+                "errors": self._errors.get(agent_url, 0),
+                "avg_latency_ms": round(
+                    self._total_latency.get(agent_url, 0.0) * 1000 / requests, 1
+                ),
+                "utilisation": round(
+                    self._in_flight.get(agent_url, 0) / self.max_connections_per_agent, 2
+                ),
+            }
+        return {
+            "http2": self.http2,
+            "event_loops": len(self._pools),
+            "open_connections": open_connections,
+            "max_connections_per_agent": self.max_connections_per_agent,
+            "agents": agents,
+        }
+
+    async def aclose(self):
+        """Closes the client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        pool = self._pools.pop(loop, None)
+        if pool is not None:
+            await pool.client.aclose()
+
+
+# The single pool used by the host agent.
+shared_pool = AgentHttpPool()
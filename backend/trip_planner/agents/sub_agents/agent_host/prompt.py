@@ -71,6 +71,7 @@ For the following user queries, refer to the mapped agents:
 - If the questions are related to packing tips, travel advisories, weather updates, or general pre-trip information, refer to the `pre_trip` agent.
 - If the questions are related to daily itinerary, local recommendations, travel logistics, or in-trip assistance, refer to the `in_trip` agent.
 - If the questions are related to post-trip feedback, expense summaries, or future travel suggestions, refer to the `post_trip` agent.
+- If a request needs several agents and their tasks do not depend on each other's answers (e.g. planning a trip and checking its pre-trip requirements), use the `send_messages` tool to reach all of them in one call instead of calling `send_message` one agent at a time.
       
 Trip phases:
 If we have a non-empty itinerary, follow the following logic to deteermine a Trip phase:
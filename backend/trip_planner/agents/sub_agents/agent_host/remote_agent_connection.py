@@ -1,19 +1,37 @@
+import logging
+import time
+from collections.abc import AsyncIterator
 from typing import Callable
 
 import httpx
 from a2a.client import A2AClient
+from a2a.client.errors import A2AClientJSONRPCError
+from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.types import (
     AgentCard,
+    InternalError,
+    JSONRPCErrorResponse,
+    Message,
     SendMessageRequest,
     SendMessageResponse,
+    SendMessageSuccessResponse,
+    SendStreamingMessageRequest,
+    SendStreamingMessageResponse,
+    SendStreamingMessageSuccessResponse,
     Task,
     TaskArtifactUpdateEvent,
     TaskStatusUpdateEvent,
 )
+from a2a.utils.errors import ServerError
 from dotenv import load_dotenv
 
+from agent_host.http_pool import AgentHttpPool, shared_pool
+from agent_host.structured_logging import log_payload
+
 load_dotenv("../../.env")
 
+logger = logging.getLogger(__name__)
+
 TaskCallbackArg = Task | TaskStatusUpdateEvent | TaskArtifactUpdateEvent
 TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 
@@ -21,12 +39,15 @@ TaskUpdateCallback = Callable[[TaskCallbackArg, AgentCard], Task]
 class RemoteAgentConnections:
     """A class to hold the connections to the remote agents."""
 
-    def __init__(self, agent_card: AgentCard, agent_url: str):
-        print(f"agent_card: {agent_card}")
-        print(f"agent_url: {agent_url}")
-        print(f"Connecting to remote agent '{agent_card.name}' at URL: {agent_url}")
-        self._httpx_client = httpx.AsyncClient(timeout=90)
-        self.agent_client = A2AClient(self._httpx_client, agent_card, url=agent_url)
+    def __init__(
+        self, agent_card: AgentCard, agent_url: str, pool: AgentHttpPool = shared_pool
+    ):
+        logger.info("Connecting to remote agent %s at %s", agent_card.name, agent_url)
+        log_payload(logger, "Agent card", agent_card, agent=agent_card.name)
+        self._pool = pool
+        self._agent_url = agent_url
+        self._httpx_client: httpx.AsyncClient | None = None
+        self.agent_client: A2AClient | None = None
         self.agent_card = agent_card
         self.card = agent_card
         self.conversation_name = None
@@ -36,9 +57,136 @@ class RemoteAgentConnections:
     def get_agent(self) -> AgentCard:
         return self.card
 
+    def _get_client(self) -> A2AClient:
+        """Returns an A2AClient bound to the shared pool's client for the running loop."""
+        httpx_client = self._pool.client
+        if self.agent_client is None or self._httpx_client is not httpx_client:
+            self._httpx_client = httpx_client
+            self.agent_client = A2AClient(httpx_client, self.agent_card, url=self._agent_url)
+        return self.agent_client
+
     async def send_message(
         self, message_request: SendMessageRequest
     ) -> SendMessageResponse:
-        print("HEREEEEEEEEEEEEEEEEEEEEEEEEEEEEEEEE", message_request)
-        print(message_request)
-        return await self.agent_client.send_message(message_request)
\ No newline at end of file
+        log_payload(logger, "Sending message", message_request, agent=self.card.name)
+        async with self._pool.slot(self._agent_url):
+            return await self._get_client().send_message(message_request)
+
+    async def send_message_streaming(
+        self,
+        message_request: SendStreamingMessageRequest,
+        task_callback: TaskUpdateCallback | None = None,
+    ) -> Task | Message | JSONRPCErrorResponse | None:
+        """Sends a message over message/stream and folds the events into the final Task.
+
+        task_callback is called with every Task, TaskStatusUpdateEvent and
+        TaskArtifactUpdateEvent as soon as it arrives.
+        """
+        task: Task | None = None
+        artifacts = {}
+        started = time.perf_counter()
+        first_event_ms = None
+        async for response in self._stream(message_request):
+            if isinstance(response.root, JSONRPCErrorResponse):
+                logger.warning("Streaming error from %s: %s", self.card.name, response.root.error)
+                return response.root
+            event = response.root.result
+            if first_event_ms is None:
+                first_event_ms = (time.perf_counter() - started) * 1000
+            if isinstance(event, Message):
+                return event
+
+            if isinstance(event, Task):
+                task = event
+                for artifact in event.artifacts or []:
+                    artifacts[artifact.artifact_id] = artifact
+            elif isinstance(event, TaskStatusUpdateEvent):
+                # Executors announce a new task with a status update rather
+                # than a Task snapshot, so build the task from it.
+                if task is None:
+                    task = Task(
+                        id=event.task_id, context_id=event.context_id, status=event.status
+                    )
+                task.status = event.status
+            elif isinstance(event, TaskArtifactUpdateEvent):
+                previous = artifacts.get(event.artifact.artifact_id)
+                if event.append and previous is not None:
+                    previous.parts.extend(event.artifact.parts)
+                else:
+                    artifacts[event.artifact.artifact_id] = event.artifact
+
+            if task_callback is not None:
+                task_callback(event, self.card)
+
+        logger.debug(
+            "%s: first event after %.1f ms, done after %.1f ms",
+            self.card.name,
+            first_event_ms or 0,
+            (time.perf_counter() - started) * 1000,
+        )
+        if task is not None:
+            task.artifacts = list(artifacts.values())
+        return task
+
+    async def _stream(
+        self, message_request: SendStreamingMessageRequest
+    ) -> AsyncIterator[SendStreamingMessageResponse]:
+        async with self._pool.slot(self._agent_url):
+            try:
+                async for response in self._get_client().send_message_streaming(message_request):
+                    yield response
+            except A2AClientJSONRPCError as e:
+                # Unlike send_message, the streaming client raises JSON-RPC errors;
+                # return them the same way so that callers can act on them.
+                yield SendStreamingMessageResponse(
+                    root=JSONRPCErrorResponse(id=message_request.id, error=e.error)
+                )
+
+
+class LocalAgentConnection(RemoteAgentConnections):
+    """A connection to an agent running in this process.
+
+    Requests go straight to the agent's A2A request handler, skipping HTTP and
+    JSON serialization. Errors come back as the JSONRPCErrorResponse the agent's
+    HTTP server would have answered with, so callers handle both the same way.
+    """
+
+    def __init__(self, agent_card: AgentCard, request_handler: DefaultRequestHandler):
+        super().__init__(agent_card=agent_card, agent_url=agent_card.url)
+        self._request_handler = request_handler
+
+    async def send_message(
+        self, message_request: SendMessageRequest
+    ) -> SendMessageResponse:
+        try:
+            result = await self._request_handler.on_message_send(message_request.params)
+        except Exception as e:
+            return SendMessageResponse(root=self._error_response(message_request.id, e))
+        return SendMessageResponse(
+            root=SendMessageSuccessResponse(id=message_request.id, result=result)
+        )
+
+    async def _stream(
+        self, message_request: SendStreamingMessageRequest
+    ) -> AsyncIterator[SendStreamingMessageResponse]:
+        try:
+            async for event in self._request_handler.on_message_send_stream(
+                message_request.params
+            ):
+                # The handler shares these objects with its task store; the
+                # caller folds events into them, so hand out copies.
+                yield SendStreamingMessageResponse(
+                    root=SendStreamingMessageSuccessResponse(
+                        id=message_request.id, result=event.model_copy(deep=True)
+                    )
+                )
+        except Exception as e:
+            yield SendStreamingMessageResponse(root=self._error_response(message_request.id, e))
+
+    def _error_response(self, request_id: str, error: Exception) -> JSONRPCErrorResponse:
+        # Same mapping as the A2A JSON-RPC server: ServerError carries the error
+        # to report, anything else is an internal error.
+        if isinstance(error, ServerError):
+            return JSONRPCErrorResponse(id=request_id, error=error.error or InternalError())
+        logger.exception("Unhandled exception in %s", self.card.name)
+        return JSONRPCErrorResponse(id=request_id, error=InternalError(message=str(error)))
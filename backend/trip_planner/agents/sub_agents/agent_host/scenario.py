@@ -0,0 +1,116 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Initial session state loaded from a scenario file.
+
+The scenario is read, validated and turned into the state overlay once per
+process, then re-read only when the file's mtime changes (checked at most every
+SCENARIO_RELOAD_INTERVAL seconds).
+"""
+
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any
+
+from google.adk.sessions.state import State
+
+from . import constants
+
+logger = logging.getLogger(__name__)
+
+SCENARIO_RELOAD_INTERVAL = float(os.getenv("SCENARIO_RELOAD_INTERVAL", 5))
+
+
+def _parse_scenario(data: Any) -> dict[str, Any]:
+    """Validates a scenario and returns the state overlay it defines."""
+    if not isinstance(data, dict) or not isinstance(data.get("state"), dict):
+        raise ValueError('A scenario must be a JSON object with a "state" object.')
+    overlay = dict(data["state"])
+
+    itinerary = overlay.get(constants.ITIN_KEY) or {}
+    if itinerary:
+        for key in (constants.START_DATE, constants.END_DATE):
+            if key not in itinerary:
+                raise ValueError(f'The scenario itinerary has no "{key}".')
+        overlay[constants.ITIN_START_DATE] = itinerary[constants.START_DATE]
+        overlay[constants.ITIN_END_DATE] = itinerary[constants.END_DATE]
+        overlay[constants.ITIN_DATETIME] = itinerary[constants.START_DATE]
+    return overlay
+
+
+class ScenarioTemplate:
+    """The parsed initial state of a scenario file, shared by all sessions."""
+
+    def __init__(self, path: str, reload_interval: float = SCENARIO_RELOAD_INTERVAL):
+        self._path = path
+        self._reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._overlay: dict[str, Any] | None = None
+        self._mtime: float | None = None
+        self._checked_at = 0.0
+
+    def overlay(self) -> dict[str, Any]:
+        """Returns the state overlay, reloading it if the file changed.
+
+        The returned dict is shared and must not be modified.
+        """
+        now = time.monotonic()
+        if self._overlay is not None and now - self._checked_at < self._reload_interval:
+            return self._overlay
+
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.stat(self._path).st_mtime
+            except OSError:
+                if self._overlay is None:
+                    raise
+                return self._overlay
+            if mtime == self._mtime:
+                return self._overlay
+
+            try:
+                with open(self._path, "r") as file:
+                    overlay = _parse_scenario(json.load(file))
+            except ValueError as e:
+                # Keep serving the previous version if an edited file is invalid.
+                if self._overlay is None:
+                    raise
+                logger.warning("Ignoring invalid scenario %s: %s", self._path, e)
+                return self._overlay
+
+            self._overlay = overlay
+            self._mtime = mtime
+            logger.info("Loaded scenario %s (keys: %s)", self._path, ", ".join(overlay))
+            return overlay
+
+    def apply(self, target: State | dict[str, Any]):
+        """Sets the initial session state, unless the session was already initialized.
+
+        Only mutable values are copied out of the shared overlay; strings,
+        numbers and other immutable values are shared by all sessions.
+        """
+        if constants.ITIN_INITIALIZED in target:
+            return
+        if constants.SYSTEM_TIME not in target:
+            target[constants.SYSTEM_TIME] = str(datetime.now())
+        target[constants.ITIN_INITIALIZED] = True
+
+        for key, value in self.overlay().items():
+            target[key] = copy.deepcopy(value) if isinstance(value, (dict, list)) else value
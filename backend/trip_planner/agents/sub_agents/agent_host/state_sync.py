@@ -0,0 +1,89 @@
+"""Host side of the session state sync protocol used in A2A message metadata.
+
+The first message of a conversation with an agent carries the full state under
+"state". Later messages only carry the keys that changed since the previous
+message to that agent under "state_delta", along with the version and hash the
+agent must currently hold. An agent that does not hold them answers with
+STATE_RESYNC_REQUIRED and the host falls back to a full sync.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any
+
+STATE_KEY = "state"
+STATE_DELTA_KEY = "state_delta"
+STATE_SYNC_KEY = "state_sync"
+STATE_RESYNC_REQUIRED = "state_resync_required"
+
+# Number of (agent, context_id) pairs remembered by the host.
+MAX_TRACKED_CONVERSATIONS = 1024
+
+
+def _hash_value(value: Any) -> str:
+    encoded = json.dumps(value, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(encoded, digest_size=8).hexdigest()
+
+
+def _hash_state(key_hashes: dict[str, str]) -> str:
+    return _hash_value(sorted(key_hashes.items()))
+
+
+class _SyncRecord:
+    def __init__(self, version: int, state_hash: str, key_hashes: dict[str, str]):
+        self.version = version
+        self.state_hash = state_hash
+        self.key_hashes = key_hashes
+
+
+class StateSyncTracker:
+    """Remembers what each remote agent last received for every conversation."""
+
+    def __init__(self, max_tracked: int = MAX_TRACKED_CONVERSATIONS):
+        self._max_tracked = max_tracked
+        self._records: OrderedDict[tuple[str, str], _SyncRecord] = OrderedDict()
+
+    def encode(self, agent_name: str, context_id: str, state: dict[str, Any]) -> dict[str, Any]:
+        """Returns the message metadata carrying state to agent_name for context_id."""
+        key_hashes = {key: _hash_value(value) for key, value in state.items()}
+        state_hash = _hash_state(key_hashes)
+        record = self._records.get((agent_name, context_id))
+
+        if record is None:
+            metadata = {
+                STATE_KEY: state,
+                STATE_SYNC_KEY: {"version": 1, "hash": state_hash},
+            }
+            version = 1
+        elif record.state_hash == state_hash:
+            self._records.move_to_end((agent_name, context_id))
+            return {STATE_SYNC_KEY: {"version": record.version, "hash": state_hash}}
+        else:
+            version = record.version + 1
+            metadata = {
+                STATE_DELTA_KEY: {
+                    "changed": {
+                        key: state[key]
+                        for key, key_hash in key_hashes.items()
+                        if record.key_hashes.get(key) != key_hash
+                    },
+                    "removed": [key for key in record.key_hashes if key not in state],
+                },
+                STATE_SYNC_KEY: {
+                    "version": version,
+                    "hash": state_hash,
+                    "base_version": record.version,
+                    "base_hash": record.state_hash,
+                },
+            }
+
+        self._records[(agent_name, context_id)] = _SyncRecord(version, state_hash, key_hashes)
+        self._records.move_to_end((agent_name, context_id))
+        while len(self._records) > self._max_tracked:
+            self._records.popitem(last=False)
+        return metadata
+
+    def reset(self, agent_name: str, context_id: str):
+        """Forgets what agent_name holds for context_id, forcing a full sync next time."""
+        self._records.pop((agent_name, context_id), None)
@@ -0,0 +1,137 @@
+"""Tests of the host agent's state sync with an agent served over HTTP."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from a2a.server.agent_execution import AgentExecutor, RequestContext
+from a2a.server.apps import A2AStarletteApplication
+from a2a.server.events import EventQueue
+from a2a.server.request_handlers import DefaultRequestHandler
+from a2a.server.tasks import InMemoryTaskStore, TaskUpdater
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    InvalidParamsError,
+    JSONRPCErrorResponse,
+    MessageSendParams,
+    Part,
+    SendStreamingMessageRequest,
+    Task,
+    TextPart,
+)
+from a2a.utils.errors import ServerError
+
+from agent_host.agent import HostAgent
+from agent_host.http_pool import AgentHttpPool, _LoopPool
+from agent_host.remote_agent_connection import RemoteAgentConnections
+from trip_planner.agents.shared_libraries import state_sync
+
+AGENT_URL = "http://state-agent.test/"
+
+
+class StateExecutor(AgentExecutor):
+    """Applies the state metadata like the shared executor and answers with the state."""
+
+    def __init__(self):
+        self.states: dict[str, dict] = {}
+        self.resyncs = 0
+
+    async def execute(self, context: RequestContext, event_queue: EventQueue):
+        state = self.states.get(context.context_id)
+        try:
+            if state is None:
+                state = state_sync.initial_state(context.metadata) or {}
+            else:
+                state = {**state, **state_sync.state_delta(state, context.metadata)}
+        except state_sync.StateResyncRequired:
+            self.resyncs += 1
+            raise ServerError(
+                error=InvalidParamsError(message=state_sync.STATE_RESYNC_REQUIRED)
+            )
+        self.states[context.context_id] = state
+
+        updater = TaskUpdater(event_queue, context.task_id, context.context_id)
+        if not context.current_task:
+            await updater.submit()
+        await updater.add_artifact([Part(root=TextPart(text=json.dumps(state["city"])))])
+        await updater.complete()
+
+    async def cancel(self, context: RequestContext, event_queue: EventQueue):
+        raise NotImplementedError
+
+
+def _connection(executor: AgentExecutor, streaming: bool) -> RemoteAgentConnections:
+    card = AgentCard(
+        name="State Agent",
+        description="Echoes the state it holds.",
+        url=AGENT_URL,
+        version="1.0.0",
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        capabilities=AgentCapabilities(streaming=streaming),
+        skills=[],
+    )
+    app = A2AStarletteApplication(
+        agent_card=card,
+        http_handler=DefaultRequestHandler(agent_executor=executor, task_store=InMemoryTaskStore()),
+    ).build()
+    # The pool's client for the running loop serves the app in memory.
+    pool = AgentHttpPool()
+    pool._pools[asyncio.get_running_loop()] = _LoopPool(
+        httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+    )
+    return RemoteAgentConnections(card, AGENT_URL, pool=pool)
+
+
+@pytest.mark.parametrize("streaming", [True, False])
+def test_send_task_resends_the_full_state_when_the_agent_lost_it(streaming):
+    async def scenario():
+        executor = StateExecutor()
+        connection = _connection(executor, streaming)
+        host = HostAgent()
+
+        first = await host._send_task(connection, "hi", {"city": "Paris"}, context_id="c1")
+        # e.g. the agent restarted or evicted the session: the host's delta no longer applies.
+        executor.states.clear()
+        second = await host._send_task(
+            connection, "hi", {"city": "Rome", "days": 3}, context_id="c1"
+        )
+        return executor, first, second
+
+    executor, first, second = asyncio.run(scenario())
+
+    assert isinstance(first, Task) and isinstance(second, Task)
+    assert executor.resyncs == 1
+    assert executor.states["c1"]["city"] == "Rome"
+    assert executor.states["c1"]["days"] == 3
+    assert HostAgent._artifact_parts(second) == [{"kind": "text", "text": '"Rome"'}]
+
+
+def test_streaming_returns_json_rpc_errors():
+    async def scenario():
+        connection = _connection(StateExecutor(), streaming=True)
+        # A delta without a base state is refused by a new agent.
+        params = MessageSendParams.model_validate(
+            {
+                "message": {
+                    "role": "user",
+                    "parts": [{"kind": "text", "text": "hi"}],
+                    "message_id": "m1",
+                    "context_id": "c1",
+                },
+                "metadata": {
+                    state_sync.STATE_DELTA_KEY: {"changed": {}, "removed": []},
+                    state_sync.STATE_SYNC_KEY: {"version": 2, "hash": "h"},
+                },
+            }
+        )
+        return await connection.send_message_streaming(
+            SendStreamingMessageRequest(id="m1", params=params)
+        )
+
+    result = asyncio.run(scenario())
+
+    assert isinstance(result, JSONRPCErrorResponse)
+    assert result.error.message == state_sync.STATE_RESYNC_REQUIRED
@@ -0,0 +1,156 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""OpenTelemetry spans across the host, the A2A hops and the ADK runs.
+
+The host propagates the trace context to the agents in the A2A message metadata
+(under "trace_context"), so the spans of one user turn form a single trace. ADK
+creates its own spans for invocations, model calls and tool calls (including
+AgentTool runs); they nest under the spans created here.
+
+TRACING_EXPORTER selects where spans go once configure_tracing() is called:
+  - "" (default): tracing is off; spans are not recorded.
+  - "otlp": an OpenTelemetry collector, at OTEL_EXPORTER_OTLP_ENDPOINT
+    (http://localhost:4318 by default; needs opentelemetry-exporter-otlp-proto-http).
+  - "file": JSON lines appended to TRACING_FILE_PATH.
+  - "console": stdout.
+Without the opentelemetry packages every function here is a no-op.
+"""
+
+import logging
+import os
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Any, Optional
+
+try:
+    from opentelemetry import propagate, trace
+except ImportError:  # opentelemetry is optional; tracing is then disabled.
+    propagate = trace = None
+
+logger = logging.getLogger(__name__)
+
+TRACE_CONTEXT_KEY = "trace_context"
+
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "")
+TRACING_FILE_PATH = os.getenv("TRACING_FILE_PATH", "traces.jsonl")
+
+_configure_lock = threading.Lock()
+_configured = False
+
+
+def _create_exporter(kind: str):
+    if kind == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter()
+    if kind == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        return ConsoleSpanExporter()
+    if kind == "file":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+
+        # Kept open for the life of the process; the exporter writes one span per line.
+        out = open(TRACING_FILE_PATH, "a", buffering=1)
+        return ConsoleSpanExporter(out=out, formatter=lambda span: span.to_json(indent=None) + "\n")
+    raise ValueError(f'TRACING_EXPORTER must be "otlp", "file" or "console", not {kind!r}')
+
+
+def configure_tracing(service_name: str, exporter: str = TRACING_EXPORTER) -> bool:
+    """Installs the tracer provider and the configured exporter, once per process.
+
+    Returns:
+        Whether spans are exported.
+    """
+    global _configured
+    if not exporter or trace is None:
+        return False
+    with _configure_lock:
+        if _configured:
+            return True
+        try:
+            from opentelemetry.sdk.resources import Resource
+            from opentelemetry.sdk.trace import TracerProvider
+            from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+            span_exporter = _create_exporter(exporter)
+        except ImportError as e:
+            logger.warning("Tracing disabled, %s is not installed", e.name)
+            return False
+
+        provider = trace.get_tracer_provider()
+        if not isinstance(provider, TracerProvider):
+            provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+            trace.set_tracer_provider(provider)
+        provider.add_span_processor(BatchSpanProcessor(span_exporter))
+        _configured = True
+        logger.info("Exporting traces of %s to %s", service_name, exporter)
+        return True
+
+
+def _attributes(attributes: dict[str, Any]) -> dict[str, Any]:
+    return {key: value for key, value in attributes.items() if value is not None}
+
+
+def span(name: str, metadata: Optional[dict[str, Any]] = None, **attributes):
+    """Returns a context manager running its block in a new current span.
+
+    If metadata carries a propagated trace context, the span continues that
+    trace; otherwise its parent is the current span, if any.
+    """
+    if trace is None:
+        return nullcontext()
+    context = None
+    if metadata and isinstance(metadata.get(TRACE_CONTEXT_KEY), dict):
+        context = propagate.extract(metadata[TRACE_CONTEXT_KEY])
+    return trace.get_tracer(__name__).start_as_current_span(
+        name, context=context, attributes=_attributes(attributes)
+    )
+
+
+def inject(metadata: dict[str, Any]) -> dict[str, Any]:
+    """Returns a copy of A2A message metadata carrying the current trace context."""
+    if trace is None:
+        return metadata
+    carrier: dict[str, str] = {}
+    propagate.inject(carrier)
+    return {**metadata, TRACE_CONTEXT_KEY: carrier} if carrier else metadata
+
+
+def start_span(name: str, **attributes):
+    """Starts a span that is not made current, e.g. one covering an async generator."""
+    if trace is None:
+        return None
+    return trace.get_tracer(__name__).start_span(name, attributes=_attributes(attributes))
+
+
+@contextmanager
+def use_span(current_span):
+    """Makes a span from start_span() current within the block, without ending it."""
+    if current_span is None:
+        yield
+        return
+    with trace.use_span(current_span, end_on_exit=False):
+        yield
+
+
+def end_span(current_span, error: Optional[BaseException] = None):
+    """Ends a span from start_span(), recording the error it failed with, if any."""
+    if current_span is None:
+        return
+    if error is not None:
+        current_span.record_exception(error)
+        current_span.set_status(trace.Status(trace.StatusCode.ERROR, str(error)))
+    current_span.end()
@@ -0,0 +1,277 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Token, cost and latency accounting of the ADK agents of a process.
+
+instrument(agent) adds model and tool callbacks to an agent and to every
+sub-agent and AgentTool agent below it. They record, per agent and per session,
+the prompt and completion tokens and estimated cost of each model call, and the
+latency of model and tool calls. This is the host side of
+trip_planner/agents/shared_libraries/usage.py; the host reports its aggregates
+through HostAgent.usage_metrics().
+
+Costs use MODEL_PRICES, in USD per million prompt and completion tokens, which
+USAGE_MODEL_PRICES can override with a JSON object of the same shape.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from google.adk.agents import Agent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.tools import BaseTool, ToolContext
+from google.adk.tools.agent_tool import AgentTool
+
+MODEL_PRICES = {
+    "gemini-2.5-pro": (1.25, 10.0),
+    "gemini-2.5-flash": (0.30, 2.50),
+    "gemini-2.5-flash-lite": (0.10, 0.40),
+    "gemini-2.0-flash": (0.10, 0.40),
+}
+MODEL_PRICES.update(
+    {model: tuple(prices) for model, prices in json.loads(os.getenv("USAGE_MODEL_PRICES", "{}")).items()}
+)
+
+USAGE_MAX_SESSIONS = int(os.getenv("USAGE_MAX_SESSIONS", 1000))
+
+@dataclass(slots=True)
+class UsageStats:
+    """Aggregated model and tool usage."""
+    model_calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    cost_usd: float = 0.0
+    model_seconds: float = 0.0
+    model_seconds_max: float = 0.0
+    tool_calls: int = 0
+    tool_seconds: float = 0.0
+    # Tool name -> [calls, seconds].
+    tools: dict[str, list] = field(default_factory=dict)
+
+    def add_model_call(self, prompt: int, completion: int, cached: int, cost: float, seconds: float):
+        self.model_calls += 1
+        self.prompt_tokens += prompt
+        self.completion_tokens += completion
+        self.cached_tokens += cached
+        self.cost_usd += cost
+        self.model_seconds += seconds
+        self.model_seconds_max = max(self.model_seconds_max, seconds)
+
+    def add_tool_call(self, tool_name: str, seconds: float):
+        self.tool_calls += 1
+        self.tool_seconds += seconds
+        calls = self.tools.setdefault(tool_name, [0, 0.0])
+        calls[0] += 1
+        calls[1] += seconds
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "model_calls": self.model_calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cost_usd": round(self.cost_usd, 6),
+            "model_seconds": round(self.model_seconds, 3),
+            "model_seconds_avg": round(self.model_seconds / self.model_calls, 3) if self.model_calls else 0.0,
+            "model_seconds_max": round(self.model_seconds_max, 3),
+            "tool_calls": self.tool_calls,
+            "tool_seconds": round(self.tool_seconds, 3),
+            "tools": {
+                name: {"calls": calls, "seconds": round(seconds, 3)}
+                for name, (calls, seconds) in self.tools.items()
+            },
+        }
+
+
+def model_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    """Returns the estimated cost of a model call in USD; 0 for unknown models."""
+    prices = MODEL_PRICES.get(model.rsplit("/", 1)[-1])
+    if prices is None:
+        return 0.0
+    return (prompt_tokens * prices[0] + completion_tokens * prices[1]) / 1_000_000
+
+
+class UsageTracker:
+    """Thread-safe per-agent and per-session usage aggregates."""
+
+    # Calls without an end (e.g. the model raised) are dropped after this long.
+    PENDING_TIMEOUT = 10 * 60
+
+    def __init__(self, max_sessions: int = USAGE_MAX_SESSIONS):
+        self._max_sessions = max_sessions
+        self._lock = threading.Lock()
+        self._agents: dict[str, UsageStats] = {}
+        self._sessions: OrderedDict[str, dict[str, UsageStats]] = OrderedDict()
+        self._pending: dict[tuple, tuple[float, str]] = {}
+
+    def start(self, key: tuple, model: str = ""):
+        now = time.perf_counter()
+        with self._lock:
+            if len(self._pending) > 1024:
+                cutoff = now - self.PENDING_TIMEOUT
+                for stale in [k for k, (started, _) in self._pending.items() if started < cutoff]:
+                    del self._pending[stale]
+            self._pending[key] = (now, model)
+
+    def finish(self, key: tuple) -> Optional[tuple[float, str]]:
+        """Returns (seconds since start, model) of a started call."""
+        with self._lock:
+            started = self._pending.pop(key, None)
+        if started is None:
+            return None
+        return time.perf_counter() - started[0], started[1]
+
+    def _stats(self, agent_name: str, session_id: Optional[str]) -> list[UsageStats]:
+        stats = [self._agents.setdefault(agent_name, UsageStats())]
+        if session_id:
+            agents = self._sessions.get(session_id)
+            if agents is None:
+                agents = self._sessions[session_id] = {}
+                while len(self._sessions) > self._max_sessions:
+                    self._sessions.popitem(last=False)
+            self._sessions.move_to_end(session_id)
+            stats.append(agents.setdefault(agent_name, UsageStats()))
+        return stats
+
+    def record_model_call(
+        self,
+        agent_name: str,
+        session_id: Optional[str],
+        model: str,
+        seconds: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        cached_tokens: int = 0,
+    ):
+        cost = model_cost(model, prompt_tokens, completion_tokens)
+        with self._lock:
+            for stats in self._stats(agent_name, session_id):
+                stats.add_model_call(prompt_tokens, completion_tokens, cached_tokens, cost, seconds)
+
+    def record_tool_call(self, agent_name: str, session_id: Optional[str], tool_name: str, seconds: float):
+        with self._lock:
+            for stats in self._stats(agent_name, session_id):
+                stats.add_tool_call(tool_name, seconds)
+
+    def snapshot(self, session_id: Optional[str] = None, max_sessions: int = 50) -> dict[str, Any]:
+        """Returns the per-agent aggregates and the totals of the most recent sessions.
+
+        With a session_id, returns the per-agent usage of that session only.
+        """
+        with self._lock:
+            if session_id is not None:
+                agents = self._sessions.get(session_id, {})
+                return {
+                    "session_id": session_id,
+                    "agents": {name: stats.to_dict() for name, stats in agents.items()},
+                }
+
+            sessions = {}
+            for sid in list(reversed(self._sessions))[:max_sessions]:
+                total = UsageStats()
+                for stats in self._sessions[sid].values():
+                    total.model_calls += stats.model_calls
+                    total.prompt_tokens += stats.prompt_tokens
+                    total.completion_tokens += stats.completion_tokens
+                    total.cached_tokens += stats.cached_tokens
+                    total.cost_usd += stats.cost_usd
+                    total.model_seconds += stats.model_seconds
+                    total.model_seconds_max = max(total.model_seconds_max, stats.model_seconds_max)
+                    total.tool_calls += stats.tool_calls
+                    total.tool_seconds += stats.tool_seconds
+                sessions[sid] = total.to_dict()
+            return {
+                "agents": {name: stats.to_dict() for name, stats in self._agents.items()},
+                "sessions": sessions,
+            }
+
+
+usage = UsageTracker()
+
+
+def _session_id(context: CallbackContext) -> Optional[str]:
+    invocation = getattr(context, "_invocation_context", None)
+    return getattr(getattr(invocation, "session", None), "id", None)
+
+
+def _before_model(callback_context: CallbackContext, llm_request: LlmRequest) -> None:
+    usage.start(
+        ("model", callback_context.invocation_id, callback_context.agent_name),
+        llm_request.model or "",
+    )
+
+
+def _after_model(callback_context: CallbackContext, llm_response: LlmResponse) -> None:
+    # Streamed responses end with the chunk carrying the usage metadata.
+    if llm_response.partial:
+        return
+    started = usage.finish(("model", callback_context.invocation_id, callback_context.agent_name))
+    if started is None:
+        return
+    seconds, model = started
+    metadata = llm_response.usage_metadata
+    usage.record_model_call(
+        callback_context.agent_name,
+        _session_id(callback_context),
+        model,
+        seconds,
+        prompt_tokens=(metadata and metadata.prompt_token_count) or 0,
+        completion_tokens=(
+            ((metadata and metadata.candidates_token_count) or 0)
+            + ((metadata and metadata.thoughts_token_count) or 0)
+        ),
+        cached_tokens=(metadata and metadata.cached_content_token_count) or 0,
+    )
+
+
+def _before_tool(tool: BaseTool, args: dict[str, Any], tool_context: ToolContext) -> None:
+    usage.start(("tool", tool_context.invocation_id, tool_context.function_call_id or tool.name))
+
+
+def _after_tool(
+    tool: BaseTool, args: dict[str, Any], tool_context: ToolContext, tool_response: Any
+) -> None:
+    started = usage.finish(("tool", tool_context.invocation_id, tool_context.function_call_id or tool.name))
+    if started is not None:
+        usage.record_tool_call(tool_context.agent_name, _session_id(tool_context), tool.name, started[0])
+
+
+def _add_callback(agent: Agent, name: str, callback):
+    existing = getattr(agent, name)
+    callbacks = list(existing) if isinstance(existing, list) else [existing] if existing else []
+    if callback not in callbacks:
+        setattr(agent, name, callbacks + [callback])
+
+
+def instrument(agent: Agent) -> Agent:
+    """Adds the usage callbacks to an agent and the agents it calls; returns the agent."""
+    _add_callback(agent, "before_model_callback", _before_model)
+    _add_callback(agent, "after_model_callback", _after_model)
+    _add_callback(agent, "before_tool_callback", _before_tool)
+    _add_callback(agent, "after_tool_callback", _after_tool)
+    for sub_agent in agent.sub_agents:
+        if isinstance(sub_agent, Agent):
+            instrument(sub_agent)
+    for tool in agent.tools:
+        if isinstance(tool, AgentTool) and isinstance(tool.agent, Agent):
+            instrument(tool.agent)
+    return agent
@@ -12,36 +12,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""Booking agent and sub-agents, handling the confirmation and payment of bookable events."""
+"""Booking agent, handling the confirmation and payment of bookable events."""
 
 from google.adk.agents import Agent
-from google.adk.tools.agent_tool import AgentTool
 from google.genai.types import GenerateContentConfig
 
-from trip_planner.agents.sub_agents.booking.prompt import CONFIRM_RESERVATION_INSTR, PAYMENT_CHOICE_INSTR, PROCESS_PAYMENT_INSTR, BOOKING_AGENT_INSTR
-
-
-create_reservation = Agent(
-    model="gemini-2.5-flash",
-    name="create_reservation",
-    description="""Create a reservation for the selected item.""",
-    instruction=CONFIRM_RESERVATION_INSTR,
-)
-
-
-payment_choice = Agent(
-    model="gemini-2.5-flash",
-    name="payment_choice",
-    description="""Show the users available payment choices.""",
-    instruction=PAYMENT_CHOICE_INSTR,
-)
-
-process_payment = Agent(
-    model="gemini-2.5-flash",
-    name="process_payment",
-    description="""Given a selected payment choice, processes the payment, completing the transaction.""",
-    instruction=PROCESS_PAYMENT_INSTR,
-)
+from trip_planner.agents.sub_agents.booking.prompt import BOOKING_AGENT_INSTR
+from trip_planner.agents.sub_agents.booking.tools import book_items, list_bookable_items
+from trip_planner.agents.shared_libraries.usage import instrument
 
 
 # booking_agent = Agent(
@@ -60,17 +38,16 @@ process_payment = Agent(
 # )
 
 def create_agent() -> Agent:
-    return Agent(
+    return instrument(Agent(
     model="gemini-2.5-flash",
     name="booking_agent",
     description="Given an itinerary, complete the bookings of items by handling payment choices and processing.",
     instruction=BOOKING_AGENT_INSTR,
     tools=[
-        AgentTool(agent=create_reservation),
-        AgentTool(agent=payment_choice),
-        AgentTool(agent=process_payment),
+        list_bookable_items,
+        book_items,
     ],
     generate_content_config=GenerateContentConfig(
         temperature=0.0, top_p=0.5
     )
-    )
\ No newline at end of file
+    ))
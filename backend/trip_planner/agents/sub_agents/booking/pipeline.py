@@ -0,0 +1,336 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Concurrent booking of the bookable items of a trip.
+
+BookingPipeline reserves and pays for every item at once against a
+BookingProvider. If any item fails, the steps that succeeded are compensated
+(payments refunded, then reservations cancelled), so a trip is booked entirely
+or not at all. Every item carries an idempotency key derived from its id and
+content, so a retried booking returns the existing reservation instead of
+booking twice.
+
+BOOKING_PROVIDER selects the provider: "mock" (the default) or the import path
+of a BookingProvider factory, e.g. "my_package.providers:create_provider".
+"""
+
+import asyncio
+import hashlib
+import importlib
+import json
+import os
+import random
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Mapping, Optional
+
+BOOKING_MAX_CONCURRENCY = int(os.getenv("BOOKING_MAX_CONCURRENCY", 8))
+BOOKING_STEP_TIMEOUT = float(os.getenv("BOOKING_STEP_TIMEOUT", 10))
+
+# Keys of the flight and hotel selections booked when there is no itinerary.
+SELECTION_KEYS = {
+    "outbound_flight_selection": "flight",
+    "return_flight_selection": "flight",
+    "hotel_selection": "hotel",
+}
+
+
+class BookingError(Exception):
+    """A provider refused a booking step."""
+
+
+@dataclass(slots=True, frozen=True)
+class BookingItem:
+    """An itinerary event or a selection to book; details is the event as stored in state."""
+    item_id: str
+    event_type: str
+    description: str
+    price: str
+    details: dict[str, Any] = field(repr=False, compare=False)
+
+    def idempotency_key(self, scope: str) -> str:
+        """Returns the key identifying the booking of this item within scope (e.g. a session)."""
+        content = {k: v for k, v in self.details.items() if k != "booking_id"}
+        # Events carry no date, the item id tells the same event on two days apart.
+        encoded = json.dumps(
+            [scope, self.item_id, self.event_type, content], sort_keys=True, default=str
+        )
+        return hashlib.blake2b(encoded.encode("utf-8"), digest_size=12).hexdigest()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "item_id": self.item_id,
+            "event_type": self.event_type,
+            "description": self.description,
+            "price": self.price,
+        }
+
+
+def _selection(value: Any) -> Optional[dict[str, Any]]:
+    # memorize stores selections as strings, usually the JSON of the chosen entry.
+    if isinstance(value, str):
+        if not value.strip():
+            return None
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return {"description": value}
+    return value if isinstance(value, dict) and value else None
+
+
+def bookable_items(state: Mapping[str, Any]) -> list[BookingItem]:
+    """Returns the items of the trip that require booking and are not booked yet.
+
+    These are the itinerary events with booking_required set, or, without an
+    itinerary, the flight and hotel selections.
+    """
+    items = []
+    itinerary = state.get("itinerary") or {}
+    days = itinerary.get("days") if isinstance(itinerary, dict) else None
+    if days:
+        for day_index, day in enumerate(days):
+            for event_index, event in enumerate(day.get("events", [])):
+                if not event.get("booking_required") or event.get("booking_id"):
+                    continue
+                items.append(
+                    BookingItem(
+                        item_id=f"day{day.get('day_number', day_index + 1)}-{event_index + 1}",
+                        event_type=event.get("event_type", ""),
+                        description=event.get("description", ""),
+                        price=str(event.get("price") or ""),
+                        details=event,
+                    )
+                )
+        return items
+
+    for key, event_type in SELECTION_KEYS.items():
+        selection = _selection(state.get(key))
+        if selection is None or selection.get("booking_id"):
+            continue
+        description = selection.get("name") or selection.get("flight_number") or selection.get("description", "")
+        price = selection.get("price_in_usd", selection.get("price", ""))
+        items.append(
+            BookingItem(
+                item_id=key.removesuffix("_selection"),
+                event_type=event_type,
+                description=str(description),
+                price=str(price),
+                details=selection,
+            )
+        )
+    return items
+
+
+class BookingProvider(ABC):
+    """Reservation and payment backend.
+
+    Every method is idempotent for a given key, and cancel and refund do
+    nothing if there is nothing to undo, so that a step whose outcome is
+    unknown (e.g. it timed out) can always be compensated.
+    """
+
+    @abstractmethod
+    async def reserve(self, item: BookingItem, idempotency_key: str) -> str:
+        """Reserves an item and returns the reservation id."""
+
+    @abstractmethod
+    async def pay(self, reservation_id: str, payment_method: str, idempotency_key: str) -> str:
+        """Pays for a reservation and returns the payment id."""
+
+    @abstractmethod
+    async def refund(self, idempotency_key: str):
+        """Refunds the payment made with idempotency_key, if any."""
+
+    @abstractmethod
+    async def cancel(self, idempotency_key: str):
+        """Cancels the reservation made with idempotency_key, if any."""
+
+
+class MockBookingProvider(BookingProvider):
+    """In-memory provider simulating a payment gateway.
+
+    Apple Pay payments are declined and the others approved; failure_rate makes
+    reservations fail at random.
+    """
+
+    DECLINED_PAYMENT_METHODS = ("apple pay",)
+
+    def __init__(self, latency: float = 0.05, failure_rate: float = 0.0):
+        self._latency = latency
+        self._failure_rate = failure_rate
+        self._reservations: dict[str, str] = {}
+        self._payments: dict[str, str] = {}
+
+    async def _call(self):
+        if self._latency:
+            await asyncio.sleep(random.uniform(0.5, 1.5) * self._latency)
+
+    async def reserve(self, item: BookingItem, idempotency_key: str) -> str:
+        await self._call()
+        reservation_id = self._reservations.get(idempotency_key)
+        if reservation_id is None:
+            if random.random() < self._failure_rate:
+                raise BookingError(f"{item.description or item.item_id} is no longer available")
+            prefix = (item.event_type or "item")[:3].upper()
+            reservation_id = f"{prefix}-{uuid.uuid4().hex[:8].upper()}"
+            self._reservations[idempotency_key] = reservation_id
+        return reservation_id
+
+    async def pay(self, reservation_id: str, payment_method: str, idempotency_key: str) -> str:
+        await self._call()
+        payment_id = self._payments.get(idempotency_key)
+        if payment_id is None:
+            if payment_method.strip().lower() in self.DECLINED_PAYMENT_METHODS:
+                raise BookingError(f"{payment_method} declined the payment for {reservation_id}")
+            payment_id = f"PAY-{uuid.uuid4().hex[:10].upper()}"
+            self._payments[idempotency_key] = payment_id
+        return payment_id
+
+    async def refund(self, idempotency_key: str):
+        await self._call()
+        self._payments.pop(idempotency_key, None)
+
+    async def cancel(self, idempotency_key: str):
+        await self._call()
+        self._reservations.pop(idempotency_key, None)
+
+
+@dataclass(slots=True)
+class ItemOutcome:
+    """The result of booking one item, with the time spent in each step."""
+    item: BookingItem
+    idempotency_key: str
+    status: str = "pending"
+    reservation_id: Optional[str] = None
+    payment_id: Optional[str] = None
+    error: Optional[str] = None
+    timings_ms: dict[str, float] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            **self.item.to_dict(),
+            "idempotency_key": self.idempotency_key,
+            "status": self.status,
+            "booking_id": self.reservation_id,
+            "payment_id": self.payment_id,
+            "error": self.error,
+            "timings_ms": self.timings_ms,
+        }
+
+
+class BookingPipeline:
+    """Books the items of a trip concurrently, rolling back on failure."""
+
+    def __init__(
+        self,
+        provider: BookingProvider,
+        max_concurrency: int = BOOKING_MAX_CONCURRENCY,
+        step_timeout: float = BOOKING_STEP_TIMEOUT,
+    ):
+        self.provider = provider
+        self._max_concurrency = max_concurrency
+        self._step_timeout = step_timeout
+
+    async def _step(self, outcome: ItemOutcome, name: str, semaphore: asyncio.Semaphore, call):
+        # call makes the provider coroutine once a slot is free, so that the time
+        # spent waiting for the slot is not counted and nothing is left un-awaited
+        # if the booking is cancelled meanwhile.
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                return await asyncio.wait_for(call(), self._step_timeout)
+            finally:
+                outcome.timings_ms[name] = round((time.perf_counter() - started) * 1000, 1)
+
+    async def _book(self, outcome: ItemOutcome, payment_method: str, semaphore: asyncio.Semaphore):
+        key = outcome.idempotency_key
+        try:
+            outcome.reservation_id = await self._step(
+                outcome, "reserve", semaphore, lambda: self.provider.reserve(outcome.item, key)
+            )
+            outcome.payment_id = await self._step(
+                outcome,
+                "pay",
+                semaphore,
+                lambda: self.provider.pay(outcome.reservation_id, payment_method, key),
+            )
+            outcome.status = "booked"
+        except asyncio.TimeoutError:
+            outcome.status, outcome.error = "failed", "The booking provider timed out"
+        except BookingError as e:
+            outcome.status, outcome.error = "failed", str(e)
+        except Exception as e:
+            # Any other provider error fails the item too, so the rest is rolled back.
+            outcome.status, outcome.error = "failed", f"{type(e).__name__}: {e}"
+
+    async def _compensate(self, outcome: ItemOutcome, semaphore: asyncio.Semaphore):
+        key = outcome.idempotency_key
+        # The reservation is cancelled even if the refund failed, so it does not leak.
+        errors = []
+        for name, call in (("refund", self.provider.refund), ("cancel", self.provider.cancel)):
+            try:
+                await self._step(outcome, name, semaphore, lambda call=call: call(key))
+            except asyncio.TimeoutError:
+                errors.append(f"{name} timed out")
+                continue
+            except Exception as e:
+                errors.append(f"{name} failed: {e}")
+                continue
+            if name == "refund":
+                outcome.payment_id = None
+            else:
+                outcome.reservation_id = None
+        if errors:
+            outcome.error = f"{outcome.error or ''} Rollback failed: {'; '.join(errors)}".strip()
+            return
+        if outcome.status == "booked":
+            outcome.status = "rolled_back"
+
+    async def book(self, items: list[BookingItem], payment_method: str, scope: str = "") -> dict[str, Any]:
+        """Books all items with a payment method.
+
+        Returns:
+            The overall status ("confirmed" or "failed") and the outcome of each item.
+        """
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        outcomes = [ItemOutcome(item, item.idempotency_key(scope)) for item in items]
+
+        await asyncio.gather(*(self._book(outcome, payment_method, semaphore) for outcome in outcomes))
+        failed = any(outcome.status == "failed" for outcome in outcomes)
+        if failed:
+            await asyncio.gather(*(self._compensate(outcome, semaphore) for outcome in outcomes))
+
+        return {
+            "status": "failed" if failed else "confirmed",
+            "payment_method": payment_method,
+            "items": [outcome.to_dict() for outcome in outcomes],
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+
+
+def create_booking_provider() -> BookingProvider:
+    """Creates the booking provider configured by BOOKING_PROVIDER."""
+    provider = os.getenv("BOOKING_PROVIDER", "mock")
+    if provider == "mock":
+        return MockBookingProvider(
+            latency=float(os.getenv("BOOKING_MOCK_LATENCY", 0.05)),
+            failure_rate=float(os.getenv("BOOKING_MOCK_FAILURE_RATE", 0)),
+        )
+    module_name, _, factory_name = provider.partition(":")
+    if not factory_name:
+        raise ValueError(f'BOOKING_PROVIDER must be "mock" or "module:factory", not {provider!r}')
+    return getattr(importlib.import_module(module_name), factory_name)()
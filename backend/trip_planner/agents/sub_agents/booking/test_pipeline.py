@@ -0,0 +1,152 @@
+"""Tests of the concurrent booking pipeline and its rollback."""
+
+import asyncio
+import gc
+import warnings
+
+from trip_planner.agents.sub_agents.booking.pipeline import (
+    BookingError,
+    BookingItem,
+    BookingPipeline,
+    MockBookingProvider,
+    bookable_items,
+)
+
+STATE = {
+    "itinerary": {
+        "days": [
+            {
+                "day_number": 1,
+                "events": [
+                    {"event_type": "flight", "description": "DEL to DPS", "booking_required": True, "price": "500"},
+                    {"event_type": "visit", "description": "Beach", "booking_required": False},
+                    {"event_type": "hotel", "description": "Seaside", "booking_required": True, "price": "120"},
+                ],
+            },
+            {
+                "day_number": 2,
+                "events": [
+                    {"event_type": "visit", "description": "Temple tour", "booking_required": True, "price": "40"},
+                ],
+            },
+        ]
+    }
+}
+
+
+class FailingRefundProvider(MockBookingProvider):
+    async def refund(self, idempotency_key: str):
+        raise ConnectionError("gateway down")
+
+
+class SlowProvider(MockBookingProvider):
+    """Takes exactly delay seconds per reservation."""
+
+    def __init__(self, delay: float):
+        super().__init__(latency=0)
+        self.delay = delay
+
+    async def reserve(self, item: BookingItem, idempotency_key: str) -> str:
+        await asyncio.sleep(self.delay)
+        return await super().reserve(item, idempotency_key)
+
+
+def _book(pipeline: BookingPipeline, payment_method: str, items=None, scope: str = "s1"):
+    return asyncio.run(pipeline.book(items or bookable_items(STATE), payment_method, scope))
+
+
+def test_bookable_items_are_the_events_requiring_booking():
+    assert [item.item_id for item in bookable_items(STATE)] == ["day1-1", "day1-3", "day2-1"]
+
+
+def test_books_every_item():
+    provider = MockBookingProvider(latency=0)
+    result = _book(BookingPipeline(provider), "Visa")
+
+    assert result["status"] == "confirmed"
+    assert {item["status"] for item in result["items"]} == {"booked"}
+    assert all(item["booking_id"] and item["payment_id"] for item in result["items"])
+
+
+def test_declined_payment_rolls_back_the_whole_trip():
+    provider = MockBookingProvider(latency=0)
+    result = _book(BookingPipeline(provider), "Apple Pay")
+
+    assert result["status"] == "failed"
+    assert {item["status"] for item in result["items"]} == {"failed"}
+    assert provider._reservations == {} and provider._payments == {}
+
+
+def test_a_failed_item_rolls_back_the_booked_ones():
+    provider = MockBookingProvider(latency=0)
+    original_reserve = provider.reserve
+
+    async def reserve(item, key):
+        if item.item_id == "day2-1":
+            raise BookingError("Temple tour is no longer available")
+        return await original_reserve(item, key)
+
+    provider.reserve = reserve
+    result = _book(BookingPipeline(provider), "Visa")
+
+    statuses = {item["item_id"]: item["status"] for item in result["items"]}
+    assert result["status"] == "failed"
+    assert statuses == {"day1-1": "rolled_back", "day1-3": "rolled_back", "day2-1": "failed"}
+    assert provider._reservations == {} and provider._payments == {}
+
+
+def test_failed_refund_still_cancels_the_reservation():
+    provider = FailingRefundProvider(latency=0)
+    result = _book(BookingPipeline(provider), "Apple Pay")
+
+    assert provider._reservations == {}
+    assert all("Rollback failed: refund failed: gateway down" in item["error"] for item in result["items"])
+
+
+def test_retried_booking_reuses_the_reservations():
+    provider = MockBookingProvider(latency=0)
+    pipeline = BookingPipeline(provider)
+    first = _book(pipeline, "Visa")
+    second = _book(pipeline, "Visa")
+
+    assert [item["booking_id"] for item in first["items"]] == [
+        item["booking_id"] for item in second["items"]
+    ]
+    assert len(provider._reservations) == 3
+
+
+def test_idempotency_keys_depend_on_scope_item_and_content():
+    event = {"event_type": "visit", "description": "Temple tour"}
+    item = BookingItem("day1-1", "visit", "Temple tour", "40", event)
+
+    assert item.idempotency_key("s1") == BookingItem("day1-1", "visit", "x", "y", dict(event)).idempotency_key("s1")
+    assert item.idempotency_key("s1") != item.idempotency_key("s2")
+    # The same event on another day is another booking.
+    assert item.idempotency_key("s1") != BookingItem("day2-1", "visit", "Temple tour", "40", event).idempotency_key("s1")
+    assert item.idempotency_key("s1") != BookingItem(
+        "day1-1", "visit", "Temple tour", "40", {**event, "start_time": "10:00"}
+    ).idempotency_key("s1")
+
+
+def test_step_timings_exclude_the_wait_for_a_slot():
+    provider = SlowProvider(delay=0.05)
+    result = _book(BookingPipeline(provider, max_concurrency=1), "Visa")
+
+    assert result["status"] == "confirmed"
+    assert all(item["timings_ms"]["reserve"] < 90 for item in result["items"])
+
+
+def test_cancelled_booking_leaves_no_coroutine_unawaited():
+    async def scenario():
+        pipeline = BookingPipeline(SlowProvider(delay=1), max_concurrency=1)
+        task = asyncio.create_task(pipeline.book(bookable_items(STATE), "Visa", "s1"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        asyncio.run(scenario())
+        gc.collect()
+
+    assert not [w for w in caught if "never awaited" in str(w.message)]
@@ -0,0 +1,107 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tools of the booking agent, running the booking pipeline on the session's trip."""
+
+import copy
+import uuid
+from typing import Optional
+
+from google.adk.tools import ToolContext
+
+from trip_planner.agents.sub_agents.booking.pipeline import (
+    BookingItem,
+    BookingPipeline,
+    bookable_items,
+    create_booking_provider,
+)
+
+# Idempotency keys are scoped per session, so retries within a session are
+# deduplicated while two travellers booking the same flight are not.
+BOOKING_SCOPE_KEY = "booking_scope"
+BOOKINGS_KEY = "bookings"
+
+pipeline = BookingPipeline(create_booking_provider())
+
+
+def _pending_items(state) -> tuple[str, list[BookingItem]]:
+    """Returns the booking scope of the session and the items it has not booked yet."""
+    if not state.get(BOOKING_SCOPE_KEY):
+        state[BOOKING_SCOPE_KEY] = uuid.uuid4().hex
+    scope = state[BOOKING_SCOPE_KEY]
+    # Booking ids by idempotency key, covering selections booked without an itinerary.
+    booked = state.get(BOOKINGS_KEY) or {}
+    return scope, [item for item in bookable_items(state) if item.idempotency_key(scope) not in booked]
+
+
+def list_bookable_items(tool_context: ToolContext):
+    """
+    Lists the items of the trip that require booking and are not booked yet.
+
+    Args:
+        tool_context: The ADK tool context.
+
+    Returns:
+        The items, each with its item_id, event type, description and price.
+    """
+    _, items = _pending_items(tool_context.state)
+    return {"items": [item.to_dict() for item in items]}
+
+
+def _record_bookings(tool_context: ToolContext, outcomes: list[dict]):
+    """Stores the booking ids in the itinerary events and the booked selections."""
+    booking_ids = {outcome["item_id"]: outcome["booking_id"] for outcome in outcomes}
+
+    itinerary = tool_context.state.get("itinerary")
+    if isinstance(itinerary, dict) and itinerary.get("days"):
+        itinerary = copy.deepcopy(itinerary)
+        for day_index, day in enumerate(itinerary["days"]):
+            for event_index, event in enumerate(day.get("events", [])):
+                item_id = f"day{day.get('day_number', day_index + 1)}-{event_index + 1}"
+                if item_id in booking_ids:
+                    event["booking_id"] = booking_ids[item_id]
+        tool_context.state["itinerary"] = itinerary
+
+    bookings = dict(tool_context.state.get(BOOKINGS_KEY) or {})
+    bookings.update((outcome["idempotency_key"], outcome["booking_id"]) for outcome in outcomes)
+    tool_context.state[BOOKINGS_KEY] = bookings
+
+
+async def book_items(
+    payment_method: str, tool_context: ToolContext, item_ids: Optional[list[str]] = None
+):
+    """
+    Reserves and pays for the bookable items of the trip, all at once.
+
+    Either every item is booked, or none is: if any reservation or payment
+    fails, the others are cancelled and refunded.
+
+    Args:
+        payment_method: The payment method chosen by the user: Apple Pay, Google Pay or Credit Card.
+        tool_context: The ADK tool context.
+        item_ids: The item_ids from list_bookable_items to book; all of them if not given.
+
+    Returns:
+        The overall status, and the booking id or the error of each item.
+    """
+    scope, items = _pending_items(tool_context.state)
+    if item_ids:
+        items = [item for item in items if item.item_id in item_ids]
+    if not items:
+        return {"status": "nothing_to_book", "items": []}
+
+    result = await pipeline.book(items, payment_method, scope=scope)
+    if result["status"] == "confirmed":
+        _record_bookings(tool_context, result["items"])
+    return result
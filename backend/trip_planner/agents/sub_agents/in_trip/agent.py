@@ -25,24 +25,29 @@ from trip_planner.agents.sub_agents.in_trip.tools import (
     weather_impact_check,
     memorize,
 )
+from trip_planner.agents.shared_libraries.usage import instrument
+
+# An agent has a single parent, so every in_trip_agent gets its own sub-agents.
 
 # This sub-agent is expected to be called every day closer to the trip, and frequently several times a day during the trip.
-day_of_agent = Agent(
-    model="gemini-2.5-flash",
-    name="day_of_agent",
-    description="Day_of agent is the agent handling the travel logistics of a trip.",
-    instruction=transit_coordination,
-)
+def create_day_of_agent() -> Agent:
+    return Agent(
+        model="gemini-2.5-flash",
+        name="day_of_agent",
+        description="Day_of agent is the agent handling the travel logistics of a trip.",
+        instruction=transit_coordination,
+    )
 
 
-trip_monitor_agent = Agent(
-    model="gemini-2.5-flash",
-    name="trip_monitor_agent",
-    description="Monitor aspects of a itinerary and bring attention to items that necessitate changes",
-    instruction=TRIP_MONITOR_INSTR,
-    tools=[flight_status_check, event_booking_check, weather_impact_check],
-    output_key="daily_checks",  # can be sent via email.
-)
+def create_trip_monitor_agent() -> Agent:
+    return Agent(
+        model="gemini-2.5-flash",
+        name="trip_monitor_agent",
+        description="Monitor aspects of a itinerary and bring attention to items that necessitate changes",
+        instruction=TRIP_MONITOR_INSTR,
+        tools=[flight_status_check, event_booking_check, weather_impact_check],
+        output_key="daily_checks",  # can be sent via email.
+    )
 
 
 # in_trip_agent = Agent(
@@ -61,16 +66,16 @@ trip_monitor_agent = Agent(
 
 
 def create_agent() -> Agent:
-    return Agent(
+    return instrument(Agent(
     model="gemini-2.5-flash",
     name="in_trip_agent",
     description="Provide information about what the users need as part of the tour.",
     instruction=INTRIP_INSTR,
     sub_agents=[
-        trip_monitor_agent
+        create_trip_monitor_agent()
     ],  # This can be run as an AgentTool. Illustrate as an Agent for demo purpose.
     tools=[
-        AgentTool(agent=day_of_agent), 
+        AgentTool(agent=create_day_of_agent()), 
         memorize
     ],
-    )
\ No newline at end of file
+    ))
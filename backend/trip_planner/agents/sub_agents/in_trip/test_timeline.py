@@ -0,0 +1,61 @@
+"""Tests of the in-trip itinerary timeline."""
+
+from datetime import datetime
+
+from trip_planner.agents.shared_libraries.itinerary import load_itinerary
+from trip_planner.agents.sub_agents.in_trip.timeline import ItineraryTimeline
+
+HOME = {"event_type": "home", "address": "Home"}
+
+FLIGHT = {"event_type": "flight", "boarding_time": "08:00", "arrival_time": "11:00"}
+HOTEL = {"event_type": "hotel", "check_in_time": "15:00", "check_out_time": "11:00"}
+VISIT = {"event_type": "visit", "description": "Museum", "start_time": "10:00", "end_time": "12:00"}
+DINNER = {"event_type": "visit", "description": "Dinner", "start_time": "20:00", "end_time": "22:00"}
+
+
+def _timeline(*days):
+    return ItineraryTimeline(
+        load_itinerary(
+            {
+                "days": [
+                    {"day_number": number, "date": day_date, "events": events}
+                    for number, (day_date, events) in enumerate(days, start=1)
+                ]
+            }
+        )
+    )
+
+
+def test_segment_at_returns_the_next_event():
+    timeline = _timeline(("2026-12-20", [FLIGHT, HOTEL]), ("2026-12-21", [VISIT]))
+
+    assert timeline.segment_at(datetime(2026, 12, 20, 7), HOME) == (HOME, FLIGHT)
+    assert timeline.segment_at(datetime(2026, 12, 20, 12), HOME) == (FLIGHT, HOTEL)
+    assert timeline.segment_at(datetime(2026, 12, 21, 9), HOME) == (HOTEL, VISIT)
+
+
+def test_segment_at_without_events_is_home():
+    assert _timeline().segment_at(datetime(2026, 12, 20), HOME) == (HOME, HOME)
+
+
+def test_segment_at_after_the_trip_is_the_last_leg():
+    timeline = _timeline(("2026-12-20", [FLIGHT, HOTEL]), ("2026-12-21", [VISIT]))
+
+    assert timeline.segment_at(datetime(2027, 1, 1), HOME) == (HOTEL, VISIT)
+
+
+def test_events_listed_out_of_order_stay_in_itinerary_order():
+    timeline = _timeline(("2026-12-20", [DINNER, VISIT]))
+
+    assert timeline.segment_at(datetime(2026, 12, 20, 9), HOME) == (HOME, DINNER)
+    assert timeline.segment_at(datetime(2026, 12, 20, 21), HOME) == (DINNER, VISIT)
+
+
+def test_events_of_undated_days_are_kept():
+    timeline = _timeline(
+        ("2026-12-20", [FLIGHT]), ("not a date", [VISIT]), ("2026-12-22", [DINNER])
+    )
+
+    assert timeline.events == [FLIGHT, VISIT, DINNER]
+    assert timeline.segment_at(datetime(2026, 12, 20, 7), HOME) == (HOME, FLIGHT)
+    assert timeline.segment_at(datetime(2026, 12, 21), HOME) == (VISIT, DINNER)
@@ -0,0 +1,95 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Sorted timeline of the events of an itinerary, for in-trip segment lookups.
+
+Timelines are built once per itinerary version (see shared_libraries/itinerary.py)
+and kept in a small LRU, so the agents' repeated instruction builds only pay for a
+binary search.
+"""
+
+import bisect
+import threading
+from collections import OrderedDict
+from datetime import datetime, time
+from typing import Any
+
+from trip_planner.agents.shared_libraries.itinerary import TripItinerary
+
+# Events without a usable time stay relevant until the end of their day.
+_END_OF_DAY = time(23, 59, 59)
+
+
+class ItineraryTimeline:
+    """The events of an itinerary in itinerary order, indexed by due datetime.
+
+    Events of a day whose date cannot be parsed keep their place in the
+    itinerary: they are due together with the event listed before them.
+    """
+
+    def __init__(self, trip: TripItinerary):
+        self.events: list[dict[str, Any]] = []
+        # Running maximum of the due datetimes, which makes the list bisectable
+        # even if the itinerary lists an event earlier than its predecessor.
+        self._due_until: list[datetime] = []
+
+        latest = datetime.min
+        for day_date, event in trip.events():
+            if day_date is not None:
+                latest = max(latest, datetime.combine(day_date, event.starts_at or _END_OF_DAY))
+            self.events.append(event.raw)
+            self._due_until.append(latest)
+
+    def segment_at(
+        self, now: datetime, home: dict[str, Any]
+    ) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Returns the (origin, destination) events around the next event due at or after now.
+
+        Once the trip is over this is the last leg of the itinerary; without
+        any event both ends are home.
+        """
+        if not self.events:
+            return home, home
+        index = min(bisect.bisect_left(self._due_until, now), len(self.events) - 1)
+        origin = self.events[index - 1] if index > 0 else home
+        return origin, self.events[index]
+
+
+class _TimelineCache:
+    def __init__(self, max_entries: int = 256):
+        self._max_entries = max_entries
+        self._timelines: OrderedDict[str, ItineraryTimeline] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, trip: TripItinerary) -> ItineraryTimeline:
+        with self._lock:
+            timeline = self._timelines.get(trip.version)
+            if timeline is not None:
+                self._timelines.move_to_end(trip.version)
+                return timeline
+
+        timeline = ItineraryTimeline(trip)
+        with self._lock:
+            self._timelines[trip.version] = timeline
+            while len(self._timelines) > self._max_entries:
+                self._timelines.popitem(last=False)
+        return timeline
+
+
+_timelines = _TimelineCache()
+
+
+def timeline_for(trip: TripItinerary) -> ItineraryTimeline:
+    """Returns the cached timeline of an itinerary, building it on first use."""
+    return _timelines.get(trip)
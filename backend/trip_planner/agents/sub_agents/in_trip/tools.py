@@ -19,31 +19,41 @@ from typing import Dict, Any
 
 from google.adk.agents.readonly_context import ReadonlyContext
 
-from prompt import NEED_ITIN_INSTR, LOGISTIC_INSTR_TEMPLATE
+from trip_planner.agents.sub_agents.in_trip.prompt import NEED_ITIN_INSTR, LOGISTIC_INSTR_TEMPLATE
+from trip_planner.agents.sub_agents.in_trip.timeline import timeline_for
+from collections import OrderedDict
 from datetime import datetime
 import json
+import logging
 import os
+import threading
 from typing import Dict, Any
 
 from google.adk.agents.callback_context import CallbackContext
-from google.adk.sessions.state import State
 from google.adk.tools import ToolContext
 
-from trip_planner.agents.shared_libraries import constants
+from trip_planner.agents.shared_libraries import constants, metrics
+from trip_planner.agents.shared_libraries.cache_stats import cache_metrics
+from trip_planner.agents.shared_libraries.itinerary import TripItinerary, load_itinerary
+from trip_planner.agents.shared_libraries.scenario import ScenarioTemplate
 
 SAMPLE_SCENARIO_PATH = os.getenv(
     "TRAVEL_CONCIERGE_SCENARIO", "travel_concierge/profiles/itinerary_empty_default.json"
 )
+# Parsed lazily, on the first session to initialize.
+_scenario = ScenarioTemplate(SAMPLE_SCENARIO_PATH)
+
+logger = logging.getLogger(__name__)
 
 def flight_status_check(flight_number: str, flight_date: str, checkin_time: str, departure_time: str):
     """Checks the status of a flight, given its flight_number, date, checkin_time and departure_time."""
-    print("Checking", flight_number, flight_date, checkin_time, departure_time)
+    logger.debug("Checking flight %s on %s", flight_number, flight_date)
     return {"status": f"Flight {flight_number} checked"}
 
 
 def event_booking_check(event_name: str, event_date: str, event_location: str):
     """Checks the status of an event that requires booking, given its event_name, date, and event_location."""
-    print("Checking", event_name, event_date, event_location)
+    logger.debug("Checking event %s on %s at %s", event_name, event_date, event_location)
     if event_name.startswith("Space Needle"):  # Mocking an exception to illustrate
         return {"status": f"{event_name} is closed."}
     return {"status": f"{event_name} checked"}
@@ -61,23 +71,10 @@ def weather_impact_check(activity_name: str, activity_date: str, activity_locati
     Returns:
         A dictionary containing the status of the activity.
     """
-    print("Checking", activity_name, activity_date, activity_location)
+    logger.debug("Checking activity %s on %s at %s", activity_name, activity_date, activity_location)
     return {"status": f"{activity_name} checked"}
 
 
-def get_event_time_as_destination(destin_json: Dict[str, Any], default_value: str):
-    """Returns an event time appropriate for the location type."""
-    match destin_json["event_type"]:
-        case "flight":
-            return destin_json["boarding_time"]
-        case "hotel":
-            return destin_json["check_in_time"]
-        case "visit":
-            return destin_json["start_time"]
-        case _:
-            return default_value
-
-
 def parse_as_origin(origin_json: Dict[str, Any]):
     """Returns a tuple of strings (origin, depart_by) appropriate for the starting location."""
     match origin_json["event_type"]:
@@ -136,7 +133,11 @@ def parse_as_destin(destin_json: Dict[str, Any]):
             return "Local in the region", "as soon as possible"
 
 
-def find_segment(profile: Dict[str, Any], itinerary: Dict[str, Any], current_datetime: str):
+def find_segment(
+    profile: Dict[str, Any],
+    itinerary: Dict[str, Any] | TripItinerary,
+    current_datetime: str,
+):
     """
     Find the events to travel from A to B
     This follows the itinerary schema in types.Itinerary.
@@ -146,7 +147,7 @@ def find_segment(profile: Dict[str, Any], itinerary: Dict[str, Any], current_dat
 
     Args:
         profile: A dictionary containing the user's profile.
-        itinerary: A dictionary containing the user's itinerary.
+        itinerary: A dictionary containing the user's itinerary, or its load_itinerary() form.
         current_datetime: A string containing the current date and time.   
 
     Returns:
@@ -155,41 +156,11 @@ def find_segment(profile: Dict[str, Any], itinerary: Dict[str, Any], current_dat
       arrive_by - an indication of the time we shall arrive at the destination.
     """
     # Expects current_datetime is in '2024-03-15 04:00:00' format
-    datetime_object = datetime.fromisoformat(current_datetime)
-    current_date = datetime_object.strftime("%Y-%m-%d")
-    current_time = datetime_object.strftime("%H:%M")
-    event_date = current_date
-    event_time = current_time
-
-    print("-----")
-    print("MATCH DATE", current_date, current_time)
-    print("-----")
-
-    # defaults
-    origin_json = profile["home"]
-    destin_json = profile["home"]
-
-    leave_by = "No movement required"
-    arrive_by = "No movement required"
-
-    # Go through the itinerary to find where we are base on the current date and time
-    for day in itinerary.get("days", []):
-        event_date = day["date"]
-        for event in day["events"]:
-            # for every event we update the origin and destination until
-            # we find one we need to pay attention
-            origin_json = destin_json
-            destin_json = event
-            event_time = get_event_time_as_destination(destin_json, current_time)
-            # The moment we find an event that's in the immediate future we stop to handle it
-            print(
-                event["event_type"], event_date, current_date, event_time, current_time
-            )
-            if event_date >= current_date and event_time >= current_time:
-                break
-        else:  # if inner loop not break, continue
-            continue
-        break  # else break too.
+    now = datetime.fromisoformat(current_datetime)
+
+    # The itinerary's events are indexed once per itinerary version; finding
+    # where we are is a binary search for the next event due after now.
+    origin_json, destin_json = timeline_for(load_itinerary(itinerary)).segment_at(now, profile["home"])
 
     #
     # Construct prompt descriptions for travel_from, travel_to, arrive_by
@@ -205,7 +176,6 @@ def _inspect_itinerary(state: dict[str: Any]):
 
     itinerary = state[constants.ITIN_KEY]
     profile = state[constants.PROF_KEY]
-    print("itinerary", itinerary)
     current_datetime = itinerary["start_date"] + " 00:00"
     if state.get(constants.ITIN_DATETIME, ""):
         current_datetime = state[constants.ITIN_DATETIME]
@@ -213,37 +183,83 @@ def _inspect_itinerary(state: dict[str: Any]):
     return itinerary, profile, current_datetime
 
 
+class _InstructionCache:
+    """Rendered day_of instructions keyed on (itinerary, home, current datetime bucket)."""
+
+    def __init__(self, max_entries: int = 1024, bucket_seconds: float = 60):
+        self._max_entries = max_entries
+        self._bucket_seconds = bucket_seconds
+        self._instructions: OrderedDict[tuple, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, trip: TripItinerary, home: Dict[str, Any], current_datetime: str) -> tuple:
+        bucket = int(datetime.fromisoformat(current_datetime).timestamp() // self._bucket_seconds)
+        return trip.version, json.dumps(home, sort_keys=True, default=str), bucket
+
+    def get(self, key: tuple) -> str | None:
+        with self._lock:
+            instruction = self._instructions.get(key)
+            if instruction is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._instructions.move_to_end(key)
+            return instruction
+
+    def put(self, key: tuple, instruction: str):
+        with self._lock:
+            self._instructions[key] = instruction
+            while len(self._instructions) > self._max_entries:
+                self._instructions.popitem(last=False)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return cache_metrics(len(self._instructions), self.hits, self.misses)
+
+
+_instruction_cache = _InstructionCache(
+    max_entries=int(os.getenv("TRANSIT_INSTR_CACHE_SIZE", 1024)),
+    bucket_seconds=float(os.getenv("TRANSIT_INSTR_BUCKET_SECONDS", 60)),
+)
+
+metrics.register_cache("transit_instructions", _instruction_cache)
+
+
 def transit_coordination(readonly_context: ReadonlyContext):
-    """Dynamically generates an instruction for the day_of agent."""
+    """Dynamically generates an instruction for the day_of agent.
+
+    Instructions are memoized per itinerary version, home address and
+    TRANSIT_INSTR_BUCKET_SECONDS bucket of the current datetime, so repeated
+    day_of_agent turns within the same segment reuse the rendered text.
+    """
 
     state = readonly_context.state
 
     # Inspecting the itinerary
-    if constants.ITIN_KEY not in state:
+    if not state.get(constants.ITIN_KEY):
         return NEED_ITIN_INSTR
 
     itinerary, profile, current_datetime = _inspect_itinerary(state)
+    trip = load_itinerary(itinerary)
+    key = _instruction_cache.key(trip, profile["home"], current_datetime)
+    instruction = _instruction_cache.get(key)
+    if instruction is not None:
+        return instruction
+
     travel_from, travel_to, leave_by, arrive_by = find_segment(
-        profile, itinerary, current_datetime
+        profile, trip, current_datetime
     )
-
-    print("-----")
-    print(itinerary["trip_name"])
-    print(current_datetime)
-    print("-----")
-    print("-----")
-    print("TRIP EVENT")
-    print("FROM", travel_from, leave_by)
-    print("TO", travel_to, arrive_by)
-    print("-----")
-
-    return LOGISTIC_INSTR_TEMPLATE.format(
+    instruction = LOGISTIC_INSTR_TEMPLATE.format(
         CURRENT_TIME=current_datetime,
         TRAVEL_FROM=travel_from,
         LEAVE_BY_TIME=leave_by,
         TRAVEL_TO=travel_to,
         ARRIVE_BY_TIME=arrive_by,
     )
+    _instruction_cache.put(key, instruction)
+    return instruction
 
 def memorize_list(key: str, value: str, tool_context: ToolContext):
     """
@@ -301,41 +317,18 @@ def forget(key: str, value: str, tool_context: ToolContext):
     return {"status": f'Removed "{key}": "{value}"'}
 
 
-def _set_initial_states(source: Dict[str, Any], target: State | dict[str, Any]):
-    """
-    Setting the initial session state given a JSON object of states.
-
-    Args:
-        source: A JSON object of states.
-        target: The session state object to insert into.
-    """
-    if constants.SYSTEM_TIME not in target:
-        target[constants.SYSTEM_TIME] = str(datetime.now())
-
-    if constants.ITIN_INITIALIZED not in target:
-        target[constants.ITIN_INITIALIZED] = True
-
-        target.update(source)
-
-        itinerary = source.get(constants.ITIN_KEY, {})
-        if itinerary:
-            target[constants.ITIN_START_DATE] = itinerary[constants.START_DATE]
-            target[constants.ITIN_END_DATE] = itinerary[constants.END_DATE]
-            target[constants.ITIN_DATETIME] = itinerary[constants.START_DATE]
-
-
 def _load_precreated_itinerary(callback_context: CallbackContext):
     """
     Sets up the initial state.
     Set this as a callback as before_agent_call of the root_agent.
     This gets called before the system instruction is contructed.
 
+    The scenario is parsed once per process and the callback does nothing once
+    the session has been initialized.
+
     Args:
         callback_context: The callback context.
-    """    
-    data = {}
-    with open(SAMPLE_SCENARIO_PATH, "r") as file:
-        data = json.load(file)
-        print(f"\nLoading Initial State: {data}\n")
-
-    _set_initial_states(data["state"], callback_context.state)
+    """
+    if constants.ITIN_INITIALIZED in callback_context.state:
+        return None
+    _scenario.apply(callback_context.state)
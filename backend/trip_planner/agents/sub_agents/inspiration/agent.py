@@ -15,35 +15,42 @@
 """Inspiration agent. A pre-booking agent covering the ideation part of the trip."""
 
 from google.adk.agents import Agent
-from google.adk.tools.agent_tool import AgentTool
 from trip_planner.agents.shared_libraries.types import DestinationIdeas, POISuggestions, json_response_config
 from trip_planner.agents.sub_agents.inspiration import prompt
-from trip_planner.agents.sub_agents.inspiration.tools import map_tool
+from trip_planner.agents.sub_agents.inspiration.tools import CachedAgentTool, map_tool
+from trip_planner.agents.shared_libraries.usage import instrument
 
+# The user_profile fields the suggestions of place_agent and poi_agent depend on.
+SUGGESTION_PROFILE_FIELDS = ("likes", "dislikes", "price_sensitivity", "food_preference")
+
+
+# An agent has a single parent, so every inspiration_agent gets its own sub-agents.
+def create_place_agent() -> Agent:
+    return Agent(
+        model="gemini-2.5-flash",
+        name="place_agent",
+        instruction=prompt.PLACE_AGENT_INSTR,
+        description="This agent suggests a few destination given some user preferences",
+        disallow_transfer_to_parent=True,
+        disallow_transfer_to_peers=True,
+        output_schema=DestinationIdeas,
+        output_key="place",
+        generate_content_config=json_response_config,
+    )
 
-place_agent = Agent(
-    model="gemini-2.5-flash",
-    name="place_agent",
-    instruction=prompt.PLACE_AGENT_INSTR,
-    description="This agent suggests a few destination given some user preferences",
-    disallow_transfer_to_parent=True,
-    disallow_transfer_to_peers=True,
-    output_schema=DestinationIdeas,
-    output_key="place",
-    generate_content_config=json_response_config,
-)
-
-poi_agent = Agent(
-    model="gemini-2.5-flash",
-    name="poi_agent",
-    description="This agent suggests a few activities and points of interests given a destination",
-    instruction=prompt.POI_AGENT_INSTR,
-    disallow_transfer_to_parent=True,
-    disallow_transfer_to_peers=True,
-    output_schema=POISuggestions,
-    output_key="poi",
-    generate_content_config=json_response_config,
-)
+
+def create_poi_agent() -> Agent:
+    return Agent(
+        model="gemini-2.5-flash",
+        name="poi_agent",
+        description="This agent suggests a few activities and points of interests given a destination",
+        instruction=prompt.POI_AGENT_INSTR,
+        disallow_transfer_to_parent=True,
+        disallow_transfer_to_peers=True,
+        output_schema=POISuggestions,
+        output_key="poi",
+        generate_content_config=json_response_config,
+    )
 
 # inspiration_agent = Agent(
 #     model="gemini-2.5-flash",
@@ -54,10 +61,14 @@ poi_agent = Agent(
 # )
 
 def create_agent() -> Agent:
-    return Agent(
+    return instrument(Agent(
     model="gemini-2.5-flash",
     name="inspiration_agent",
     description="A travel inspiration agent who inspire users, and discover their next vacations; Provide information about places, activities, interests,",
     instruction=prompt.INSPIRATION_AGENT_INSTR,
-    tools=[AgentTool(agent=place_agent), AgentTool(agent=poi_agent), map_tool],
-    )
+    tools=[
+        CachedAgentTool(agent=create_place_agent(), profile_fields=SUGGESTION_PROFILE_FIELDS),
+        CachedAgentTool(agent=create_poi_agent(), profile_fields=SUGGESTION_PROFILE_FIELDS),
+        map_tool,
+    ],
+    ))
@@ -0,0 +1,210 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Process-wide cache of Places API lookups.
+
+Lookups are keyed by the normalized query text and kept in an in-memory LRU,
+optionally backed by a SQLite file (PLACES_CACHE_DB_PATH) shared by restarts and
+by the workers of one machine. Places that were found are kept for
+PLACES_CACHE_TTL seconds; queries without any candidate are cached as well, for
+the shorter PLACES_CACHE_NEGATIVE_TTL. Request failures are never cached.
+
+aget() and aput() access the SQLite tier from a worker thread, and evict its
+expired rows every PLACES_CACHE_SWEEP_INTERVAL seconds.
+"""
+
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+from trip_planner.agents.shared_libraries.cache_stats import cache_metrics
+
+# Cached value of a query the Places API has no candidate for.
+NOT_FOUND = {"not_found": True}
+
+
+def normalize_query(query: str) -> str:
+    """Maps "  Eiffel Tower,  Paris " and "eiffel tower, paris" to the same key."""
+    return re.sub(r"\s+", " ", query).strip().casefold()
+
+
+class _SqlitePlaces:
+    """Blocking SQLite tier of the cache."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS places (
+                query TEXT PRIMARY KEY,
+                data TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )"""
+        )
+
+    def load(self, query: str) -> Optional[tuple[str, float]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT data, expires_at FROM places WHERE query = ?", (query,)
+            ).fetchone()
+
+    def save(self, query: str, data: str, expires_at: float):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO places (query, data, expires_at) VALUES (?, ?, ?)",
+                (query, data, expires_at),
+            )
+
+    def evict_expired(self, now: float) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "DELETE FROM places WHERE expires_at < ?", (now,)
+            ).rowcount
+
+
+class PlacesCache:
+    """A thread-safe LRU of place lookups with an optional SQLite tier."""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        ttl_seconds: float = 7 * 24 * 60 * 60,
+        negative_ttl_seconds: float = 60 * 60,
+        db_path: str | None = None,
+        sweep_interval: float = 60 * 60,
+    ):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._negative_ttl_seconds = negative_ttl_seconds
+        self._disk = _SqlitePlaces(db_path) if db_path else None
+        self._sweep_interval = sweep_interval
+        self._last_sweep = time.monotonic()
+
+        self._entries: OrderedDict[str, tuple[dict[str, Any], float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+
+    def get(self, query: str) -> Optional[dict[str, Any]]:
+        """Returns the cached place (or NOT_FOUND) for a query, if any."""
+        key = normalize_query(query)
+        now = time.time()
+        place = self._get_memory(key, now)
+        if place is not None:
+            return place
+
+        if self._disk is not None:
+            row = self._disk.load(key)
+            if row is not None and row[1] >= now:
+                place = json.loads(row[0])
+                with self._lock:
+                    self._put_memory(key, place, row[1])
+                    self.disk_hits += 1
+                    self._count_hit(place)
+                return place
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    async def aget(self, query: str) -> Optional[dict[str, Any]]:
+        """Like get(), without blocking the event loop on the SQLite tier."""
+        if self._disk is None:
+            return self.get(query)
+        place = self._get_memory(normalize_query(query), time.time())
+        if place is not None:
+            return place
+        return await asyncio.to_thread(self.get, query)
+
+    async def aput(self, query: str, place: dict[str, Any]):
+        """Like put(), without blocking the event loop on the SQLite tier."""
+        if self._disk is None:
+            self.put(query, place)
+            return
+        await asyncio.to_thread(self.put, query, place)
+        if time.monotonic() - self._last_sweep >= self._sweep_interval:
+            self._last_sweep = time.monotonic()
+            await asyncio.to_thread(self.evict_expired)
+
+    def put(self, query: str, place: dict[str, Any]):
+        """Caches a place, or NOT_FOUND for a query without candidates."""
+        key = normalize_query(query)
+        ttl = self._negative_ttl_seconds if place == NOT_FOUND else self._ttl_seconds
+        expires_at = time.time() + ttl
+        with self._lock:
+            self._put_memory(key, place, expires_at)
+        if self._disk is not None:
+            self._disk.save(key, json.dumps(place), expires_at)
+
+    def evict_expired(self) -> int:
+        """Drops expired entries from both tiers and returns how many were on disk."""
+        now = time.time()
+        with self._lock:
+            for key in [k for k, (_, expires_at) in self._entries.items() if expires_at < now]:
+                self._entries.pop(key)
+        return self._disk.evict_expired(now) if self._disk is not None else 0
+
+    def metrics(self) -> dict[str, Any]:
+        """Returns hit/miss counters and the size of the in-memory tier."""
+        with self._lock:
+            return cache_metrics(
+                len(self._entries),
+                self.hits,
+                self.misses,
+                disk_hits=self.disk_hits,
+                negative_hits=self.negative_hits,
+            )
+
+    def _get_memory(self, key: str, now: float) -> Optional[dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] >= now:
+                self._entries.move_to_end(key)
+                self._count_hit(entry[0])
+                return entry[0]
+            if entry is not None:
+                self._entries.pop(key)
+        return None
+
+    def _count_hit(self, place: dict[str, Any]):
+        self.hits += 1
+        if place == NOT_FOUND:
+            self.negative_hits += 1
+
+    def _put_memory(self, key: str, place: dict[str, Any], expires_at: float):
+        self._entries[key] = (place, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+def create_places_cache() -> PlacesCache:
+    """Creates the cache configured by the PLACES_CACHE_* environment variables."""
+    return PlacesCache(
+        max_entries=int(os.getenv("PLACES_CACHE_MAX_ENTRIES", 10_000)),
+        ttl_seconds=float(os.getenv("PLACES_CACHE_TTL", 7 * 24 * 60 * 60)),
+        negative_ttl_seconds=float(os.getenv("PLACES_CACHE_NEGATIVE_TTL", 60 * 60)),
+        db_path=os.getenv("PLACES_CACHE_DB_PATH") or None,
+        sweep_interval=float(os.getenv("PLACES_CACHE_SWEEP_INTERVAL", 60 * 60)),
+    )
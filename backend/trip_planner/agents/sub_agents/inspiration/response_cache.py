@@ -0,0 +1,195 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Process-wide cache of the place_agent and poi_agent responses.
+
+Responses are keyed by the agent, the normalized request and the user_profile
+fields the answer depends on, and kept for RESPONSE_CACHE_TTL seconds in an
+LRU. With RESPONSE_CACHE_SIMILARITY set (e.g. 0.9), a request without an exact
+match is also answered by the most similar cached request of the same agent and
+profile, using the cosine similarity of local bag-of-words embeddings.
+"""
+
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from trip_planner.agents.shared_libraries.cache_stats import cache_metrics
+from trip_planner.agents.sub_agents.inspiration.places_cache import normalize_query
+
+# Words that do not change what a request asks for.
+_STOP_WORDS = frozenset(
+    "a an and any are can for from give i in is me of on or please some show suggest "
+    "the to what where which with you".split()
+)
+
+
+def _words(request: str) -> list[str]:
+    return re.sub(r"[^\w\s]", " ", normalize_query(request)).split()
+
+
+def embed(request: str) -> dict[str, float]:
+    """Returns the unit-length bag of words and word bigrams of a request."""
+    words = [w for w in _words(request) if w not in _STOP_WORDS]
+    features = Counter(words)
+    features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    norm = math.sqrt(sum(count * count for count in features.values()))
+    return {feature: count / norm for feature, count in features.items()} if norm else {}
+
+
+def _similarity(a: dict[str, float], b: dict[str, float]) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(weight * b.get(feature, 0.0) for feature, weight in a.items())
+
+
+@dataclass(slots=True)
+class _Entry:
+    response: str
+    expires_at: float
+    bucket: str
+    request: str
+    vector: dict[str, float] = field(repr=False)
+    hits: int = 0
+
+
+class ResponseCache:
+    """A thread-safe LRU of agent responses with optional near-duplicate matching."""
+
+    def __init__(
+        self,
+        max_entries: int = 2048,
+        ttl_seconds: float = 6 * 60 * 60,
+        similarity_threshold: Optional[float] = None,
+    ):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._similarity_threshold = similarity_threshold
+
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        # Keys of the entries of each (agent, profile) bucket, for similarity lookups.
+        self._buckets: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.similar_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(agent_name: str, request: str, profile: dict[str, Any]) -> tuple[str, str]:
+        """Returns the (key, bucket) of a request; the bucket ignores the request text."""
+        profile = {
+            name: sorted(map(str, value)) if isinstance(value, list) else value
+            for name, value in profile.items()
+        }
+        encoded = json.dumps(profile, sort_keys=True, default=str).encode("utf-8")
+        bucket = f"{agent_name}|{hashlib.blake2b(encoded, digest_size=8).hexdigest()}"
+        return f"{bucket}|{' '.join(_words(request))}", bucket
+
+    def get(self, agent_name: str, request: str, profile: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """Returns a fresh copy of the cached response to a request, if any."""
+        key, bucket = self.fingerprint(agent_name, request, profile)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at < now:
+                self._remove(key)
+                entry = None
+            if entry is None and self._similarity_threshold is not None:
+                key, entry = self._most_similar(bucket, embed(request), now)
+                if entry is not None:
+                    self.similar_hits += 1
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            entry.hits += 1
+            self.hits += 1
+            response = entry.response
+        return json.loads(response)
+
+    def put(self, agent_name: str, request: str, profile: dict[str, Any], response: dict[str, Any]):
+        """Caches the response to a request."""
+        key, bucket = self.fingerprint(agent_name, request, profile)
+        entry = _Entry(
+            response=json.dumps(response),
+            expires_at=time.time() + self._ttl_seconds,
+            bucket=bucket,
+            request=normalize_query(request),
+            vector=embed(request) if self._similarity_threshold is not None else {},
+        )
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._buckets.setdefault(bucket, set()).add(key)
+            while len(self._entries) > self._max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def metrics(self, top: int = 10) -> dict[str, Any]:
+        """Returns hit/miss counters and the most requested entries."""
+        with self._lock:
+            popular = (
+                sorted(self._entries.values(), key=lambda entry: entry.hits, reverse=True)
+                if top
+                else []
+            )
+            return cache_metrics(
+                len(self._entries),
+                self.hits,
+                self.misses,
+                similar_hits=self.similar_hits,
+                top_requests=[
+                    {"agent": entry.bucket.split("|", 1)[0], "request": entry.request, "hits": entry.hits}
+                    for entry in popular[:top]
+                    if entry.hits
+                ],
+            )
+
+    def _most_similar(
+        self, bucket: str, vector: dict[str, float], now: float
+    ) -> tuple[Optional[str], Optional[_Entry]]:
+        best_key, best_entry, best_score = None, None, self._similarity_threshold
+        for key in list(self._buckets.get(bucket, ())):
+            entry = self._entries[key]
+            if entry.expires_at < now:
+                self._remove(key)
+                continue
+            score = _similarity(vector, entry.vector)
+            if score >= best_score:
+                best_key, best_entry, best_score = key, entry, score
+        return best_key, best_entry
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        keys = self._buckets[entry.bucket]
+        keys.discard(key)
+        if not keys:
+            del self._buckets[entry.bucket]
+
+
+def create_response_cache() -> ResponseCache:
+    """Creates the cache configured by the RESPONSE_CACHE_* environment variables."""
+    similarity = os.getenv("RESPONSE_CACHE_SIMILARITY")
+    return ResponseCache(
+        max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 2048)),
+        ttl_seconds=float(os.getenv("RESPONSE_CACHE_TTL", 6 * 60 * 60)),
+        similarity_threshold=float(similarity) if similarity else None,
+    )
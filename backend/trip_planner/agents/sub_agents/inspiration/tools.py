@@ -14,15 +14,73 @@
 
 """Wrapper to Google Maps Places API."""
 
+import asyncio
 import os
-from typing import Dict, List, Any
+import random
+import weakref
+from typing import Dict, List, Any, Optional
 
 from google.adk.tools import ToolContext
-import requests
+from google.adk.tools.agent_tool import AgentTool
+import httpx
+
+from trip_planner.agents.shared_libraries import metrics
+from trip_planner.agents.sub_agents.inspiration.places_cache import (
+    NOT_FOUND,
+    create_places_cache,
+    normalize_query,
+)
+from trip_planner.agents.sub_agents.inspiration.response_cache import create_response_cache
+
+PLACES_REQUEST_TIMEOUT = float(os.getenv("PLACES_REQUEST_TIMEOUT", 10))
+PLACES_CONNECT_TIMEOUT = float(os.getenv("PLACES_CONNECT_TIMEOUT", 5))
+# Lookups in flight at once per process (and size of the connection pool).
+PLACES_MAX_CONCURRENCY = int(os.getenv("PLACES_MAX_CONCURRENCY", 8))
+PLACES_MAX_RETRIES = int(os.getenv("PLACES_MAX_RETRIES", 2))
+PLACES_RETRY_BACKOFF = float(os.getenv("PLACES_RETRY_BACKOFF", 0.25))
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+# Default warm-up set: the landmarks users most often ask about.
+POPULAR_PLACES = [
+    "Eiffel Tower, Paris",
+    "Louvre Museum, Paris",
+    "Colosseum, Rome",
+    "Sagrada Familia, Barcelona",
+    "Big Ben, London",
+    "Statue of Liberty, New York",
+    "Taj Mahal, Agra",
+    "India Gate, New Delhi",
+    "Gateway of India, Mumbai",
+    "Burj Khalifa, Dubai",
+    "Marina Bay Sands, Singapore",
+    "Tanah Lot Temple, Bali",
+    "Senso-ji, Tokyo",
+    "Grand Palace, Bangkok",
+    "Sydney Opera House, Sydney",
+]
+
+# Shared by every PlacesService in the process.
+places_cache = create_places_cache()
+metrics.register_cache("places", places_cache)
+
+# Shared by every CachedAgentTool in the process.
+response_cache = create_response_cache()
+metrics.register_cache("agent_responses", response_cache)
 
 
 class PlacesService:
-    """Wrapper to Placees API."""
+    """Wrapper to Placees API.
+
+    Lookups are asynchronous and go through one pooled httpx client per event
+    loop, at most PLACES_MAX_CONCURRENCY at a time, so resolving the POIs of a
+    map_tool call no longer blocks the agent server's loop.
+    """
+
+    def __init__(self):
+        # httpx clients and semaphores are bound to the loop they were created in.
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = (
+            weakref.WeakKeyDictionary()
+        )
 
     def _check_key(self):
         if (
@@ -31,9 +89,69 @@ class PlacesService:
             # https://developers.google.com/maps/documentation/places/web-service/get-api-key
             self.places_api_key = os.getenv("GOOGLE_PLACES_API_KEY")
 
-    def find_place_from_text(self, query: str) -> Dict[str, str]:
+    def _client(self) -> tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        if loop not in self._clients:
+            client = httpx.AsyncClient(
+                timeout=httpx.Timeout(PLACES_REQUEST_TIMEOUT, connect=PLACES_CONNECT_TIMEOUT),
+                limits=httpx.Limits(
+                    max_connections=PLACES_MAX_CONCURRENCY,
+                    max_keepalive_connections=PLACES_MAX_CONCURRENCY,
+                ),
+            )
+            self._clients[loop] = (client, asyncio.Semaphore(PLACES_MAX_CONCURRENCY))
+        return self._clients[loop]
+
+    async def find_place_from_text(self, query: str) -> Dict[str, str]:
         """Fetches place details using a text query."""
         self._check_key()
+        place = await places_cache.aget(query)
+        if place is None:
+            try:
+                place = await self._fetch_place(query)
+            except httpx.HTTPError as e:
+                return {"error": f"Error fetching place data: {e}"}
+            except (KeyError, IndexError, TypeError, ValueError) as e:
+                # A body that is not JSON or lacks the expected fields.
+                return {"error": f"Malformed place data: {type(e).__name__}: {e}"}
+            if place is not None:
+                await places_cache.aput(query, place)
+
+        if place is None or place == NOT_FOUND:
+            return {"error": "No places found."}
+        return {
+            "place_id": place["place_id"],
+            "place_name": place["place_name"],
+            "place_address": place["place_address"],
+            "photos": self.get_photo_urls(place["photos"], maxwidth=400),
+            "map_url": self.get_map_url(place["place_id"]),
+            "lat": place["lat"],
+            "lng": place["lng"],
+        }
+
+    async def find_places(self, queries: List[str]) -> List[Dict[str, str]]:
+        """Resolves several queries concurrently; each result may be an error on its own."""
+        unique = {normalize_query(query): query for query in queries}
+        results = await asyncio.gather(
+            *(self.find_place_from_text(query) for query in unique.values()),
+            return_exceptions=True,
+        )
+        by_key = {}
+        for key, result in zip(unique, results):
+            if isinstance(result, Exception):
+                result = {"error": f"Error fetching place data: {type(result).__name__}: {result}"}
+            elif isinstance(result, BaseException):
+                raise result
+            by_key[key] = result
+        return [by_key[normalize_query(query)] for query in queries]
+
+    async def _fetch_place(self, query: str) -> Optional[Dict[str, Any]]:
+        """Queries the Places API, retrying timeouts, connection errors and 429/5xx.
+
+        Returns the cacheable part of the first candidate, NOT_FOUND if the API has
+        no candidate for the query, or None for any other empty answer (e.g. a
+        denied request), which must not be cached.
+        """
         places_url = "https://maps.googleapis.com/maps/api/place/findplacefromtext/json"
         params = {
             "input": query,
@@ -42,37 +160,60 @@ class PlacesService:
             "key": self.places_api_key,
         }
 
-        try:
-            response = requests.get(places_url, params=params)
-            response.raise_for_status()
-            place_data = response.json()
-
-            if not place_data.get("candidates"):
-                return {"error": "No places found."}
-
-            # Extract data for the first candidate
-            place_details = place_data["candidates"][0]
-            place_id = place_details["place_id"]
-            place_name = place_details["name"]
-            place_address = place_details["formatted_address"]
-            photos = self.get_photo_urls(place_details.get("photos", []), maxwidth=400)
-            map_url = self.get_map_url(place_id)
-            location = place_details["geometry"]["location"]
-            lat = str(location["lat"])
-            lng = str(location["lng"])
-
-            return {
-                "place_id": place_id,
-                "place_name": place_name,
-                "place_address": place_address,
-                "photos": photos,
-                "map_url": map_url,
-                "lat": lat,
-                "lng": lng,
-            }
-
-        except requests.exceptions.RequestException as e:
-            return {"error": f"Error fetching place data: {e}"}
+        client, semaphore = self._client()
+        attempt = 0
+        while True:
+            try:
+                async with semaphore:
+                    response = await client.get(places_url, params=params)
+                response.raise_for_status()
+                place_data = response.json()
+                break
+            except httpx.HTTPError as e:
+                retryable = isinstance(e, httpx.TransportError) or (
+                    isinstance(e, httpx.HTTPStatusError)
+                    and e.response.status_code in RETRY_STATUS_CODES
+                )
+                if not retryable or attempt >= PLACES_MAX_RETRIES:
+                    raise
+            # Exponential backoff with jitter, outside of the semaphore.
+            await asyncio.sleep(PLACES_RETRY_BACKOFF * 2**attempt * (0.5 + random.random()))
+            attempt += 1
+
+        if not place_data.get("candidates"):
+            return NOT_FOUND if place_data.get("status") == "ZERO_RESULTS" else None
+
+        # Extract data for the first candidate. Photo references are kept rather
+        # than photo URLs, which embed the API key.
+        place_details = place_data["candidates"][0]
+        location = place_details["geometry"]["location"]
+        return {
+            "place_id": place_details["place_id"],
+            "place_name": place_details["name"],
+            "place_address": place_details["formatted_address"],
+            "photos": [
+                {"photo_reference": photo["photo_reference"]}
+                for photo in place_details.get("photos", [])
+            ],
+            "lat": str(location["lat"]),
+            "lng": str(location["lng"]),
+        }
+
+    async def warm_up(self, queries: Optional[List[str]] = None) -> int:
+        """Resolves popular places ahead of the first user, returns how many were found.
+
+        Queries default to the lines of PLACES_CACHE_WARMUP_FILE, or to
+        POPULAR_PLACES when that is not set.
+        """
+        if queries is None:
+            warmup_file = os.getenv("PLACES_CACHE_WARMUP_FILE")
+            if warmup_file:
+                with open(warmup_file) as f:
+                    queries = [line.strip() for line in f if line.strip()]
+            else:
+                queries = POPULAR_PLACES
+        results = await self.find_places(queries)
+        return sum("error" not in result for result in results)
 
     def get_photo_urls(self, photos: List[Dict[str, Any]], maxwidth: int = 400) -> List[str]:
         """Extracts photo URLs from the 'photos' list."""
@@ -91,17 +232,18 @@ class PlacesService:
 places_service = PlacesService()
 
 
-def map_tool(key: str, tool_context: ToolContext):
+async def map_tool(key: str, tool_context: ToolContext):
     """
     This is going to inspect the pois stored under the specified key in the state.
-    One by one it will retrieve the accurate Lat/Lon from the Map API, if the Map API is available for use.
+    It retrieves the accurate Lat/Lon of all of them concurrently from the Map API, if the Map API is available for use.
 
     Args:
         key: The key under which the POIs are stored.
         tool_context: The ADK tool context.
         
     Returns:
-        The updated state with the full JSON object under the key.
+        The updated state with the full JSON object under the key, and the
+        POIs that could not be located, if any.
     """
     if key not in tool_context.state:
         tool_context.state[key] = {}
@@ -111,14 +253,53 @@ def map_tool(key: str, tool_context: ToolContext):
         tool_context.state[key]["places"] = []
 
     pois = tool_context.state[key]["places"]
-    for poi in pois:  # The pydantic object types.POI
-        location = poi["place_name"] + ", " + poi["address"]
-        result = places_service.find_place_from_text(location)
+    locations = [poi["place_name"] + ", " + poi["address"] for poi in pois]
+    results = await places_service.find_places(locations)
+
+    failed = []
+    for poi, location, result in zip(pois, locations, results):  # The pydantic object types.POI
         # Fill the place holders with verified information.
         poi["place_id"] = result["place_id"] if "place_id" in result else None
         poi["map_url"] = result["map_url"] if "map_url" in result else None
         if "lat" in result and "lng" in result:
             poi["lat"] = result["lat"]
             poi["long"] = result["lng"]
+        if "error" in result:
+            failed.append({"location": location, "error": result["error"]})
+
+    response = {"places": pois}  # Return the updated pois
+    if failed:
+        response["failed"] = failed
+    return response
+
+
+class CachedAgentTool(AgentTool):
+    """An AgentTool answering repeated requests from response_cache.
+
+    Only the user_profile fields listed in profile_fields are part of the cache
+    key; the agent's answer must not depend on the rest of the session state.
+    """
+
+    def __init__(self, agent, profile_fields: tuple[str, ...] = (), **kwargs):
+        super().__init__(agent=agent, **kwargs)
+        self.profile_fields = profile_fields
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        request = str(args.get("request", ""))
+        user_profile = tool_context.state.get("user_profile") or {}
+        profile = {
+            name: user_profile.get(name) if isinstance(user_profile, dict) else None
+            for name in self.profile_fields
+        }
+
+        response = response_cache.get(self.name, request, profile)
+        if response is not None:
+            # Same state update as a model call would have made.
+            if self.agent.output_key:
+                tool_context.state[self.agent.output_key] = response
+            return response
 
-    return {"places": pois}  # Return the updated pois
+        response = await super().run_async(args=args, tool_context=tool_context)
+        if isinstance(response, dict) and response:
+            response_cache.put(self.name, request, profile, response)
+        return response
@@ -0,0 +1,329 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Seat maps and hotel room inventory for the planning agent.
+
+A seat map keeps one availability bit per seat in a bytearray and seat prices
+in an array, so holding or releasing a seat is O(1) and listing a filtered
+window only touches the rows it returns. Room inventory keeps the number of
+free rooms of each type per night. Both are created deterministically from the
+flight (or hotel) and date on first use and kept in an LRU, which never evicts
+a map or inventory holding live holds; holds expire after SEAT_HOLD_TTL seconds. The inventory is local to the planning agent: a hold
+keeps a seat or room for the user while they plan, and bookings go through the
+booking agent's own provider.
+"""
+
+import hashlib
+import os
+import random
+import threading
+import time
+import uuid
+from array import array
+from collections import OrderedDict
+from datetime import date, timedelta
+from typing import Optional
+
+from trip_planner.agents.sub_agents.planning.shared_libraries.types import (
+    Room,
+    RoomsSelection,
+    Seat,
+    SeatsSelection,
+)
+
+HOLD_TTL = float(os.getenv("SEAT_HOLD_TTL", 15 * 60))
+
+SEAT_LETTERS = "ABCDEF"
+# Seat position of each letter in a 3-3 cabin.
+SEAT_POSITIONS = {"A": "window", "B": "middle", "C": "aisle", "D": "aisle", "E": "middle", "F": "window"}
+
+ROOM_TYPES = [
+    # (room type, rooms per night, price factor against the hotel's nightly price)
+    ("Queen", 20, 1.0),
+    ("Twin", 16, 1.0),
+    ("King with City View", 10, 1.3),
+    ("Queen with Balcony", 8, 1.4),
+    ("Twin with Assistance", 4, 1.0),
+    ("Suite", 2, 2.5),
+]
+
+
+def _rng(*parts: object) -> random.Random:
+    seed = hashlib.blake2b("|".join(str(p).lower() for p in parts).encode("utf-8"), digest_size=8)
+    return random.Random(int.from_bytes(seed.digest(), "big"))
+
+
+class HoldError(Exception):
+    """A seat or room cannot be held or released."""
+
+
+class SeatMap:
+    """The seats of one flight on one date."""
+
+    def __init__(self, flight_number: str, flight_date: date, rows: int = 30, occupancy: float = 0.6):
+        self.flight_number = flight_number
+        self.flight_date = flight_date
+        self.rows = rows
+        size = rows * len(SEAT_LETTERS)
+        self._free = bytearray((size + 7) // 8)
+        self._prices = array("H", bytes(2 * size))
+        self._holds: dict[int, tuple[str, float]] = {}
+
+        rng = _rng(flight_number, flight_date.isoformat())
+        for index in range(size):
+            row, letter = divmod(index, len(SEAT_LETTERS))
+            position = SEAT_POSITIONS[SEAT_LETTERS[letter]]
+            price = 40 if row < 5 else 25 if row < 12 else 15
+            price += {"window": 15, "aisle": 10, "middle": 0}[position]
+            self._prices[index] = price
+            if rng.random() >= occupancy:
+                self._free[index >> 3] |= 1 << (index & 7)
+
+    def _index(self, seat_number: str) -> int:
+        seat_number = seat_number.strip().upper()
+        if len(seat_number) < 2:
+            raise HoldError(f"Unknown seat {seat_number!r}")
+        try:
+            row, letter = int(seat_number[:-1]), seat_number[-1]
+            column = SEAT_LETTERS.index(letter)
+        except ValueError:
+            raise HoldError(f"Unknown seat {seat_number!r}")
+        if not 1 <= row <= self.rows:
+            raise HoldError(f"Unknown seat {seat_number!r}")
+        return (row - 1) * len(SEAT_LETTERS) + column
+
+    def _is_free(self, index: int, now: float) -> bool:
+        if not self._free[index >> 3] >> (index & 7) & 1:
+            return False
+        hold = self._holds.get(index)
+        if hold is None:
+            return True
+        if hold[1] < now:
+            del self._holds[index]
+            return True
+        return False
+
+    def has_holds(self, now: float) -> bool:
+        """Whether a seat is held and not expired."""
+        return any(expires_at >= now for _, expires_at in self._holds.values())
+
+    def hold(self, seat_number: str, ttl: float = HOLD_TTL) -> str:
+        """Holds a free seat and returns the hold id."""
+        index = self._index(seat_number)
+        now = time.time()
+        if not self._is_free(index, now):
+            raise HoldError(f"Seat {seat_number} is not available")
+        hold_id = uuid.uuid4().hex[:12]
+        self._holds[index] = (hold_id, now + ttl)
+        return hold_id
+
+    def release(self, seat_number: str, hold_id: str):
+        """Releases a hold."""
+        index = self._index(seat_number)
+        hold = self._holds.get(index)
+        if hold is None or hold[0] != hold_id:
+            raise HoldError(f"Seat {seat_number} is not held by {hold_id}")
+        del self._holds[index]
+
+    def window(
+        self, position: Optional[str] = None, max_rows: int = 3, min_row: int = 1
+    ) -> list[list[Seat]]:
+        """Returns up to max_rows rows, from min_row on, with a free seat at position.
+
+        Every seat of a returned row is listed, so that the user sees the seats
+        around the ones that match.
+        """
+        now = time.time()
+        width = len(SEAT_LETTERS)
+        columns = [
+            column
+            for column, letter in enumerate(SEAT_LETTERS)
+            if not position or SEAT_POSITIONS[letter] == position
+        ]
+        rows = []
+        for row in range(max(min_row, 1) - 1, self.rows):
+            if not any(self._is_free(row * width + column, now) for column in columns):
+                continue
+            rows.append(
+                [
+                    Seat(
+                        is_available=self._is_free(row * width + column, now),
+                        price_in_usd=self._prices[row * width + column],
+                        seat_number=f"{row + 1}{letter}",
+                    )
+                    for column, letter in enumerate(SEAT_LETTERS)
+                ]
+            )
+            if len(rows) >= max_rows:
+                break
+        return rows
+
+
+class RoomInventory:
+    """The free rooms of each type of one hotel, per night."""
+
+    def __init__(self, hotel_name: str, nightly_price: int, first_night: date, nights: int = 365):
+        self.hotel_name = hotel_name
+        self.first_night = first_night
+        self.nights = nights
+        self.room_types = [room_type for room_type, _, _ in ROOM_TYPES]
+        self.set_nightly_price(nightly_price)
+        rng = _rng(hotel_name)
+        # free[t][n]: free rooms of type t on night n.
+        self._free = [
+            array("H", (max(count - rng.randrange(count + 1), 0) for _ in range(nights)))
+            for _, count, _ in ROOM_TYPES
+        ]
+        self._holds: dict[str, tuple[int, int, int, float]] = {}
+
+    def set_nightly_price(self, nightly_price: int):
+        """Prices the room types against the hotel's current nightly price."""
+        self.nightly_price = nightly_price
+        self.prices = [max(int(nightly_price * factor), 1) for _, _, factor in ROOM_TYPES]
+
+    def has_holds(self, now: float) -> bool:
+        """Whether a room is held and not expired."""
+        self._expire(now)
+        return bool(self._holds)
+
+    def _nights(self, check_in: date, check_out: date) -> range:
+        start = (check_in - self.first_night).days
+        end = (check_out - self.first_night).days
+        if start < 0 or end > self.nights or end <= start:
+            raise HoldError(f"No inventory from {check_in} to {check_out}")
+        return range(start, end)
+
+    def _expire(self, now: float):
+        for hold_id in [h for h, (_, _, _, expires_at) in self._holds.items() if expires_at < now]:
+            type_index, start, end, _ = self._holds.pop(hold_id)
+            for night in range(start, end):
+                self._free[type_index][night] += 1
+
+    def rooms(self, check_in: date, check_out: date) -> list[Room]:
+        """Returns every room type, available if it is free on every night of the stay."""
+        nights = self._nights(check_in, check_out)
+        self._expire(time.time())
+        return [
+            Room(
+                is_available=min(free[night] for night in nights) > 0,
+                price_in_usd=self.prices[type_index],
+                room_type=self.room_types[type_index],
+            )
+            for type_index, free in enumerate(self._free)
+        ]
+
+    def hold(self, room_type: str, check_in: date, check_out: date, ttl: float = HOLD_TTL) -> str:
+        """Holds one room of a type for every night of the stay and returns the hold id."""
+        try:
+            type_index = self.room_types.index(room_type)
+        except ValueError:
+            raise HoldError(f"Unknown room type {room_type!r}")
+        nights = self._nights(check_in, check_out)
+        now = time.time()
+        self._expire(now)
+        free = self._free[type_index]
+        if any(free[night] == 0 for night in nights):
+            raise HoldError(f"No {room_type} room free from {check_in} to {check_out}")
+        for night in nights:
+            free[night] -= 1
+        hold_id = uuid.uuid4().hex[:12]
+        self._holds[hold_id] = (type_index, nights.start, nights.stop, now + ttl)
+        return hold_id
+
+    def release(self, hold_id: str):
+        """Gives the rooms of a hold back."""
+        hold = self._holds.pop(hold_id, None)
+        if hold is None:
+            raise HoldError(f"Unknown room hold {hold_id}")
+        type_index, start, end, _ = hold
+        for night in range(start, end):
+            self._free[type_index][night] += 1
+
+
+def _evict(entries: OrderedDict, max_entries: int):
+    # Entries with live holds are kept, or their holds could not be released.
+    now = time.time()
+    while len(entries) > max_entries:
+        victim = next((key for key, entry in entries.items() if not entry.has_holds(now)), None)
+        if victim is None:
+            return
+        del entries[victim]
+
+
+class AvailabilityService:
+    """Seat maps and room inventories of the process, created on first use."""
+
+    def __init__(self, max_flights: int = 4096, max_hotels: int = 1024):
+        self._max_flights = max_flights
+        self._max_hotels = max_hotels
+        self._seat_maps: OrderedDict[tuple[str, date], SeatMap] = OrderedDict()
+        self._room_inventories: OrderedDict[str, RoomInventory] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def seat_map(self, flight_number: str, flight_date: date) -> SeatMap:
+        key = (flight_number.strip().upper(), flight_date)
+        with self._lock:
+            seat_map = self._seat_maps.get(key)
+            if seat_map is None:
+                _evict(self._seat_maps, self._max_flights - 1)
+                seat_map = SeatMap(*key)
+                self._seat_maps[key] = seat_map
+            self._seat_maps.move_to_end(key)
+            return seat_map
+
+    def room_inventory(self, hotel_name: str, nightly_price: int) -> RoomInventory:
+        key = hotel_name.strip().lower()
+        with self._lock:
+            inventory = self._room_inventories.get(key)
+            if inventory is None:
+                _evict(self._room_inventories, self._max_hotels - 1)
+                inventory = RoomInventory(hotel_name, nightly_price, date.today() - timedelta(days=1))
+                self._room_inventories[key] = inventory
+            elif inventory.nightly_price != nightly_price:
+                # Holds are kept per hotel, so the inventory is repriced rather than replaced.
+                inventory.set_nightly_price(nightly_price)
+            self._room_inventories.move_to_end(key)
+            return inventory
+
+    def seats(self, flight_number: str, flight_date: date, **window) -> SeatsSelection:
+        seat_map = self.seat_map(flight_number, flight_date)
+        with self._lock:
+            return SeatsSelection(seats=seat_map.window(**window))
+
+    def hold_seat(self, flight_number: str, flight_date: date, seat_number: str) -> str:
+        seat_map = self.seat_map(flight_number, flight_date)
+        with self._lock:
+            return seat_map.hold(seat_number)
+
+    def release_seat(self, flight_number: str, flight_date: date, seat_number: str, hold_id: str):
+        seat_map = self.seat_map(flight_number, flight_date)
+        with self._lock:
+            seat_map.release(seat_number, hold_id)
+
+    def rooms(self, hotel_name: str, nightly_price: int, check_in: date, check_out: date) -> RoomsSelection:
+        inventory = self.room_inventory(hotel_name, nightly_price)
+        with self._lock:
+            return RoomsSelection(rooms=inventory.rooms(check_in, check_out))
+
+    def hold_room(
+        self, hotel_name: str, nightly_price: int, room_type: str, check_in: date, check_out: date
+    ) -> str:
+        inventory = self.room_inventory(hotel_name, nightly_price)
+        with self._lock:
+            return inventory.hold(room_type, check_in, check_out)
+
+    def release_room(self, hotel_name: str, nightly_price: int, hold_id: str):
+        inventory = self.room_inventory(hotel_name, nightly_price)
+        with self._lock:
+            inventory.release(hold_id)
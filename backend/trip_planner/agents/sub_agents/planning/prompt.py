@@ -27,10 +27,10 @@ You support a number of user journeys:
 - Autonomously help the user find flights and hotels.
 
 You have access to the following tools only:
-- Use the `flight_search_agent` tool to find flight choices,
-- Use the `flight_seat_selection_agent` tool to find seat choices,
-- Use the `hotel_search_agent` tool to find hotel choices,
-- Use the `hotel_room_selection_agent` tool to find room choices,
+- Use the `search_flights` tool to find flight choices in the flight inventory,
+- Use the `seat_options`, `hold_seat` and `release_seat` tools to find and hold seat choices,
+- Use the `search_hotels` tool to find hotel choices in the hotel inventory,
+- Use the `room_options`, `hold_room` and `release_room` tools to find and hold room choices,
 - Use the `itinerary_agent` tool to generate an itinerary, and
 - Use the `memorize` tool to remember the user's chosen selections.
 
@@ -86,15 +86,16 @@ Your goal is to help the traveler reach the destination to enjoy these activitie
   <return_flight_selection>{return_flight_selection}</return_flight_selection>
   <return_seat_number>{return_seat_number}</return_seat_number>  
 
-- You only have two tools at your disposal: `flight_search_agent` and `flight_seat_selection_agent`.
+- You only have these tools at your disposal: `search_flights`, `seat_options`, `hold_seat` and `release_seat`.
 - Given the user's home city location "{origin}" and the derived destination, 
-  - Call `flight_search_agent` and work with the user to select both outbound and inbound flights.
+  - Call `search_flights` with the origin, the destination and the travel date of each direction; rank the results by the user's preferences, briefly explain the ranking, and work with the user to select both outbound and inbound flights.
   - Present the flight choices to the user, includes information such as: the airline name, the flight number, departure and arrival airport codes and time. When user selects the flight...
-  - Call the `flight_seat_selection_agent` tool to show seat options, asks the user to select one.
+  - Call the `seat_options` tool with the flight number and date to show seat options (it defaults to the user's seat preference; pass `min_row` to show further rows), asks the user to select one.
+  - Call `hold_seat` to hold the chosen seat while the user plans the trip; if the user changes their mind, call `release_seat` with the hold id.
   - Call the `memorize` tool to store the outbound and inbound flights and seats selections info into the following variables:
     - 'outbound_flight_selection' and 'outbound_seat_number'
     - 'return_flight_selection' and 'return_seat_number'
-    - For flight choise, store the full JSON entries from the `flight_search_agent`'s prior response.  
+    - For flight choise, store the full JSON entries from the `search_flights`'s prior response.  
   - Here's the optimal flow
     - search for flights
     - choose flight, store choice,    
@@ -107,13 +108,14 @@ Your goal is to help the traveler by  completing the following information if an
   <hotel_selection>{hotel_selection}</hotel_selection>
   <room_selection>{room_selection}<room_selection>
 
-- You only have two tools at your disposal: `hotel_search_agent` and `hotel_room_selection_agent`.
+- You only have these tools at your disposal: `search_hotels`, `room_options`, `hold_room` and `release_room`.
 - Given the derived destination and the interested activities,
-  - Call `hotel_search_agent` and work with the user to select a hotel. When user select the hotel...
-  - Call `hotel_room_selection_agent` to choose a room.
+  - Call `search_hotels` with the destination and the stay dates; rank the results by the user's preferences, briefly explain the ranking, and work with the user to select a hotel. When user select the hotel...
+  - Call `room_options` with the hotel name, its nightly price and the stay dates to choose a room.
+  - Call `hold_room` to hold the chosen room while the user plans the trip; if the user changes their mind, call `release_room` with the hold id.
   - Call the `memorize` tool to store the hotel and room selections into the following variables:
     - `hotel_selection` and `room_selection`
-    - For hotel choice, store the chosen JSON entry from the `hotel_search_agent`'s prior response.  
+    - For hotel choice, store the chosen JSON entry from the `search_hotels`'s prior response.  
   - Here is the optimal flow
     - search for hotel
     - choose hotel, store choice,
@@ -145,217 +147,6 @@ Please use the context info below for user preferences
 """
 
 
-FLIGHT_SEARCH_INSTR = """Generate search results for flights from origin to destination inferred from user query please use future dates within 3 months from today's date for the prices, limit to 4 results.
-- ask for any details you don't know, like origin and destination, etc.
-- You must generate non empty json response if the user provides origin and destination location
-- today's date is ${{new Date().toLocaleDateString()}}.
-- Please use the context info below for any user preferences
-
-Current user:
-  <user_profile>
-  {user_profile}
-  </user_profile>
-
-Current time: {_time}
-Use origin: {origin} and destination: {destination} for your context
-
-Return the response as a JSON object formatted like this:
-
-{{
-  {{"flights": [
-    {
-      "flight_number":"Unique identifier for the flight, like BA123, AA31, etc."),
-      "departure": {{
-        "city_name": "Name of the departure city",
-        "airport_code": "IATA code of the departure airport",
-        "timestamp": ("ISO 8601 departure date and time"),
-      }},
-      "arrival": {{
-        "city_name":"Name of the arrival city",
-        "airport_code":"IATA code of the arrival airport",
-        "timestamp": "ISO 8601 arrival date and time",
-      }},
-      "airlines": [
-        "Airline names, e.g., American Airlines, Emirates"
-      ],
-      "airline_logo": "Airline logo location , e.g., if airlines is American then output /images/american.png for United use /images/united.png for Delta use /images/delta1.jpg rest default to /images/airplane.png",
-      "price_in_usd": "Integer - Flight price in US dollars",
-      "number_of_stops": "Integer - indicating the number of stops during the flight",
-    }
-  ]}}
-}}
-
-Remember that you can only use the tools to complete your tasks: 
-  - `flight_search_agent`,
-  - `flight_seat_selection_agent`,
-  - `hotel_search_agent`,
-  - `hotel_room_selection_agent`,
-  - `itinerary_agent`,
-  - `memorize`
-
-"""
-
-FLIGHT_SEAT_SELECTION_INSTR = """
-Simulate available seats for flight number specified by the user, 6 seats on each row and 3 rows in total, adjust pricing based on location of seat.
-- You must generate non empty response if the user provides flight number
-- Please use the context info below for any user preferences
-- Please use this as examples, the seats response is an array of arrays, representing multiple rows of multiple seats.
-
-{{
-  "seats" : 
-  [
-    [
-      {{
-          "is_available": True,
-          "price_in_usd": 60,
-          "seat_number": "1A"
-      }},
-      {{
-          "is_available": True,
-          "price_in_usd": 60,
-          "seat_number": "1B"
-      }},
-      {{
-          "is_available": False,
-          "price_in_usd": 60,
-          "seat_number": "1C"
-      }},
-      {{
-          "is_available": True,
-          "price_in_usd": 70,
-          "seat_number": "1D"
-      }},
-      {{
-          "is_available": True,
-          "price_in_usd": 70,
-          "seat_number": "1E"
-      }},
-      {{
-          "is_available": True,
-          "price_in_usd": 50,
-          "seat_number": "1F"
-      }}
-    ],
-    [
-      {{
-          "is_available": True,
-          "price_in_usd": 60,
-          "seat_number": "2A"
-      }},
-      {{
-          "is_available": False,
-          "price_in_usd": 60,
-          "seat_number": "2B"
-      }},
-      {{
-          "is_available": True,
-          "price_in_usd": 60,
-          "seat_number": "2C"
-      }},
-      {{
-          "is_available": True,
-          "price_in_usd": 70,
-          "seat_number": "2D"
-      }},
-      {{
-          "is_available": True,
-          "price_in_usd": 70,
-          "seat_number": "2E"
-      }},
-      {{
-          "is_available": True,
-          "price_in_usd": 50,
-          "seat_number": "2F"
-      }}
-    ],
-  ]
-}}
-
-Output from flight agent
-<flight>
-{flight}
-</flight>
-use this for your context.
-"""
-
-
-HOTEL_SEARCH_INSTR = """Generate search results for hotels for hotel_location inferred from user query. Find only 4 results.
-- ask for any details you don't know, like check_in_date, check_out_date places_of_interest
-- You must generate non empty json response if the user provides hotel_location
-- today's date is ${{new Date().toLocaleDateString()}}.
-- Please use the context info below for any user preferences
-
-Current user:
-  <user_profile>
-  {user_profile}
-  </user_profile>
-
-Current time: {_time}
-Use origin: {origin} and destination: {destination} for your context
-
-Return the response as a JSON object formatted like this:
- 
-{{
-  "hotels": [
-    {{
-      "name": "Name of the hotel",
-      "address": "Full address of the Hotel",
-      "check_in_time": "16:00",
-      "check_out_time": "11:00",      
-      "thumbnail": "Hotel logo location , e.g., if hotel is Hilton then output /src/images/hilton.png. if hotel is mariott United use /src/images/mariott.png. if hotel is Conrad  use /src/images/conrad.jpg rest default to /src/images/hotel.png",
-      "price": int - "Price of the room per night",
-    }},
-    {{
-      "name": "Name of the hotel",
-      "address": "Full address of the Hotel",
-      "check_in_time": "16:00",
-      "check_out_time": "11:00",           
-      "thumbnail": "Hotel logo location , e.g., if hotel is Hilton then output /src/images/hilton.png. if hotel is mariott United use /src/images/mariott.png. if hotel is Conrad  use /src/images/conrad.jpg rest default to /src/images/hotel.png",
-      "price": int - "Price of the room per night",
-    }},    
-  ]
-}}
-"""
-
-HOTEL_ROOM_SELECTION_INSTR = """
-Simulate available rooms for hotel chosen by the user, adjust pricing based on location of room.
-- You must generate non empty response if the user chooses a hotel
-- Please use the context info below for any user preferences
-- please use this as examples
-
-Output from hotel agent:
-<hotel>
-{hotel}
-</hotel>
-use this for your context
-{{
-  "rooms" :
-  [
-    {{
-        "is_available": True,
-        "price_in_usd": 260,
-        "room_type": "Twin with Balcony"
-    }},
-    {{
-        "is_available": True,
-        "price_in_usd": 60,
-        "room_type": "Queen with Balcony"
-    }},
-    {{
-        "is_available": False,
-        "price_in_usd": 60,
-        "room_type": "Twin with Assistance"
-    }},
-    {{
-        "is_available": True,
-        "price_in_usd": 70,
-        "room_type": "Queen with Assistance"
-    }},
-  ]
-}}
-"""
-
-
 ITINERARY_AGENT_INSTR = """
 Given a full itinerary plan provided by the planning agent, generate a JSON object capturing that plan.
 
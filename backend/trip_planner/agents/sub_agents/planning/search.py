@@ -0,0 +1,417 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Flight and hotel search over a local inventory.
+
+The planning agent's search tools query an InventoryProvider instead of asking
+the model to invent results. Two providers are included:
+  - SyntheticInventory, the default, derives a deterministic inventory from a
+    hash of the route (or city) and date, so any query gets stable results;
+  - SqliteInventory reads an indexed SQLite file (PLANNING_INVENTORY_DB), e.g.
+    a fixture written by seed_inventory() or an export of a real inventory.
+A real search backend only has to implement InventoryProvider.
+
+Seed a fixture from the backend folder:
+    python -m trip_planner.agents.sub_agents.planning.search inventory.db Paris London
+"""
+
+import abc
+import hashlib
+import os
+import random
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from trip_planner.agents.sub_agents.planning.shared_libraries.types import (
+    AirportEvent,
+    Flight,
+    Hotel,
+)
+
+# Well-known airports; other cities get a code derived from their name.
+AIRPORT_CODES = {
+    "new delhi": "DEL",
+    "delhi": "DEL",
+    "mumbai": "BOM",
+    "bangalore": "BLR",
+    "bengaluru": "BLR",
+    "chennai": "MAA",
+    "kolkata": "CCU",
+    "goa": "GOI",
+    "bali": "DPS",
+    "denpasar": "DPS",
+    "dubai": "DXB",
+    "singapore": "SIN",
+    "bangkok": "BKK",
+    "tokyo": "HND",
+    "paris": "CDG",
+    "london": "LHR",
+    "rome": "FCO",
+    "barcelona": "BCN",
+    "new york": "JFK",
+    "san diego": "SAN",
+    "seattle": "SEA",
+    "sydney": "SYD",
+}
+
+# (airline, logo) pairs; the logos are the ones the web app ships.
+AIRLINES = [
+    ("American Airlines", "/images/american.png"),
+    ("United Airlines", "/images/united.png"),
+    ("Delta Air Lines", "/images/delta1.jpg"),
+    ("Air India", "/images/airplane.png"),
+    ("Emirates", "/images/airplane.png"),
+    ("Singapore Airlines", "/images/airplane.png"),
+    ("Lufthansa", "/images/airplane.png"),
+]
+
+# (brand, thumbnail) pairs for synthetic hotels.
+HOTEL_BRANDS = [
+    ("Hilton", "/src/images/hilton.png"),
+    ("Marriott", "/src/images/mariott.png"),
+    ("Conrad", "/src/images/conrad.jpg"),
+    ("Hyatt Regency", "/src/images/hotel.png"),
+    ("Taj", "/src/images/hotel.png"),
+    ("Novotel", "/src/images/hotel.png"),
+    ("Ibis", "/src/images/hotel.png"),
+    ("Four Seasons", "/src/images/hotel.png"),
+]
+HOTEL_AREAS = ["City Centre", "Old Town", "Airport Road", "Waterfront", "Central Park", "Business District"]
+
+
+@dataclass(frozen=True)
+class FlightQuery:
+    origin: str
+    destination: str
+    departure_date: date
+    # Flights departing up to this many days before or after departure_date also match.
+    flexible_days: int = 0
+    max_price_in_usd: Optional[int] = None
+    max_stops: Optional[int] = None
+    limit: int = 4
+
+
+@dataclass(frozen=True)
+class HotelQuery:
+    city: str
+    check_in_date: date
+    check_out_date: date
+    max_price_per_night: Optional[int] = None
+    min_rating: Optional[float] = None
+    limit: int = 4
+
+
+def airport_code(city: str) -> str:
+    """Returns the IATA code of a city's main airport, or one derived from its name."""
+    city = city.strip()
+    if len(city) == 3 and city.isalpha() and city.isupper():
+        return city
+    code = AIRPORT_CODES.get(city.lower())
+    if code:
+        return code
+    letters = "".join(c for c in city.upper() if c.isalpha())
+    return (letters + "XXX")[:3]
+
+
+def _rng(*parts: object) -> random.Random:
+    seed = hashlib.blake2b("|".join(str(p).lower() for p in parts).encode("utf-8"), digest_size=8)
+    return random.Random(int.from_bytes(seed.digest(), "big"))
+
+
+def _sort_flights(flights: list[Flight]) -> list[Flight]:
+    return sorted(flights, key=lambda f: (f.price_in_usd, f.number_of_stops, f.departure.timestamp))
+
+
+class InventoryProvider(abc.ABC):
+    """A source of flights and hotels for the planning agent's search tools."""
+
+    @abc.abstractmethod
+    def search_flights(self, query: FlightQuery) -> list[Flight]:
+        """Returns matching flights, cheapest first."""
+
+    @abc.abstractmethod
+    def search_hotels(self, query: HotelQuery) -> list[tuple[Hotel, float]]:
+        """Returns matching (hotel, rating) pairs, best rated first."""
+
+
+class SyntheticInventory(InventoryProvider):
+    """A deterministic inventory generated from the query itself.
+
+    Generated routes and cities are kept in a bounded LRU per inventory, keyed
+    case-insensitively like the generation itself; callers get copies, so
+    changing a returned flight or hotel never alters the cache.
+    """
+
+    def __init__(
+        self,
+        flights_per_day: int = 12,
+        hotels_per_city: int = 12,
+        max_routes: int = 4096,
+        max_cities: int = 1024,
+    ):
+        self.flights_per_day = flights_per_day
+        self.hotels_per_city = hotels_per_city
+        self._max_routes = max_routes
+        self._max_cities = max_cities
+        self._flights: OrderedDict[tuple[str, str, date], tuple[Flight, ...]] = OrderedDict()
+        self._hotels: OrderedDict[str, tuple[tuple[Hotel, float], ...]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, entries: OrderedDict, key, max_entries: int, generate):
+        with self._lock:
+            value = entries.get(key)
+            if value is not None:
+                entries.move_to_end(key)
+                return value
+        # Generation is deterministic, so two threads racing on a key agree.
+        value = generate()
+        with self._lock:
+            entries[key] = value
+            while len(entries) > max_entries:
+                entries.popitem(last=False)
+        return value
+
+    def search_flights(self, query: FlightQuery) -> list[Flight]:
+        flights = []
+        for offset in range(-query.flexible_days, query.flexible_days + 1):
+            day = query.departure_date + timedelta(days=offset)
+            flights.extend(self.flights_on(query.origin, query.destination, day))
+        flights = [
+            flight
+            for flight in flights
+            if (query.max_price_in_usd is None or flight.price_in_usd <= query.max_price_in_usd)
+            and (query.max_stops is None or flight.number_of_stops <= query.max_stops)
+        ]
+        return _sort_flights(flights)[: query.limit]
+
+    def search_hotels(self, query: HotelQuery) -> list[tuple[Hotel, float]]:
+        hotels = [
+            (hotel, rating)
+            for hotel, rating in self.hotels_in(query.city)
+            if (query.max_price_per_night is None or hotel.price <= query.max_price_per_night)
+            and (query.min_rating is None or rating >= query.min_rating)
+        ]
+        return sorted(hotels, key=lambda item: (-item[1], item[0].price))[: query.limit]
+
+    def flights_on(self, origin: str, destination: str, day: date) -> list[Flight]:
+        """All flights of a route on a given day."""
+        flights = self._cached(
+            self._flights,
+            (origin.strip().lower(), destination.strip().lower(), day),
+            self._max_routes,
+            lambda: self._generate_flights(origin, destination, day),
+        )
+        copies = [flight.model_copy(deep=True) for flight in flights]
+        # The cached flights carry the spelling of the query that generated them.
+        for flight in copies:
+            flight.departure.city_name = origin
+            flight.arrival.city_name = destination
+        return copies
+
+    def hotels_in(self, city: str) -> list[tuple[Hotel, float]]:
+        """All hotels of a city with their rating, named as first spelled."""
+        hotels = self._cached(
+            self._hotels, city.strip().lower(), self._max_cities, lambda: self._generate_hotels(city)
+        )
+        return [(hotel.model_copy(deep=True), rating) for hotel, rating in hotels]
+
+    def _generate_flights(self, origin: str, destination: str, day: date) -> tuple[Flight, ...]:
+        route = _rng(airport_code(origin), airport_code(destination))
+        base_hours = route.uniform(1.5, 14.0)
+        rng = _rng(airport_code(origin), airport_code(destination), day.isoformat())
+
+        flights = []
+        for _ in range(self.flights_per_day):
+            airline, logo = AIRLINES[rng.randrange(len(AIRLINES))]
+            stops = rng.choices([0, 1, 2], weights=[5, 3, 1])[0]
+            departure = datetime.combine(day, datetime.min.time()) + timedelta(
+                minutes=rng.randrange(5 * 60, 23 * 60, 5)
+            )
+            arrival = departure + timedelta(hours=base_hours + stops * rng.uniform(1.0, 3.5))
+            price = int(80 + base_hours * 45 * rng.uniform(0.7, 1.6) - stops * 40)
+            flights.append(
+                Flight(
+                    flight_number=f"{airline[:2].upper()}{rng.randrange(100, 9999)}",
+                    departure=AirportEvent(
+                        city_name=origin,
+                        airport_code=airport_code(origin),
+                        timestamp=departure.isoformat(timespec="minutes"),
+                    ),
+                    arrival=AirportEvent(
+                        city_name=destination,
+                        airport_code=airport_code(destination),
+                        timestamp=arrival.isoformat(timespec="minutes"),
+                    ),
+                    airlines=[airline],
+                    airline_logo=logo,
+                    price_in_usd=max(price, 49),
+                    number_of_stops=stops,
+                )
+            )
+        return tuple(flights)
+
+    def _generate_hotels(self, city: str) -> tuple[tuple[Hotel, float], ...]:
+        rng = _rng("hotels", city.strip())
+        hotels = []
+        for index in range(self.hotels_per_city):
+            brand, thumbnail = HOTEL_BRANDS[index % len(HOTEL_BRANDS)]
+            area = HOTEL_AREAS[rng.randrange(len(HOTEL_AREAS))]
+            rating = round(rng.uniform(3.0, 5.0), 1)
+            hotels.append(
+                (
+                    Hotel(
+                        name=f"{brand} {city.strip()} {area}",
+                        address=f"{rng.randrange(1, 400)} {area}, {city.strip()}",
+                        check_in_time=rng.choice(["14:00", "15:00", "16:00"]),
+                        check_out_time=rng.choice(["11:00", "12:00"]),
+                        thumbnail=thumbnail,
+                        price=int(40 + rating * rng.uniform(20, 70)),
+                    ),
+                    rating,
+                )
+            )
+        return tuple(hotels)
+
+
+class SqliteInventory(InventoryProvider):
+    """An inventory stored in an indexed SQLite file."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS flights (
+                origin_city TEXT NOT NULL COLLATE NOCASE,
+                origin_code TEXT NOT NULL,
+                destination_city TEXT NOT NULL COLLATE NOCASE,
+                destination_code TEXT NOT NULL,
+                departure_date TEXT NOT NULL,
+                price_in_usd INTEGER NOT NULL,
+                number_of_stops INTEGER NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS flights_by_route
+                ON flights (origin_code, destination_code, departure_date, price_in_usd);
+            CREATE TABLE IF NOT EXISTS hotels (
+                city TEXT NOT NULL COLLATE NOCASE,
+                price INTEGER NOT NULL,
+                rating REAL NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS hotels_by_city ON hotels (city, rating, price);
+            """
+        )
+
+    def search_flights(self, query: FlightQuery) -> list[Flight]:
+        first_day = query.departure_date - timedelta(days=query.flexible_days)
+        last_day = query.departure_date + timedelta(days=query.flexible_days)
+        sql = (
+            "SELECT data FROM flights WHERE origin_code = ? AND destination_code = ?"
+            " AND departure_date BETWEEN ? AND ?"
+        )
+        params: list = [
+            airport_code(query.origin),
+            airport_code(query.destination),
+            first_day.isoformat(),
+            last_day.isoformat(),
+        ]
+        if query.max_price_in_usd is not None:
+            sql += " AND price_in_usd <= ?"
+            params.append(query.max_price_in_usd)
+        if query.max_stops is not None:
+            sql += " AND number_of_stops <= ?"
+            params.append(query.max_stops)
+        sql += " ORDER BY price_in_usd, number_of_stops LIMIT ?"
+        params.append(query.limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [Flight.model_validate_json(row[0]) for row in rows]
+
+    def search_hotels(self, query: HotelQuery) -> list[tuple[Hotel, float]]:
+        sql = "SELECT data, rating FROM hotels WHERE city = ?"
+        params: list = [query.city.strip()]
+        if query.max_price_per_night is not None:
+            sql += " AND price <= ?"
+            params.append(query.max_price_per_night)
+        if query.min_rating is not None:
+            sql += " AND rating >= ?"
+            params.append(query.min_rating)
+        sql += " ORDER BY rating DESC, price LIMIT ?"
+        params.append(query.limit)
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [(Hotel.model_validate_json(row[0]), row[1]) for row in rows]
+
+    def add_flights(self, flights: list[Flight]):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO flights VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        f.departure.city_name,
+                        f.departure.airport_code,
+                        f.arrival.city_name,
+                        f.arrival.airport_code,
+                        f.departure.timestamp[:10],
+                        f.price_in_usd,
+                        f.number_of_stops,
+                        f.model_dump_json(),
+                    )
+                    for f in flights
+                ],
+            )
+
+    def add_hotels(self, city: str, hotels: list[tuple[Hotel, float]]):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO hotels VALUES (?, ?, ?, ?)",
+                [(city, h.price, rating, h.model_dump_json()) for h, rating in hotels],
+            )
+
+
+def seed_inventory(path: str, cities: list[str], start: date, days: int = 90) -> SqliteInventory:
+    """Writes the synthetic inventory of every route between cities to a SQLite file."""
+    synthetic = SyntheticInventory()
+    inventory = SqliteInventory(path)
+    for origin in cities:
+        inventory.add_hotels(origin, synthetic.hotels_in(origin))
+        for destination in cities:
+            if origin == destination:
+                continue
+            for offset in range(days):
+                inventory.add_flights(
+                    synthetic.flights_on(origin, destination, start + timedelta(days=offset))
+                )
+    return inventory
+
+
+def create_inventory_provider() -> InventoryProvider:
+    """Creates the provider selected by PLANNING_INVENTORY_DB (synthetic when unset)."""
+    db_path = os.getenv("PLANNING_INVENTORY_DB")
+    if db_path:
+        return SqliteInventory(db_path)
+    return SyntheticInventory()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3:
+        sys.exit("usage: search.py DB_PATH CITY [CITY ...]")
+    seed_inventory(sys.argv[1], sys.argv[2:], date.today())
+    print(f"Seeded {sys.argv[1]} with {len(sys.argv) - 2} cities")
@@ -0,0 +1,105 @@
+"""Tests of the seat maps, room inventories and their holds."""
+
+import time
+from array import array
+from datetime import date, timedelta
+
+import pytest
+
+from trip_planner.agents.sub_agents.planning.availability import (
+    AvailabilityService,
+    HoldError,
+    RoomInventory,
+    SeatMap,
+)
+
+FLIGHT_DATE = date(2026, 12, 20)
+
+
+def _free_seat(seat_map: SeatMap) -> str:
+    return next(
+        seat.seat_number for row in seat_map.window(max_rows=30) for seat in row if seat.is_available
+    )
+
+
+def test_seat_map_is_deterministic():
+    first = SeatMap("AI123", FLIGHT_DATE).window(max_rows=30)
+    second = SeatMap("ai123", FLIGHT_DATE).window(max_rows=30)
+    assert first == second
+
+
+def test_held_seat_is_not_available_until_released():
+    seat_map = SeatMap("AI123", FLIGHT_DATE)
+    seat = _free_seat(seat_map)
+    hold_id = seat_map.hold(seat)
+
+    with pytest.raises(HoldError):
+        seat_map.hold(seat)
+    with pytest.raises(HoldError):
+        seat_map.release(seat, "someone-else")
+    seat_map.release(seat, hold_id)
+    seat_map.hold(seat)
+
+
+def test_expired_seat_hold_frees_the_seat():
+    seat_map = SeatMap("AI123", FLIGHT_DATE)
+    seat = _free_seat(seat_map)
+    seat_map.hold(seat, ttl=-1)
+
+    assert not seat_map.has_holds(time.time())
+    seat_map.hold(seat)
+
+
+@pytest.mark.parametrize("seat_number", ["", "7", "0A", "31A", "7Z", "AA"])
+def test_unknown_seats_are_rejected(seat_number):
+    with pytest.raises(HoldError):
+        SeatMap("AI123", FLIGHT_DATE).hold(seat_number)
+
+
+def test_room_hold_takes_a_room_every_night_of_the_stay():
+    today = date.today()
+    inventory = RoomInventory("Seaside", 100, today, nights=30)
+    check_in, check_out = today + timedelta(days=2), today + timedelta(days=5)
+    queen = inventory.room_types.index("Queen")
+    inventory._free[queen][2:5] = array("H", [1, 2, 3])
+
+    hold_id = inventory.hold("Queen", check_in, check_out)
+    assert list(inventory._free[queen][2:5]) == [0, 1, 2]
+    assert not inventory.rooms(check_in, check_out)[queen].is_available
+    with pytest.raises(HoldError):
+        inventory.hold("Queen", check_in, check_out)
+    inventory.release(hold_id)
+    assert list(inventory._free[queen][2:5]) == [1, 2, 3]
+    with pytest.raises(HoldError):
+        inventory.release(hold_id)
+
+
+def test_room_inventory_follows_the_nightly_price():
+    service = AvailabilityService()
+    check_in = date.today() + timedelta(days=10)
+    check_out = check_in + timedelta(days=2)
+
+    first = service.rooms("Seaside", 100, check_in, check_out)
+    second = service.rooms("Seaside", 150, check_in, check_out)
+
+    assert first.rooms[0].price_in_usd == 100
+    assert second.rooms[0].price_in_usd == 150
+
+
+def test_lru_keeps_maps_and_inventories_with_live_holds():
+    service = AvailabilityService(max_flights=2, max_hotels=1)
+    seat_map = service.seat_map("AI1", FLIGHT_DATE)
+    seat = _free_seat(seat_map)
+    hold_id = service.hold_seat("AI1", FLIGHT_DATE, seat)
+    check_in = date.today() + timedelta(days=10)
+    room_hold = service.hold_room("Seaside", 100, "Queen", check_in, check_in + timedelta(days=1))
+
+    for number in range(2, 6):
+        service.seat_map(f"AI{number}", FLIGHT_DATE)
+    service.rooms("Harbour", 80, check_in, check_in + timedelta(days=1))
+
+    assert service.seat_map("AI1", FLIGHT_DATE) is seat_map
+    service.release_seat("AI1", FLIGHT_DATE, seat, hold_id)
+    service.release_room("Seaside", 100, room_hold)
+    assert len(service._seat_maps) == 2
+    assert len(service._room_inventories) == 2
@@ -0,0 +1,92 @@
+"""Tests of the planning agent's flight and hotel inventories."""
+
+from datetime import date
+
+import pytest
+
+from trip_planner.agents.sub_agents.planning.search import (
+    FlightQuery,
+    HotelQuery,
+    SqliteInventory,
+    SyntheticInventory,
+    seed_inventory,
+)
+
+DAY = date(2026, 12, 20)
+
+
+def test_synthetic_flights_are_deterministic():
+    flights = SyntheticInventory().flights_on("Paris", "London", DAY)
+
+    assert flights == SyntheticInventory().flights_on("Paris", "London", DAY)
+    assert {flight.departure.airport_code for flight in flights} == {"CDG"}
+    assert {flight.arrival.airport_code for flight in flights} == {"LHR"}
+
+
+def test_synthetic_cache_ignores_the_case_of_cities():
+    inventory = SyntheticInventory()
+
+    flights = inventory.flights_on("Paris", "London", DAY)
+    lower = inventory.flights_on(" paris", "london ", DAY)
+    inventory.hotels_in("Rome")
+    inventory.hotels_in("ROME")
+
+    assert len(inventory._flights) == 1
+    assert len(inventory._hotels) == 1
+    assert [f.flight_number for f in lower] == [f.flight_number for f in flights]
+    assert {f.departure.city_name for f in lower} == {" paris"}
+
+
+def test_synthetic_results_are_copies():
+    inventory = SyntheticInventory()
+
+    inventory.flights_on("Paris", "London", DAY)[0].price_in_usd = 1
+    inventory.hotels_in("Rome")[0][0].price = 1
+
+    assert inventory.flights_on("Paris", "London", DAY)[0].price_in_usd != 1
+    assert inventory.hotels_in("Rome")[0][0].price != 1
+
+
+def test_synthetic_search_filters_and_sorts():
+    inventory = SyntheticInventory()
+
+    flights = inventory.search_flights(
+        FlightQuery("Paris", "London", DAY, flexible_days=1, max_stops=0, limit=10)
+    )
+    hotels = inventory.search_hotels(HotelQuery("Rome", DAY, date(2026, 12, 23), min_rating=4.0))
+
+    assert flights and all(flight.number_of_stops == 0 for flight in flights)
+    assert [f.price_in_usd for f in flights] == sorted(f.price_in_usd for f in flights)
+    assert all(rating >= 4.0 for _, rating in hotels)
+    assert [rating for _, rating in hotels] == sorted((r for _, r in hotels), reverse=True)
+
+
+@pytest.fixture
+def sqlite_inventory(tmp_path) -> SqliteInventory:
+    return seed_inventory(str(tmp_path / "inventory.db"), ["Paris", "London"], DAY, days=3)
+
+
+def test_sqlite_inventory_matches_the_synthetic_one(sqlite_inventory):
+    # Within the seeded days, and without a limit so that price ties cannot matter.
+    flights = FlightQuery("Paris", "London", date(2026, 12, 21), 1, max_price_in_usd=400, limit=100)
+    hotels = HotelQuery("London", DAY, date(2026, 12, 22), limit=100)
+
+    def numbers(results):
+        return sorted(flight.flight_number for flight in results)
+
+    found = sqlite_inventory.search_flights(flights)
+    assert found
+    assert numbers(found) == numbers(SyntheticInventory().search_flights(flights))
+    assert sorted(sqlite_inventory.search_hotels(hotels), key=str) == sorted(
+        SyntheticInventory().search_hotels(hotels), key=str
+    )
+
+
+def test_sqlite_inventory_ignores_the_case_of_cities(sqlite_inventory):
+    assert sqlite_inventory.search_hotels(HotelQuery("london", DAY, date(2026, 12, 22)))
+    assert sqlite_inventory.search_flights(FlightQuery("paris", "london", DAY))
+
+
+def test_sqlite_inventory_without_the_route_is_empty(sqlite_inventory):
+    assert sqlite_inventory.search_flights(FlightQuery("Paris", "Tokyo", DAY)) == []
+    assert sqlite_inventory.search_hotels(HotelQuery("Tokyo", DAY, date(2026, 12, 22))) == []
@@ -0,0 +1,23 @@
+"""Tests of the planning agent's seat and room tools."""
+
+from types import SimpleNamespace
+
+from trip_planner.agents.sub_agents.planning import tools
+
+
+def test_seat_options_without_a_user_profile():
+    tool_context = SimpleNamespace(state={"user_profile": None})
+
+    selection = tools.seat_options("AI123", "2026-12-20", tool_context)
+
+    assert selection["seats"]
+    assert tool_context.state["seat"] == selection
+
+
+def test_seat_options_use_the_seat_preference():
+    tool_context = SimpleNamespace(state={"user_profile": {"seat_preference": "window"}})
+
+    selection = tools.seat_options("AI123", "2026-12-20", tool_context, max_rows=1)
+
+    row = selection["seats"][0]
+    assert any(seat["is_available"] and seat["seat_number"][-1] in "AF" for seat in row)
@@ -12,22 +12,312 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-"""The 'memorize' tool for several agents to affect session states."""
+"""Tools of the planning agent: flight and hotel search, seat and room holds, and memorize."""
 
-from datetime import datetime
-import json
 import os
-from typing import Dict, Any
+from datetime import date
+from typing import Optional
 
 from google.adk.agents.callback_context import CallbackContext
-from google.adk.sessions.state import State
 from google.adk.tools import ToolContext
 
-from shared_libraries import constants
+from trip_planner.agents.sub_agents.planning.availability import (
+    HOLD_TTL,
+    SEAT_POSITIONS,
+    AvailabilityService,
+    HoldError,
+)
+from trip_planner.agents.sub_agents.planning.search import (
+    FlightQuery,
+    HotelQuery,
+    create_inventory_provider,
+)
+from trip_planner.agents.sub_agents.planning.shared_libraries import constants
+from trip_planner.agents.sub_agents.planning.shared_libraries.types import (
+    FlightsSelection,
+    HotelsSelection,
+)
+from trip_planner.agents.shared_libraries.scenario import ScenarioTemplate
 
 SAMPLE_SCENARIO_PATH = os.getenv(
     "TRAVEL_CONCIERGE_SCENARIO", "travel_concierge/profiles/itinerary_empty_default.json"
 )
+# Parsed lazily, on the first session to initialize.
+_scenario = ScenarioTemplate(SAMPLE_SCENARIO_PATH)
+
+inventory = create_inventory_provider()
+availability = AvailabilityService()
+
+
+def search_flights(
+    origin: str,
+    destination: str,
+    departure_date: str,
+    tool_context: ToolContext,
+    flexible_days: int = 0,
+    max_price_in_usd: Optional[int] = None,
+    max_stops: Optional[int] = None,
+    limit: int = 4,
+):
+    """
+    Searches the flight inventory, cheapest flights first.
+
+    Args:
+        origin: The departure city or IATA airport code, e.g. New Delhi or DEL.
+        destination: The arrival city or IATA airport code, e.g. Bali or DPS.
+        departure_date: The departure date in YYYY-MM-DD format.
+        tool_context: The ADK tool context.
+        flexible_days: Also include flights up to this many days before or after the date.
+        max_price_in_usd: Only include flights up to this price.
+        max_stops: Only include flights with at most this many stops.
+        limit: The maximum number of flights to return.
+
+    Returns:
+        The matching flights, in the FlightsSelection format.
+    """
+    try:
+        departure = date.fromisoformat(departure_date)
+    except ValueError:
+        return {"error": f"departure_date must be in YYYY-MM-DD format, got {departure_date!r}"}
+
+    flights = inventory.search_flights(
+        FlightQuery(
+            origin=origin,
+            destination=destination,
+            departure_date=departure,
+            flexible_days=max(flexible_days, 0),
+            max_price_in_usd=max_price_in_usd,
+            max_stops=max_stops,
+            limit=limit,
+        )
+    )
+    selection = FlightsSelection(flights=flights).model_dump()
+    tool_context.state["flight"] = selection
+    return selection
+
+
+def search_hotels(
+    city: str,
+    check_in_date: str,
+    check_out_date: str,
+    tool_context: ToolContext,
+    max_price_per_night: Optional[int] = None,
+    min_rating: Optional[float] = None,
+    limit: int = 4,
+):
+    """
+    Searches the hotel inventory of a city, best rated hotels first.
+
+    Args:
+        city: The city to stay in, e.g. Paris.
+        check_in_date: The check-in date in YYYY-MM-DD format.
+        check_out_date: The check-out date in YYYY-MM-DD format.
+        tool_context: The ADK tool context.
+        max_price_per_night: Only include hotels up to this price per night.
+        min_rating: Only include hotels rated at least this much, from 1 to 5.
+        limit: The maximum number of hotels to return.
+
+    Returns:
+        The matching hotels, in the HotelsSelection format.
+    """
+    try:
+        check_in = date.fromisoformat(check_in_date)
+        check_out = date.fromisoformat(check_out_date)
+    except ValueError:
+        return {"error": "check_in_date and check_out_date must be in YYYY-MM-DD format"}
+    if check_out <= check_in:
+        return {"error": "check_out_date must be after check_in_date"}
+
+    hotels = inventory.search_hotels(
+        HotelQuery(
+            city=city,
+            check_in_date=check_in,
+            check_out_date=check_out,
+            max_price_per_night=max_price_per_night,
+            min_rating=min_rating,
+            limit=limit,
+        )
+    )
+    selection = HotelsSelection(hotels=[hotel for hotel, _ in hotels]).model_dump()
+    tool_context.state["hotel"] = selection
+    return selection
+
+
+def _parse_dates(**values: str) -> list[date] | dict[str, str]:
+    """Parses YYYY-MM-DD arguments, or returns the error to send back to the model."""
+    try:
+        return [date.fromisoformat(value) for value in values.values()]
+    except ValueError:
+        return {"error": f"{', '.join(values)} must be in YYYY-MM-DD format"}
+
+
+def seat_options(
+    flight_number: str,
+    flight_date: str,
+    tool_context: ToolContext,
+    seat_position: str = "",
+    max_rows: int = 3,
+    min_row: int = 1,
+):
+    """
+    Lists rows of a flight with a free seat at the preferred position.
+
+    Args:
+        flight_number: The flight number, e.g. UA5678.
+        flight_date: The departure date of the flight in YYYY-MM-DD format.
+        tool_context: The ADK tool context.
+        seat_position: window, aisle or middle; defaults to the user's seat preference.
+        max_rows: The maximum number of rows to return.
+        min_row: The first row to consider, to page through the cabin.
+
+    Returns:
+        The seats of the matching rows, in the SeatsSelection format.
+    """
+    dates = _parse_dates(flight_date=flight_date)
+    if isinstance(dates, dict):
+        return dates
+    if not seat_position:
+        profile = tool_context.state.get("user_profile") or {}
+        seat_position = profile.get("seat_preference") or ""
+    position = seat_position.lower() if seat_position.lower() in SEAT_POSITIONS.values() else None
+
+    selection = availability.seats(
+        flight_number, dates[0], position=position, max_rows=max_rows, min_row=min_row
+    ).model_dump()
+    tool_context.state["seat"] = selection
+    return selection
+
+
+def hold_seat(flight_number: str, flight_date: str, seat_number: str, tool_context: ToolContext):
+    """
+    Holds a seat for the user until it is booked.
+
+    Args:
+        flight_number: The flight number, e.g. UA5678.
+        flight_date: The departure date of the flight in YYYY-MM-DD format.
+        seat_number: The seat to hold, e.g. 22A.
+        tool_context: The ADK tool context.
+
+    Returns:
+        The hold id, needed to release the seat, or an error if the seat is taken.
+    """
+    dates = _parse_dates(flight_date=flight_date)
+    if isinstance(dates, dict):
+        return dates
+    try:
+        hold_id = availability.hold_seat(flight_number, dates[0], seat_number)
+    except HoldError as e:
+        return {"error": str(e)}
+    return {"hold_id": hold_id, "seat_number": seat_number, "expires_in_seconds": int(HOLD_TTL)}
+
+
+def release_seat(
+    flight_number: str, flight_date: str, seat_number: str, hold_id: str, tool_context: ToolContext
+):
+    """
+    Releases a seat held with hold_seat, e.g. when the user picks another one.
+
+    Args:
+        flight_number: The flight number, e.g. UA5678.
+        flight_date: The departure date of the flight in YYYY-MM-DD format.
+        seat_number: The held seat, e.g. 22A.
+        hold_id: The hold id returned by hold_seat.
+        tool_context: The ADK tool context.
+
+    Returns:
+        A status message.
+    """
+    dates = _parse_dates(flight_date=flight_date)
+    if isinstance(dates, dict):
+        return dates
+    try:
+        availability.release_seat(flight_number, dates[0], seat_number, hold_id)
+    except HoldError as e:
+        return {"error": str(e)}
+    return {"status": f"Released seat {seat_number}"}
+
+
+def room_options(
+    hotel_name: str,
+    nightly_price: int,
+    check_in_date: str,
+    check_out_date: str,
+    tool_context: ToolContext,
+):
+    """
+    Lists the room types of a hotel and whether they are free for the whole stay.
+
+    Args:
+        hotel_name: The name of the hotel, as returned by search_hotels.
+        nightly_price: The hotel's price per night, as returned by search_hotels.
+        check_in_date: The check-in date in YYYY-MM-DD format.
+        check_out_date: The check-out date in YYYY-MM-DD format.
+        tool_context: The ADK tool context.
+
+    Returns:
+        The room types, in the RoomsSelection format.
+    """
+    dates = _parse_dates(check_in_date=check_in_date, check_out_date=check_out_date)
+    if isinstance(dates, dict):
+        return dates
+    try:
+        selection = availability.rooms(hotel_name, nightly_price, *dates).model_dump()
+    except HoldError as e:
+        return {"error": str(e)}
+    tool_context.state["room"] = selection
+    return selection
+
+
+def hold_room(
+    hotel_name: str,
+    nightly_price: int,
+    room_type: str,
+    check_in_date: str,
+    check_out_date: str,
+    tool_context: ToolContext,
+):
+    """
+    Holds a room of the given type for every night of the stay until it is booked.
+
+    Args:
+        hotel_name: The name of the hotel, as returned by search_hotels.
+        nightly_price: The hotel's price per night, as returned by search_hotels.
+        room_type: The room type, as returned by room_options.
+        check_in_date: The check-in date in YYYY-MM-DD format.
+        check_out_date: The check-out date in YYYY-MM-DD format.
+        tool_context: The ADK tool context.
+
+    Returns:
+        The hold id, needed to release the room, or an error if no room is free.
+    """
+    dates = _parse_dates(check_in_date=check_in_date, check_out_date=check_out_date)
+    if isinstance(dates, dict):
+        return dates
+    try:
+        hold_id = availability.hold_room(hotel_name, nightly_price, room_type, *dates)
+    except HoldError as e:
+        return {"error": str(e)}
+    return {"hold_id": hold_id, "room_type": room_type, "expires_in_seconds": int(HOLD_TTL)}
+
+
+def release_room(hotel_name: str, nightly_price: int, hold_id: str, tool_context: ToolContext):
+    """
+    Releases a room held with hold_room, e.g. when the user picks another one.
+
+    Args:
+        hotel_name: The name of the hotel.
+        nightly_price: The hotel's price per night.
+        hold_id: The hold id returned by hold_room.
+        tool_context: The ADK tool context.
+
+    Returns:
+        A status message.
+    """
+    try:
+        availability.release_room(hotel_name, nightly_price, hold_id)
+    except HoldError as e:
+        return {"error": str(e)}
+    return {"status": f"Released room hold {hold_id}"}
 
 
 def memorize_list(key: str, value: str, tool_context: ToolContext):
@@ -86,41 +376,18 @@ def forget(key: str, value: str, tool_context: ToolContext):
     return {"status": f'Removed "{key}": "{value}"'}
 
 
-def _set_initial_states(source: Dict[str, Any], target: State | dict[str, Any]):
-    """
-    Setting the initial session state given a JSON object of states.
-
-    Args:
-        source: A JSON object of states.
-        target: The session state object to insert into.
-    """
-    if constants.SYSTEM_TIME not in target:
-        target[constants.SYSTEM_TIME] = str(datetime.now())
-
-    if constants.ITIN_INITIALIZED not in target:
-        target[constants.ITIN_INITIALIZED] = True
-
-        target.update(source)
-
-        itinerary = source.get(constants.ITIN_KEY, {})
-        if itinerary:
-            target[constants.ITIN_START_DATE] = itinerary[constants.START_DATE]
-            target[constants.ITIN_END_DATE] = itinerary[constants.END_DATE]
-            target[constants.ITIN_DATETIME] = itinerary[constants.START_DATE]
-
-
 def _load_precreated_itinerary(callback_context: CallbackContext):
     """
     Sets up the initial state.
     Set this as a callback as before_agent_call of the root_agent.
     This gets called before the system instruction is contructed.
 
+    The scenario is parsed once per process and the callback does nothing once
+    the session has been initialized.
+
     Args:
         callback_context: The callback context.
-    """    
-    data = {}
-    with open(SAMPLE_SCENARIO_PATH, "r") as file:
-        data = json.load(file)
-        print(f"\nLoading Initial State: {data}\n")
-
-    _set_initial_states(data["state"], callback_context.state)
+    """
+    if constants.ITIN_INITIALIZED in callback_context.state:
+        return None
+    _scenario.apply(callback_context.state)
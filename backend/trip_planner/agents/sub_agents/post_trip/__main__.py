@@ -10,7 +10,6 @@ from uvicorn.config import Config
 from uvicorn.server import Server
 from a2a.server.apps import A2AStarletteApplication
 from a2a.server.request_handlers import DefaultRequestHandler
-from a2a.server.tasks import InMemoryTaskStore
 from a2a.types import (
     AgentCapabilities,
     AgentCard,
@@ -22,20 +21,22 @@ from dotenv import load_dotenv
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
+from trip_planner.agents.shared_libraries.metrics import metrics_route
+from trip_planner.agents.shared_libraries.session_service import create_session_service, lifespan
+from trip_planner.agents.shared_libraries.task_store import create_task_store
+from trip_planner.agents.shared_libraries.structured_logging import configure_logging
+from trip_planner.agents.shared_libraries.tracing import configure_tracing
+from trip_planner.agents.shared_libraries.usage import usage_route
 load_dotenv("../../.env")
 
-logging.basicConfig(level=logging.INFO)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 def main():
     asyncio.run(async_main())
 
-async def async_main():
-    """Starts the agent server."""
-    host = "localhost"
-    port = 8006
-
+def build_agent_card(url: str) -> AgentCard:
+    """Builds the card of the Post-Trip agent served at url."""
     # agent metadata
     capabilities = AgentCapabilities(streaming=True)
     skill = AgentSkill(
@@ -48,34 +49,51 @@ async def async_main():
     agent_card = AgentCard(
         name="Post Trip Agent (A2A)",
         description="You are a follow up agent to learn from user's experience; In turn improves the user's future trips planning and in-trip experience.",
-        url=f"http://{host}:{port}/",
+        url=url,
         version="1.0.0",
         defaultInputModes=["text"],
         defaultOutputModes=["text"],
         capabilities=capabilities,
         skills=[skill],
     )
+    return agent_card
+
 
+def build_request_handler(agent_card: AgentCard) -> DefaultRequestHandler:
+    """Builds the A2A request handler running the Post-Trip agent."""
     adk_agent = create_agent()
     
     runner = Runner(
         app_name=agent_card.name,
         agent=adk_agent,
         artifact_service=InMemoryArtifactService(),
-        session_service=InMemorySessionService(),
+        session_service=create_session_service(),
         memory_service=InMemoryMemoryService(),
     )
     agent_executor = PostTripExecutor(runner)
 
-    request_handler = DefaultRequestHandler(
+    return DefaultRequestHandler(
         agent_executor=agent_executor,
-        task_store=InMemoryTaskStore(),
+        task_store=create_task_store(),
     )
+
+
+async def async_main():
+    """Starts the agent server."""
+    host = "localhost"
+    port = 8006
+
+    agent_card = build_agent_card(f"http://{host}:{port}/")
+    configure_tracing(agent_card.name)
     app = A2AStarletteApplication(
-        agent_card=agent_card, http_handler=request_handler
+        agent_card=agent_card, http_handler=build_request_handler(agent_card)
     )
 
-    config = Config(app.build(), host=host, port=port)
+    config = Config(
+        app.build(routes=[usage_route(), metrics_route()], lifespan=lifespan),
+        host=host,
+        port=port,
+    )
     server = Server(config)
     await server.serve()
 
@@ -18,6 +18,7 @@ from google.adk.agents import Agent
 
 from trip_planner.agents.sub_agents.post_trip import prompt
 from trip_planner.agents.sub_agents.post_trip.tools import memorize
+from trip_planner.agents.shared_libraries.usage import instrument
 
 # post_trip_agent = Agent(
 #     model="gemini-2.5-flash",
@@ -28,10 +29,10 @@ from trip_planner.agents.sub_agents.post_trip.tools import memorize
 # )
 
 def create_agent() -> Agent:
-    return Agent(
+    return instrument(Agent(
     model="gemini-2.5-flash",
     name="post_trip_agent",
     description="A follow up agent to learn from user's experience; In turn improves the user's future trips planning and in-trip experience.",
     instruction=prompt.POSTTRIP_INSTR,
     tools=[memorize],
-    )
+    ))
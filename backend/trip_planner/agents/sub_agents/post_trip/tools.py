@@ -14,20 +14,19 @@
 
 """The 'memorize' tool for several agents to affect session states."""
 
-from datetime import datetime
-import json
 import os
-from typing import Dict, Any
 
 from google.adk.agents.callback_context import CallbackContext
-from google.adk.sessions.state import State
 from google.adk.tools import ToolContext
 
 from trip_planner.agents.shared_libraries import constants
+from trip_planner.agents.shared_libraries.scenario import ScenarioTemplate
 
 SAMPLE_SCENARIO_PATH = os.getenv(
     "TRAVEL_CONCIERGE_SCENARIO", "travel_concierge/profiles/itinerary_empty_default.json"
 )
+# Parsed lazily, on the first session to initialize.
+_scenario = ScenarioTemplate(SAMPLE_SCENARIO_PATH)
 
 
 def memorize_list(key: str, value: str, tool_context: ToolContext):
@@ -86,41 +85,18 @@ def forget(key: str, value: str, tool_context: ToolContext):
     return {"status": f'Removed "{key}": "{value}"'}
 
 
-def _set_initial_states(source: Dict[str, Any], target: State | dict[str, Any]):
-    """
-    Setting the initial session state given a JSON object of states.
-
-    Args:
-        source: A JSON object of states.
-        target: The session state object to insert into.
-    """
-    if constants.SYSTEM_TIME not in target:
-        target[constants.SYSTEM_TIME] = str(datetime.now())
-
-    if constants.ITIN_INITIALIZED not in target:
-        target[constants.ITIN_INITIALIZED] = True
-
-        target.update(source)
-
-        itinerary = source.get(constants.ITIN_KEY, {})
-        if itinerary:
-            target[constants.ITIN_START_DATE] = itinerary[constants.START_DATE]
-            target[constants.ITIN_END_DATE] = itinerary[constants.END_DATE]
-            target[constants.ITIN_DATETIME] = itinerary[constants.START_DATE]
-
-
 def _load_precreated_itinerary(callback_context: CallbackContext):
     """
     Sets up the initial state.
     Set this as a callback as before_agent_call of the root_agent.
     This gets called before the system instruction is contructed.
 
+    The scenario is parsed once per process and the callback does nothing once
+    the session has been initialized.
+
     Args:
         callback_context: The callback context.
-    """    
-    data = {}
-    with open(SAMPLE_SCENARIO_PATH, "r") as file:
-        data = json.load(file)
-        print(f"\nLoading Initial State: {data}\n")
-
-    _set_initial_states(data["state"], callback_context.state)
+    """
+    if constants.ITIN_INITIALIZED in callback_context.state:
+        return None
+    _scenario.apply(callback_context.state)
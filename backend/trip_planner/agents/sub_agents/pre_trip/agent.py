@@ -19,18 +19,21 @@ from google.adk.tools.agent_tool import AgentTool
 from trip_planner.agents.shared_libraries import types
 from trip_planner.agents.sub_agents.pre_trip import prompt
 from trip_planner.agents.sub_agents.pre_trip.tools import google_search_grounding
+from trip_planner.agents.shared_libraries.usage import instrument
 
 
-what_to_pack_agent = Agent(
-    model="gemini-2.5-flash",
-    name="what_to_pack_agent",
-    description="Make suggestion on what to bring for the trip",
-    instruction=prompt.WHATTOPACK_INSTR,
-    disallow_transfer_to_parent=True,
-    disallow_transfer_to_peers=True,
-    output_key="what_to_pack",
-    output_schema=types.PackingList,
-)
+# An agent has a single parent, so every pre_trip_agent gets its own packing agent.
+def create_what_to_pack_agent() -> Agent:
+    return Agent(
+        model="gemini-2.5-flash",
+        name="what_to_pack_agent",
+        description="Make suggestion on what to bring for the trip",
+        instruction=prompt.WHATTOPACK_INSTR,
+        disallow_transfer_to_parent=True,
+        disallow_transfer_to_peers=True,
+        output_key="what_to_pack",
+        output_schema=types.PackingList,
+    )
 
 # pre_trip_agent = Agent(
 #     model="gemini-2.5-flash",
@@ -41,10 +44,10 @@ what_to_pack_agent = Agent(
 # )
 
 def create_agent() -> Agent:
-    return Agent(
+    return instrument(Agent(
     model="gemini-2.5-flash",
     name="pre_trip_agent",
     description="Given an itinerary, this agent keeps up to date and provides relevant travel information to the user before the trip.",
     instruction=prompt.PRETRIP_AGENT_INSTR,
-    tools=[google_search_grounding, AgentTool(agent=what_to_pack_agent)],
-    )
+    tools=[google_search_grounding, AgentTool(agent=create_what_to_pack_agent())],
+    ))
@@ -0,0 +1,241 @@
+"""Load test of the host agent and the six A2A sub-agents.
+
+Every Gemini call is answered by the deterministic ScriptedGemini from
+fake_llm.py, so the numbers measure the orchestration, A2A and session overhead
+rather than the model. Each simulated user runs the same conversation: one turn
+per agent below, which the fake host model routes with send_message.
+
+Run from the backend folder:
+    python -m trip_planner.loadtest --users 50 --transport http
+"""
+
+import sys
+import os
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
+
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+import uuid
+from collections import defaultdict
+from typing import Any
+
+SUB_AGENTS_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "../agents/sub_agents")
+)
+
+# The conversation every simulated user goes through.
+CONVERSATION = [
+    "@inspiration_agent Suggest a beach destination for December",
+    "@planning_agent Find flights from New Delhi to Bali",
+    "@booking_agent Book the selected flight",
+    "@in_trip_agent What is next on my trip today?",
+]
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    return {
+        "count": len(values),
+        "p50_ms": round(_percentile(values, 50) * 1000, 1),
+        "p95_ms": round(_percentile(values, 95) * 1000, 1),
+        "p99_ms": round(_percentile(values, 99) * 1000, 1),
+        "max_ms": round(max(values, default=0.0) * 1000, 1),
+    }
+
+
+def _hop_error(result) -> str | None:
+    """Returns why a call to an agent did not produce a Task, if it did not."""
+    from a2a.types import JSONRPCErrorResponse, SendMessageResponse, Task
+
+    if isinstance(result, SendMessageResponse):
+        result = getattr(result.root, "result", result.root)
+    if isinstance(result, Task):
+        return None
+    if isinstance(result, JSONRPCErrorResponse):
+        return result.error.message
+    return f"no task but {type(result).__name__}"
+
+
+def _instrument(connection, agent_name: str, hops: dict[str, list[float]], errors: list[str]):
+    """Records the duration of every call the host makes to an agent.
+
+    The host turns failed calls into a tool result the model answers, so a call
+    that did not return a Task is counted as an error here.
+    """
+    for attr in ("send_message", "send_message_streaming"):
+        original = getattr(connection, attr)
+
+        async def timed(*args, _original=original, **kwargs):
+            started = time.perf_counter()
+            try:
+                result = await _original(*args, **kwargs)
+            except Exception as e:
+                errors.append(f"{agent_name}: {type(e).__name__}: {e}")
+                raise
+            finally:
+                hops[agent_name].append(time.perf_counter() - started)
+            error = _hop_error(result)
+            if error is not None:
+                errors.append(f"{agent_name}: {error}")
+            return result
+
+        setattr(connection, attr, timed)
+
+
+async def _simulate_user(host, results: dict[str, Any]):
+    session_id = f"loadtest-{uuid.uuid4()}"
+    for query in CONVERSATION:
+        started = time.perf_counter()
+        try:
+            async for _ in host.stream(query, session_id):
+                pass
+        except Exception as e:
+            results["errors"].append(f"{type(e).__name__}: {e}")
+            continue
+        results["turns"].append(time.perf_counter() - started)
+
+
+async def _start_server(port: int):
+    from uvicorn.config import Config
+    from uvicorn.server import Server
+
+    from trip_planner.agents.single_process import build_app
+
+    server = Server(
+        Config(build_app(f"http://localhost:{port}"), host="localhost", port=port, log_level="warning")
+    )
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        if task.done():
+            task.result()
+        await asyncio.sleep(0.05)
+    return server, task
+
+
+async def run(args) -> dict[str, Any]:
+    from trip_planner.loadtest import fake_llm
+
+    settings = fake_llm.install(
+        first_token_latency=args.first_token_latency,
+        token_latency=args.token_latency,
+        tokens_per_response=args.tokens,
+    )
+
+    from agent_host.agent import HostAgent
+    from agent_host.http_pool import shared_pool
+    from trip_planner.agents.shared_libraries.usage import usage
+    from trip_planner.agents.single_process import AGENT_SERVERS
+
+    server = server_task = None
+    if args.transport == "http":
+        server, server_task = await _start_server(args.port)
+        host = await HostAgent.create(
+            [f"http://localhost:{args.port}/{path}/" for path in AGENT_SERVERS]
+        )
+    else:
+        host = HostAgent.create_in_process()
+
+    results: dict[str, Any] = {"turns": [], "errors": []}
+    hops: dict[str, list[float]] = defaultdict(list)
+    for agent_name, connection in host.remote_agent_connections.items():
+        _instrument(connection, agent_name, hops, results["errors"])
+
+    settings.calls = 0
+    settings.simulated_seconds = 0.0
+    started = time.perf_counter()
+    await asyncio.gather(*(_simulate_user(host, results) for _ in range(args.users)))
+    elapsed = time.perf_counter() - started
+
+    report = {
+        "users": args.users,
+        "transport": args.transport,
+        "elapsed_s": round(elapsed, 2),
+        "turns_per_s": round(len(results["turns"]) / elapsed, 2) if elapsed else 0.0,
+        "turn_latency": _summary(results["turns"]),
+        "hops": {name: _summary(values) for name, values in sorted(hops.items())},
+        "model_calls": settings.calls,
+        "simulated_model_s": round(settings.simulated_seconds, 2),
+        "errors": len(results["errors"]),
+        "first_errors": results["errors"][:5],
+        # The sub-agents run in this process too; the host keeps its own tracker.
+        "agent_usage": {
+            **host.usage_metrics()["agents"],
+            **usage.snapshot(max_sessions=0)["agents"],
+        },
+    }
+    if args.transport == "http":
+        report["pool"] = host.pool_metrics()
+        await shared_pool.aclose()
+        server.should_exit = True
+        await server_task
+    return report
+
+
+def _print_report(report: dict[str, Any]):
+    print(
+        f"{report['users']} users over {report['transport']}: "
+        f"{report['turn_latency']['count']} turns in {report['elapsed_s']}s "
+        f"({report['turns_per_s']} turns/s), {report['model_calls']} model calls, "
+        f"{report['errors']} errors"
+    )
+    rows = [("turn", report["turn_latency"])] + list(report["hops"].items())
+    print(f"{'':32} {'count':>7} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, stats in rows:
+        print(
+            f"{name:32} {stats['count']:>7} {stats['p50_ms']:>9} "
+            f"{stats['p95_ms']:>9} {stats['p99_ms']:>9} {stats['max_ms']:>9}"
+        )
+    print(f"{'':32} {'model calls':>11} {'prompt tok':>10} {'output tok':>10} {'model s':>8} {'tool s':>8}")
+    for name, stats in sorted(
+        report["agent_usage"].items(), key=lambda item: item[1]["model_seconds"], reverse=True
+    ):
+        print(
+            f"{name:32} {stats['model_calls']:>11} {stats['prompt_tokens']:>10} "
+            f"{stats['completion_tokens']:>10} {stats['model_seconds']:>8} {stats['tool_seconds']:>8}"
+        )
+    for error in report["first_errors"]:
+        print("error:", error)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10, help="Concurrent simulated users.")
+    parser.add_argument(
+        "--transport",
+        choices=["http", "in_process"],
+        default="http",
+        help="Reach the agents over HTTP (one local server) or call them in-process.",
+    )
+    parser.add_argument("--port", type=int, default=8100, help="Port of the local agent server.")
+    parser.add_argument("--first-token-latency", type=float, default=0.05)
+    parser.add_argument("--token-latency", type=float, default=0.002)
+    parser.add_argument("--tokens", type=int, default=40, help="Tokens per fake model answer.")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args()
+
+    # The agents load their prompts and profiles relative to the sub_agents folder.
+    os.chdir(SUB_AGENTS_DIR)
+    sys.path.append(SUB_AGENTS_DIR)
+    os.environ.setdefault(
+        "A2A_CARD_CACHE_PATH", os.path.join(tempfile.gettempdir(), "loadtest_agent_cards.json")
+    )
+
+    report = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        _print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""A deterministic stand-in for gemini-2.5-flash used by the load test.
+
+Once installed, every agent configured with a "gemini-*" model talks to
+ScriptedGemini instead of the real API. Its behaviour only depends on the
+request:
+  - a request whose last content is a function response gets a short text answer;
+  - a request with an output schema gets a JSON instance of that schema;
+  - the host (which has the send_message tool) delegates to the agent named by
+    an "@agent_name" marker in the user's message;
+  - other agents call the tools listed in the tool script, once per turn each,
+    before answering.
+Latency is simulated with a first-token delay plus a per-token delay.
+"""
+
+import asyncio
+import json
+import re
+import typing
+from collections.abc import AsyncGenerator
+from dataclasses import dataclass, field
+from typing import Any
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.genai import types
+from pydantic import BaseModel
+
+# Tools called by the sub-agents when available; AgentTools take a "request".
+DEFAULT_TOOL_SCRIPT = {
+    "place_agent": {"request": "Beach destinations in Asia for December"},
+    "search_flights": {"origin": "New Delhi", "destination": "Bali", "departure_date": "2025-12-10"},
+    "book_items": {"payment_method": "Credit Card"},
+    "memorize": {"key": "loadtest_marker", "value": "visited"},
+}
+
+
+@dataclass
+class FakeModelSettings:
+    """Knobs of ScriptedGemini, shared by every instance the registry creates."""
+    first_token_latency: float = 0.05
+    token_latency: float = 0.002
+    tokens_per_response: int = 40
+    tool_script: dict[str, dict[str, Any]] = field(
+        default_factory=lambda: dict(DEFAULT_TOOL_SCRIPT)
+    )
+    calls: int = 0
+    simulated_seconds: float = 0.0
+
+
+SETTINGS = FakeModelSettings()
+
+
+def _dummy_value(annotation: Any, name: str) -> Any:
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is list:
+        return [_dummy_value(args[0], name)] if args else []
+    if origin is typing.Union or type(annotation).__name__ == "UnionType":
+        non_none = [arg for arg in args if arg is not type(None)]
+        return _dummy_value(non_none[0], name) if non_none else None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return dummy_instance(annotation)
+    if annotation is bool:
+        return False
+    if annotation is int:
+        return 1
+    if annotation is float:
+        return 1.0
+    return f"{name} value"
+
+
+def dummy_instance(model_cls: type[BaseModel]) -> dict[str, Any]:
+    """Returns a deterministic JSON-ready instance of a pydantic model."""
+    return {
+        name: _dummy_value(field_info.annotation, name)
+        for name, field_info in model_cls.model_fields.items()
+    }
+
+
+def _text_of(content: types.Content | None) -> str:
+    if content is None or not content.parts:
+        return ""
+    return "".join(part.text for part in content.parts if part.text)
+
+
+class ScriptedGemini(BaseLlm):
+    """A scripted BaseLlm answering for any gemini-* model name."""
+
+    model: str = "gemini-2.5-flash"
+
+    @classmethod
+    def supported_models(cls) -> list[str]:
+        return [r"gemini-.*"]
+
+    def _turn_start(self, contents: list[types.Content]) -> int:
+        """Index of the user message that started the current turn."""
+        for index in range(len(contents) - 1, -1, -1):
+            content = contents[index]
+            if content.role == "user" and _text_of(content):
+                return index
+        return 0
+
+    def _next_action(self, llm_request: LlmRequest) -> types.Part:
+        contents = llm_request.contents or []
+        last = contents[-1] if contents else None
+        if last is not None and any(part.function_response for part in last.parts or []):
+            return types.Part(text=self._text(f"Done with {last.parts[0].function_response.name}."))
+
+        response_schema = llm_request.config.response_schema if llm_request.config else None
+        if isinstance(response_schema, type) and issubclass(response_schema, BaseModel):
+            return types.Part(text=json.dumps(dummy_instance(response_schema)))
+
+        user_text = _text_of(contents[self._turn_start(contents)]) if contents else ""
+        tools = llm_request.tools_dict or {}
+        if "send_message" in tools:
+            match = re.search(r"@(\w+)", user_text)
+            if match:
+                return types.Part(
+                    function_call=types.FunctionCall(
+                        name="send_message",
+                        args={"agent_name": match.group(1), "task": user_text},
+                    )
+                )
+
+        called = {
+            part.function_call.name
+            for content in contents[self._turn_start(contents) :]
+            for part in content.parts or []
+            if part.function_call
+        }
+        for tool_name, args in SETTINGS.tool_script.items():
+            if tool_name in tools and tool_name not in called:
+                return types.Part(function_call=types.FunctionCall(name=tool_name, args=args))
+
+        return types.Part(text=self._text(f"Answer to: {user_text[:80]}"))
+
+    @staticmethod
+    def _text(prefix: str) -> str:
+        filler = " ".join(f"token{i}" for i in range(SETTINGS.tokens_per_response))
+        return f"{prefix} {filler}"
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        part = self._next_action(llm_request)
+        tokens = len(part.text.split()) if part.text else 8
+        prompt_tokens = sum(
+            len(_text_of(content).split()) for content in llm_request.contents or []
+        )
+        usage = types.GenerateContentResponseUsageMetadata(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=tokens,
+            total_token_count=prompt_tokens + tokens,
+        )
+
+        SETTINGS.calls += 1
+        delay = SETTINGS.first_token_latency + tokens * SETTINGS.token_latency
+        SETTINGS.simulated_seconds += delay
+        await asyncio.sleep(SETTINGS.first_token_latency)
+
+        if stream and part.text:
+            words = part.text.split(" ")
+            for word in words:
+                await asyncio.sleep(SETTINGS.token_latency)
+                yield LlmResponse(
+                    content=types.Content(role="model", parts=[types.Part(text=word + " ")]),
+                    partial=True,
+                )
+        else:
+            await asyncio.sleep(tokens * SETTINGS.token_latency)
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=usage,
+        )
+
+
+def install(**settings: Any) -> FakeModelSettings:
+    """Routes every gemini-* model to ScriptedGemini and applies the given settings."""
+    for key, value in settings.items():
+        setattr(SETTINGS, key, value)
+    LLMRegistry.register(ScriptedGemini)
+    resolve_cache_clear = getattr(LLMRegistry.resolve, "cache_clear", None)
+    if resolve_cache_clear is not None:
+        resolve_cache_clear()
+    return SETTINGS